@@ -17,7 +17,16 @@ from src.api.v1.routers.spaced_repetition_router import (
 )
 from src.api.v1.routers.study_session_views import router as study_session_views_router
 from src.core.config import Settings
+from src.db.client_pool import client_pool
 from src.middleware.auth_middleware import AuthMiddleware
+from src.services.ai_service import ai_generation_single_flight
+from src.services.dashboard_cache import dashboard_stats_cache
+from src.services.flashcard_dedup import flashcard_dedup_index
+from src.services.generation_jobs import generation_job_queue
+from src.services.llm_cache import llm_generation_cache
+from src.services.llm_client import llm_client
+from src.services.llm_scheduler import llm_scheduler
+from src.services.token_cache import verified_token_cache
 
 # Configure logging
 logging.basicConfig(
@@ -36,9 +45,16 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI application starting up...")
     logger.info(f"Supabase URL configured: {settings.supabase_url[:50]}...")
     logger.info(f"Application environment: {settings.app_env}")
+    if settings.OPENROUTER_API_KEY:
+        llm_client.start()
+    generation_job_queue.start()
     yield
     # Shutdown
     logger.info("FastAPI application shutting down...")
+    await generation_job_queue.aclose()
+    await client_pool.aclose()
+    await llm_client.aclose()
+    await dashboard_stats_cache.backend.aclose()
 
 
 # Create FastAPI application
@@ -97,6 +113,24 @@ async def health_check():
     return {"status": "healthy", "message": "10x-cards API is running"}
 
 
+# Metrics endpoint
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    """Runtime metrics for shared resources."""
+    return {
+        "supabase_client_pool": client_pool.get_metrics(),
+        "verified_token_cache": verified_token_cache.get_metrics(),
+        "dashboard_stats_cache": dashboard_stats_cache.get_metrics(),
+        "llm_generation_cache": llm_generation_cache.get_metrics(),
+        "ai_generation_single_flight": ai_generation_single_flight.get_metrics(),
+        "ai_generation_jobs": generation_job_queue.get_metrics(),
+        "llm_scheduler": llm_scheduler.get_metrics(),
+        "llm_client": llm_client.get_metrics(),
+        "llm_models": llm_client.router.get_metrics(),
+        "flashcard_dedup_index": flashcard_dedup_index.get_metrics(),
+    }
+
+
 # Root endpoint
 @app.get("/", tags=["root"])
 async def root():
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill spaced repetition records for flashcards that have none.
+
+Flashcards created before the create_spaced_repetition_records trigger may
+lack a user_flashcard_spaced_repetition row and never show up as due. This
+script calls the backfill_spaced_repetition_records database function in
+batches until nothing is left. It needs SUPABASE_SERVICE_KEY, because the
+function is only granted to the service role.
+
+Usage:
+    python scripts/backfill_spaced_repetition.py [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from postgrest import AsyncPostgrestClient  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+
+
+async def backfill(batch_size: int) -> int:
+    """Create missing repetition records batch by batch and return the total."""
+    if not settings.supabase_service_key:
+        raise SystemExit("SUPABASE_SERVICE_KEY is required to run the backfill")
+
+    client = AsyncPostgrestClient(
+        f"{settings.supabase_url.rstrip('/')}/rest/v1",
+        headers={
+            "apikey": settings.supabase_service_key,
+            "Authorization": f"Bearer {settings.supabase_service_key}",
+        },
+    )
+
+    total = 0
+    async with client:
+        while True:
+            response = await client.rpc(
+                "backfill_spaced_repetition_records", {"p_batch_size": batch_size}
+            ).execute()
+            created = response.data or 0
+            total += created
+            print(f"Created {created} repetition records (total {total})")
+            if created < batch_size:
+                break
+
+    return total
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Flashcards processed per database call (default: 1000)",
+    )
+    args = parser.parse_args()
+
+    total = asyncio.run(backfill(args.batch_size))
+    print(f"✨ Backfill complete: {total} repetition records created")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Recompute the user_stats dashboard table from its source tables.
+
+user_stats is kept current by triggers on flashcards and ai_generation_events.
+This script calls the reconcile_user_stats database function to rebuild the
+rows from scratch, e.g. after a manual data fix or to verify drift. It needs
+SUPABASE_SERVICE_KEY, because the function is only granted to the service role.
+
+Usage:
+    python scripts/reconcile_user_stats.py [--user-id <uuid>]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from postgrest import AsyncPostgrestClient  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+
+
+async def reconcile(user_id: Optional[uuid.UUID]) -> int:
+    """Recompute user_stats rows and return how many were written."""
+    if not settings.supabase_service_key:
+        raise SystemExit("SUPABASE_SERVICE_KEY is required to run the reconciliation")
+
+    client = AsyncPostgrestClient(
+        f"{settings.supabase_url.rstrip('/')}/rest/v1",
+        headers={
+            "apikey": settings.supabase_service_key,
+            "Authorization": f"Bearer {settings.supabase_service_key}",
+        },
+    )
+
+    async with client:
+        response = await client.rpc(
+            "reconcile_user_stats",
+            {"p_user_id": str(user_id) if user_id else None},
+        ).execute()
+
+    return response.data or 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--user-id",
+        type=uuid.UUID,
+        default=None,
+        help="Reconcile a single user (default: all users)",
+    )
+    args = parser.parse_args()
+
+    total = asyncio.run(reconcile(args.user_id))
+    print(f"✨ Reconciliation complete: {total} user_stats rows recomputed")
+
+
+if __name__ == "__main__":
+    main()
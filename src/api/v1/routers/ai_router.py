@@ -1,3 +1,4 @@
+import json
 import logging
 import time
 import uuid
@@ -5,11 +6,21 @@ from datetime import datetime
 from typing import Annotated, Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from postgrest import AsyncPostgrestClient
 
-from src.api.v1.schemas.ai_schemas import PaginatedAiGenerationStatsResponse
-from src.core.config import settings
+from src.api.v1.schemas.ai_schemas import (
+    AiGenerationSummaryResponse,
+    PaginatedAiGenerationStatsResponse,
+)
+from src.api.v1.schemas.flashcard_schemas import CountStrategyEnum
+from src.db.client_pool import client_pool
 from src.db.supabase_client import get_supabase_client
-from src.dtos import AIGenerateFlashcardsRequest, AIGenerateFlashcardsResponse
+from src.dtos import (
+    AIGenerateFlashcardsRequest,
+    AIGenerateFlashcardsResponse,
+    AIGenerationJobResponse,
+)
 from src.middleware.auth_middleware import get_current_user
 from src.services.ai_generation_service import (
     AiGenerationService,
@@ -18,8 +29,9 @@ from src.services.ai_generation_service import (
 )
 from src.services.ai_service import AIService, AIServiceError, get_ai_service
 from src.services.auth_service import AuthService
+from src.services.dashboard_cache import dashboard_stats_cache
+from src.services.generation_jobs import GenerationJobQueueError, generation_job_queue
 from src.services.llm_client import LLMServiceError
-from supabase import Client, ClientOptions, create_client
 
 logger = logging.getLogger(__name__)
 
@@ -88,21 +100,23 @@ async def require_auth_for_ai(
         )
 
 
-def get_authenticated_supabase_client(request: Request) -> Client:
+def get_authenticated_supabase_client(request: Request) -> AsyncPostgrestClient:
     """
-    Create Supabase client with user authentication token for RLS.
+    Get pooled async Supabase (PostgREST) client with user token for RLS.
 
     Args:
         request: FastAPI request object to extract auth token from cookies
 
     Returns:
-        Authenticated Supabase client
+        Authenticated async PostgREST client
 
     Raises:
         HTTPException: If no auth token is found
     """
-    # Get access token from cookies
-    access_token = request.cookies.get("access_token")
+    # Prefer the token verified (or refreshed) by the middleware for this request
+    access_token = getattr(request.state, "access_token", None) or request.cookies.get(
+        "access_token"
+    )
 
     if not access_token:
         logger.error("No access token found in cookies for RLS operations")
@@ -111,14 +125,10 @@ def get_authenticated_supabase_client(request: Request) -> Client:
             detail="Authentication token required for database operations",
         )
 
-    # Create authenticated Supabase client with user token
+    # Reuse a pooled client bound to the shared HTTP connection pool
     try:
-        client = create_client(
-            supabase_url=settings.supabase_url,
-            supabase_key=settings.supabase_anon_key,
-            options=ClientOptions(headers={"Authorization": f"Bearer {access_token}"}),
-        )
-        logger.debug(f"Created authenticated Supabase client for user")
+        client = client_pool.get_client(access_token)
+        logger.debug(f"Obtained authenticated Supabase client from pool")
         return client
     except Exception as e:
         logger.error(f"Failed to create authenticated Supabase client: {str(e)}")
@@ -129,14 +139,18 @@ def get_authenticated_supabase_client(request: Request) -> Client:
 
 
 def get_ai_service_dependency(
-    supabase: Annotated[Client, Depends(get_authenticated_supabase_client)],
+    supabase: Annotated[
+        AsyncPostgrestClient, Depends(get_authenticated_supabase_client)
+    ],
 ) -> AIService:
     """Dependency to get AIService instance with authenticated client."""
     return get_ai_service(supabase)
 
 
 def get_ai_generation_service_dependency(
-    supabase: Annotated[Client, Depends(get_authenticated_supabase_client)],
+    supabase: Annotated[
+        AsyncPostgrestClient, Depends(get_authenticated_supabase_client)
+    ],
 ) -> AiGenerationService:
     """Dependency to get AiGenerationService instance with authenticated client."""
     return get_ai_generation_service(supabase)
@@ -147,9 +161,12 @@ def get_ai_generation_service_dependency(
     response_model=AIGenerateFlashcardsResponse,
     status_code=status.HTTP_200_OK,
     summary="Generate flashcards from text using AI",
-    description="Generate educational flashcards from provided text (1000-10000 characters) using AI. "
+    description="Generate educational flashcards from provided text (1000-100000 characters) using AI. "
     "The service creates source text, generates flashcard suggestions with pending_review status, "
-    "and tracks the generation event for analytics. Users can later review and approve/reject suggestions.",
+    "and tracks the generation event for analytics. Users can later review and approve/reject suggestions. "
+    "Suggestions that nearly duplicate an existing flashcard are not stored (see duplicates_dropped); "
+    "returns 409 if every suggestion is a duplicate. Long texts are generated in chunks; "
+    "failed_chunks counts chunks whose generation failed (such partial results are not cached).",
 )
 async def generate_flashcards(
     request: Request,
@@ -164,7 +181,7 @@ async def generate_flashcards(
     Args:
         request: FastAPI Request object for security analysis
         response: FastAPI Response object for security headers
-        data: Request data with text_content (1000-10000 characters)
+        data: Request data with text_content (1000-100000 characters)
         current_user_id: Authenticated user ID from JWT
         ai_service: AI service for flashcard generation
 
@@ -234,6 +251,7 @@ async def generate_flashcards(
         result = await ai_service.generate_flashcards_from_text(
             request=data, user_id=current_user_id
         )
+        await dashboard_stats_cache.invalidate(current_user_id)
 
         # Log successful generation with performance metrics
         elapsed_time = (time.time() - start_time) * 1000
@@ -246,6 +264,7 @@ async def generate_flashcards(
                 "source_text_id": str(result.source_text_id),
                 "ai_event_id": str(result.ai_generation_event_id),
                 "flashcards_count": len(result.suggested_flashcards),
+                "cache_hit": result.cache_hit,
                 "response_time_ms": round(elapsed_time, 2),
             },
         )
@@ -303,7 +322,12 @@ async def generate_flashcards(
         )
 
         # Map AI service errors to appropriate HTTP status codes
-        if "database" in e.details.lower() or "db" in e.operation.lower():
+        if e.operation == "deduplicate_flashcards":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="All generated flashcards already exist in your deck.",
+            )
+        elif "database" in e.details.lower() or "db" in e.operation.lower():
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database error occurred while processing your request.",
@@ -351,6 +375,260 @@ async def generate_flashcards(
         )
 
 
+@router.post(
+    "/generate-flashcards/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Generate flashcards from text using AI (streamed)",
+    description="Same as /generate-flashcards, but the response is newline-delimited JSON: "
+    'a {"type": "card"} event per flashcard as soon as the model produces it, then '
+    '{"type": "complete", "result": ...} with the stored flashcards, or '
+    '{"type": "error", "status": ..., "detail": ...} if generation fails midway.',
+)
+async def generate_flashcards_stream(
+    request: Request,
+    data: AIGenerateFlashcardsRequest,
+    current_user_id: Annotated[uuid.UUID, Depends(require_auth_for_ai)],
+    ai_service: Annotated[AIService, Depends(get_ai_service_dependency)],
+) -> StreamingResponse:
+    """
+    Stream AI-generated flashcards as newline-delimited JSON.
+
+    Security checks run before the stream starts, so they still produce
+    regular HTTP errors; failures during generation are sent as an error event.
+
+    Args:
+        request: FastAPI Request object for security analysis
+        data: Request data with text_content (1000-100000 characters)
+        current_user_id: Authenticated user ID from JWT
+        ai_service: AI service for flashcard generation
+
+    Returns:
+        StreamingResponse with application/x-ndjson events
+    """
+    operation = "ai_generate_flashcards_stream"
+    start_time = time.time()
+
+    # Rate limiting check (shared budget with the non-streamed endpoint)
+    check_rate_limit(request, current_user_id, limit=10, window_minutes=60)
+
+    # Request integrity validation
+    validate_request_integrity(request, current_user_id)
+
+    if len(data.text_content.strip()) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text content cannot be empty",
+        )
+
+    log_with_context(
+        level="info",
+        message="Starting streamed AI flashcard generation",
+        user_id=current_user_id,
+        operation=operation,
+        extra_context={"text_length": len(data.text_content)},
+    )
+
+    async def event_stream():
+        cards = 0
+        try:
+            async for event in ai_service.stream_flashcards_from_text(
+                request=data, user_id=current_user_id
+            ):
+                if event["type"] == "card":
+                    cards += 1
+                    if cards == 1:
+                        log_with_context(
+                            level="info",
+                            message="First streamed flashcard sent",
+                            user_id=current_user_id,
+                            operation=operation,
+                            extra_context={
+                                "time_to_first_card_ms": round(
+                                    (time.time() - start_time) * 1000, 2
+                                )
+                            },
+                        )
+                elif event["type"] == "complete":
+                    await dashboard_stats_cache.invalidate(current_user_id)
+                    log_with_context(
+                        level="info",
+                        message="Successfully streamed AI flashcards",
+                        user_id=current_user_id,
+                        operation=operation,
+                        extra_context={
+                            "flashcards_count": cards,
+                            "cache_hit": event["result"]["cache_hit"],
+                            "response_time_ms": round(
+                                (time.time() - start_time) * 1000, 2
+                            ),
+                        },
+                    )
+                yield json.dumps(event) + "\n"
+
+        except AIServiceError as e:
+            log_with_context(
+                level="error",
+                message="AI service error during streamed generation",
+                user_id=current_user_id,
+                operation=operation,
+                extra_context={"ai_operation": e.operation, "ai_error": e.details},
+            )
+            if e.operation == "deduplicate_flashcards":
+                error_status = status.HTTP_409_CONFLICT
+                detail = "All generated flashcards already exist in your deck."
+            elif "llm service failed" in e.details.lower():
+                error_status = status.HTTP_503_SERVICE_UNAVAILABLE
+                detail = (
+                    "AI service is temporarily unavailable. Please try again later."
+                )
+            else:
+                error_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+                detail = "Internal error occurred while processing your request."
+            yield json.dumps(
+                {"type": "error", "status": error_status, "detail": detail}
+            ) + "\n"
+
+    streaming_response = StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+    # The injected response is not used when a Response is returned directly
+    add_security_headers(streaming_response)
+    return streaming_response
+
+
+@router.post(
+    "/generate-flashcards/jobs",
+    response_model=AIGenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue flashcard generation from text using AI",
+    description="Same input as /generate-flashcards, but the generation runs in a background "
+    "worker. Returns 202 with a job id at once; poll GET /ai/jobs/{job_id} (also given in "
+    "the Location header) for the status and, once succeeded, the stored flashcards. "
+    "Returns 503 when the job queue is full.",
+)
+async def create_generation_job(
+    request: Request,
+    response: Response,
+    data: AIGenerateFlashcardsRequest,
+    current_user_id: Annotated[uuid.UUID, Depends(require_auth_for_ai)],
+    supabase: Annotated[
+        AsyncPostgrestClient, Depends(get_authenticated_supabase_client)
+    ],
+) -> AIGenerationJobResponse:
+    """
+    Enqueue an AI flashcard generation job.
+
+    The job keeps running if the client disconnects; the result is
+    fetched with get_generation_job.
+
+    Args:
+        request: FastAPI Request object for security analysis
+        response: FastAPI Response object for security headers
+        data: Request data with text_content (1000-100000 characters)
+        current_user_id: Authenticated user ID from JWT
+        supabase: Authenticated client used by the worker
+
+    Returns:
+        The queued job
+
+    Raises:
+        HTTPException: 400 for empty text, 503 if the queue is full
+    """
+    operation = "ai_create_generation_job"
+
+    add_security_headers(response)
+
+    # Rate limiting check (shared budget with the synchronous endpoint)
+    check_rate_limit(request, current_user_id, limit=10, window_minutes=60)
+
+    # Request integrity validation
+    validate_request_integrity(request, current_user_id)
+
+    if len(data.text_content.strip()) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text content cannot be empty",
+        )
+
+    try:
+        job = generation_job_queue.submit(
+            request=data,
+            user_id=current_user_id,
+            supabase_client=supabase,
+            access_token=getattr(request.state, "access_token", None)
+            or request.cookies.get("access_token"),
+        )
+    except GenerationJobQueueError as e:
+        log_with_context(
+            level="warning",
+            message="Generation job rejected",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={"error": e.details},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many generations in progress. Please try again later.",
+            headers={"Retry-After": "30"},
+        )
+
+    log_with_context(
+        level="info",
+        message="Queued AI flashcard generation job",
+        user_id=current_user_id,
+        operation=operation,
+        extra_context={"job_id": str(job.id), "text_length": len(data.text_content)},
+    )
+
+    response.headers["Location"] = str(
+        request.url_for("get_generation_job", job_id=str(job.id)).path
+    )
+    return job.to_response()
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=AIGenerationJobResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get AI generation job status",
+    description="Status of a generation job created with POST /ai/generate-flashcards/jobs. "
+    "The result holds the stored flashcards once the status is 'succeeded'. "
+    "Finished jobs can be polled for a limited time.",
+)
+async def get_generation_job(
+    job_id: uuid.UUID,
+    response: Response,
+    current_user_id: Annotated[uuid.UUID, Depends(require_auth_for_ai)],
+) -> AIGenerationJobResponse:
+    """
+    Get the status and result of a generation job of the current user.
+
+    Args:
+        job_id: Job ID returned by create_generation_job
+        response: FastAPI Response object for security headers
+        current_user_id: Authenticated user ID from JWT
+
+    Returns:
+        The job status, with the result or error once finished
+
+    Raises:
+        HTTPException: 404 if the job is unknown, expired or not the user's
+    """
+    add_security_headers(response)
+    response.headers["Cache-Control"] = "no-store"
+
+    job = generation_job_queue.get(job_id, current_user_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation job not found",
+        )
+
+    return job.to_response()
+
+
 @router.get(
     "/generation-stats",
     response_model=PaginatedAiGenerationStatsResponse,
@@ -368,6 +646,10 @@ async def get_generation_stats(
     ],
     page: int = Query(1, ge=1, description="Page number for pagination"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
+    count: CountStrategyEnum = Query(
+        CountStrategyEnum.EXACT,
+        description="Count strategy: exact, planned, estimated or none (has_more only)",
+    ),
 ) -> PaginatedAiGenerationStatsResponse:
     """
     Get AI generation statistics for the authenticated user with enhanced security.
@@ -377,6 +659,7 @@ async def get_generation_stats(
         response: FastAPI Response object for security headers
         page: Page number (starts from 1)
         size: Items per page (max 100)
+        count: Count strategy for total/pages
         current_user_id: Authenticated user ID from JWT
         ai_generation_service: Service for AI generation operations
 
@@ -427,7 +710,7 @@ async def get_generation_stats(
 
         # Get AI generation statistics using service
         result = await ai_generation_service.get_user_generation_stats(
-            user_id=current_user_id, page=page, size=size
+            user_id=current_user_id, page=page, size=size, count=count
         )
 
         # Log successful retrieval with performance metrics
@@ -508,3 +791,121 @@ async def get_generation_stats(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error occurred while retrieving statistics",
         )
+
+
+@router.get(
+    "/generation-stats/summary",
+    response_model=AiGenerationSummaryResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get aggregated AI generation statistics",
+    description="Get AI generation totals for the authenticated user with per-model "
+    "and per-month breakdowns, optionally limited to a date range.",
+)
+async def get_generation_stats_summary(
+    request: Request,
+    response: Response,
+    current_user_id: Annotated[uuid.UUID, Depends(require_auth_for_ai)],
+    ai_generation_service: Annotated[
+        AiGenerationService, Depends(get_ai_generation_service_dependency)
+    ],
+    date_from: Optional[datetime] = Query(
+        None, description="Only events created at or after this time"
+    ),
+    date_to: Optional[datetime] = Query(
+        None, description="Only events created before this time"
+    ),
+) -> AiGenerationSummaryResponse:
+    """
+    Get aggregated AI generation statistics for the authenticated user.
+
+    Args:
+        request: FastAPI Request object for security analysis
+        response: FastAPI Response object for security headers
+        current_user_id: Authenticated user ID from JWT
+        ai_generation_service: Service for AI generation operations
+        date_from: Optional inclusive lower bound of created_at
+        date_to: Optional exclusive upper bound of created_at
+
+    Returns:
+        Totals with per-model and per-month breakdowns
+
+    Raises:
+        HTTPException: For various error conditions (400, 401, 500)
+    """
+    operation = "get_ai_generation_stats_summary"
+    start_time = time.time()
+
+    try:
+        # Add security headers
+        add_security_headers(response)
+
+        # Rate limiting check
+        check_rate_limit(request, current_user_id, limit=50, window_minutes=60)
+
+        # Request integrity validation
+        validate_request_integrity(request, current_user_id)
+
+        result = await ai_generation_service.get_user_generation_summary(
+            user_id=current_user_id, date_from=date_from, date_to=date_to
+        )
+
+        elapsed_time = (time.time() - start_time) * 1000
+        log_with_context(
+            level="info",
+            message="Successfully retrieved AI generation summary",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={
+                "total_events": result.totals.events,
+                "models": len(result.by_model),
+                "months": len(result.by_month),
+                "response_time_ms": round(elapsed_time, 2),
+            },
+        )
+
+        return result
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        log_with_context(
+            level="error",
+            message="Input validation error",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={"error": str(e)},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except AiGenerationServiceError as e:
+        log_with_context(
+            level="error",
+            message="AI Generation service error during summary retrieval",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={
+                "service_operation": e.operation,
+                "service_error": e.details,
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred while retrieving statistics.",
+        )
+    except Exception as e:
+        log_with_context(
+            level="error",
+            message="Unexpected error during AI generation summary retrieval",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error occurred while retrieving statistics",
+        )
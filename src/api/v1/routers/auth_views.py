@@ -21,6 +21,7 @@ from src.core.exceptions import (
 )
 from src.db.supabase_client import sign_in_with_password, sign_up
 from src.services.auth_service import AuthService
+from src.services.token_cache import verified_token_cache
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -288,6 +289,14 @@ async def logout(request: Request):
     try:
         logger.info("User logout initiated")
 
+        # Forget any cached verification of this session's tokens
+        access_token = request.cookies.get("access_token")
+        if access_token:
+            verified_token_cache.invalidate(access_token)
+        authorization = request.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            verified_token_cache.invalidate(authorization[7:])
+
         # Create response with redirect to login
         response = RedirectResponse(url="/login", status_code=status.HTTP_302_FOUND)
 
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from postgrest import AsyncPostgrestClient
 
 from src.api.v1.routers.ai_router import get_authenticated_supabase_client
 from src.db.supabase_client import get_session, get_supabase_client
@@ -16,7 +17,6 @@ from src.services.dashboard_service import (
     DashboardServiceError,
     get_dashboard_service,
 )
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,8 @@ templates = Jinja2Templates(directory="templates")
 
 
 def get_dashboard_service_dependency(
-    request: Request, supabase: Client = Depends(get_authenticated_supabase_client)
+    request: Request,
+    supabase: AsyncPostgrestClient = Depends(get_authenticated_supabase_client),
 ) -> DashboardService:
     """Dependency to get DashboardService instance with authenticated client."""
     return get_dashboard_service(supabase)
@@ -34,24 +35,19 @@ def get_dashboard_service_dependency(
 async def require_auth(
     request: Request, current_user: Optional[Dict[str, Any]] = Depends(get_current_user)
 ) -> Dict[str, Any]:
-    """Dependency that requires authentication and returns user data."""
-    if not current_user:
-        # Check if user is authenticated via cookie (fallback)
-        if not AuthService.is_authenticated(request):
-            logger.info("Unauthenticated user trying to access protected route")
-            login_url = AuthService.get_login_url_with_redirect(request.url.path)
-            raise HTTPException(
-                status_code=status.HTTP_302_FOUND, headers={"Location": login_url}
-            )
-
-        # Get user data from auth cookie (fallback)
-        auth_data = AuthService.get_auth_data(request)
-        if not auth_data:
-            raise HTTPException(
-                status_code=status.HTTP_302_FOUND, headers={"Location": "/login"}
-            )
+    """
+    Dependency that requires authentication and returns user data.
 
-        return {"id": auth_data.get("user_id"), "email": auth_data.get("email")}
+    Only users whose token the auth middleware verified in this request are
+    accepted; the auth cookie is not decoded here, since cached dashboard
+    stats are served by user id without a database round trip.
+    """
+    if not current_user:
+        logger.info("Unauthenticated user trying to access protected route")
+        login_url = AuthService.get_login_url_with_redirect(request.url.path)
+        raise HTTPException(
+            status_code=status.HTTP_302_FOUND, headers={"Location": login_url}
+        )
 
     return current_user
 
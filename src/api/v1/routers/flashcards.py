@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import uuid
@@ -14,9 +15,13 @@ from fastapi import (
     status,
 )
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from postgrest import AsyncPostgrestClient
 
 from src.api.v1.routers.ai_router import get_authenticated_supabase_client
 from src.api.v1.schemas.flashcard_schemas import (
+    CountStrategyEnum,
+    FlashcardBulkStatusRequest,
+    FlashcardBulkStatusResponse,
     FlashcardManualCreateRequest,
     FlashcardPatchRequest,
     FlashcardResponse,
@@ -26,7 +31,10 @@ from src.api.v1.schemas.flashcard_schemas import (
     PaginatedFlashcardsResponse,
 )
 from src.db.supabase_client import get_supabase_client
+from src.services.dashboard_cache import dashboard_stats_cache
+from src.services.flashcard_dedup import flashcard_dedup_index
 from src.services.flashcard_service import FlashcardService
+from src.services.token_cache import verified_token_cache
 from supabase import Client
 
 logger = logging.getLogger(__name__)
@@ -81,8 +89,15 @@ async def get_current_user_id(
         HTTPException: If token is invalid or user not found
     """
     try:
+        # Reuse the user resolved earlier in this session if still valid
+        cached_user = verified_token_cache.get(credentials.credentials)
+        if cached_user:
+            return uuid.UUID(cached_user["id"])
+
         # Get user from Supabase using the JWT token
-        user_response = supabase.auth.get_user(credentials.credentials)
+        user_response = await asyncio.to_thread(
+            supabase.auth.get_user, credentials.credentials
+        )
 
         if not user_response.user:
             raise HTTPException(
@@ -91,7 +106,12 @@ async def get_current_user_id(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return uuid.UUID(user_response.user.id)
+        user_id = uuid.UUID(user_response.user.id)
+        verified_token_cache.set(
+            credentials.credentials,
+            {"id": str(user_id), "email": user_response.user.email},
+        )
+        return user_id
 
     except ValueError:
         raise HTTPException(
@@ -110,7 +130,9 @@ async def get_current_user_id(
 
 def get_flashcard_service(
     request: Request,
-    supabase: Annotated[Client, Depends(get_authenticated_supabase_client)],
+    supabase: Annotated[
+        AsyncPostgrestClient, Depends(get_authenticated_supabase_client)
+    ],
 ) -> FlashcardService:
     """Dependency to get FlashcardService instance with authenticated client."""
     return FlashcardService(supabase)
@@ -148,7 +170,8 @@ def validate_flashcard_uuid(flashcard_id: uuid.UUID) -> uuid.UUID:
     status_code=status.HTTP_200_OK,
     summary="List user's flashcards",
     description="Retrieve a paginated list of flashcards for the authenticated user. "
-    "Supports filtering by status and source, with configurable pagination.",
+    "Supports filtering by status and source, with page/size pagination or "
+    "keyset pagination via the opaque 'after' cursor.",
 )
 async def list_user_flashcards(
     current_user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
@@ -163,6 +186,14 @@ async def list_user_flashcards(
     ),
     page: int = Query(default=1, ge=1, description="Page number for pagination"),
     size: int = Query(default=20, ge=1, le=100, description="Number of items per page"),
+    after: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor (next_cursor of the previous page); overrides page",
+    ),
+    count: CountStrategyEnum = Query(
+        default=CountStrategyEnum.EXACT,
+        description="Count strategy: exact, planned, estimated or none (has_more only)",
+    ),
 ) -> PaginatedFlashcardsResponse:
     """
     List user's flashcards with optional filtering and pagination.
@@ -172,6 +203,8 @@ async def list_user_flashcards(
         source_filter: Filter flashcards by source (optional)
         page: Page number for pagination (default: 1, min: 1)
         size: Number of items per page (default: 20, min: 1, max: 100)
+        after: Keyset cursor returned as next_cursor by the previous page
+        count: Count strategy for total/pages (default: exact)
         current_user_id: Authenticated user ID from JWT
         flashcard_service: Service for flashcard operations
 
@@ -184,16 +217,26 @@ async def list_user_flashcards(
     try:
         # Create query parameters object
         query_params = ListFlashcardsQueryParams(
-            status=status_filter, source=source_filter, page=page, size=size
+            status=status_filter,
+            source=source_filter,
+            page=page,
+            size=size,
+            after=after,
+            count=count,
         )
 
         # Get flashcards using service
-        result = flashcard_service.get_flashcards_for_user(
+        result = await flashcard_service.get_flashcards_for_user(
             user_id=current_user_id, params=query_params
         )
 
         return result
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Error listing flashcards for user {current_user_id}: {str(e)}")
         raise HTTPException(
@@ -232,9 +275,11 @@ async def create_manual_flashcard(
     """
     try:
         # Create flashcard using service
-        created_flashcard = flashcard_service.create_manual_flashcard(
+        created_flashcard = await flashcard_service.create_manual_flashcard(
             user_id=current_user_id, data=data
         )
+        await dashboard_stats_cache.invalidate(current_user_id)
+        flashcard_dedup_index.add(current_user_id, [created_flashcard])
 
         # Convert to response model
         return FlashcardResponse(**created_flashcard)
@@ -247,6 +292,102 @@ async def create_manual_flashcard(
         )
 
 
+@router.post(
+    "/bulk-status",
+    response_model=FlashcardBulkStatusResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update the status of several flashcards",
+    description="Accept or reject several AI-suggested flashcards in one request. "
+    "Transitions are validated with the same rules as PATCH and applied in a single "
+    "database statement; each item is reported separately, so one invalid item does "
+    "not fail the whole batch.",
+)
+async def bulk_update_flashcard_status(
+    request: Request,
+    response: Response,
+    data: FlashcardBulkStatusRequest,
+    current_user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    flashcard_service: Annotated[FlashcardService, Depends(get_flashcard_service)],
+) -> FlashcardBulkStatusResponse:
+    """
+    Apply status changes to several flashcards at once.
+
+    Args:
+        request: FastAPI Request object for security analysis
+        response: FastAPI Response object for security headers
+        data: Flashcard ids with their target statuses
+        current_user_id: Authenticated user ID from JWT
+        flashcard_service: Service for flashcard operations
+
+    Returns:
+        Per-item results with the number of updated and failed items
+
+    Raises:
+        HTTPException: For various error conditions (400, 401, 422, 429, 500)
+    """
+    operation = "bulk_update_flashcard_status"
+    start_time = time.time()
+
+    try:
+        # Add security headers
+        add_security_headers(response)
+
+        # Rate limiting check
+        check_rate_limit(request, current_user_id, limit=50, window_minutes=60)
+
+        # Request integrity validation
+        validate_request_integrity(request, current_user_id)
+
+        result = await flashcard_service.bulk_update_status(
+            user_id=current_user_id, items=data.items
+        )
+        if result.updated:
+            await dashboard_stats_cache.invalidate(current_user_id)
+
+        elapsed_time = (time.time() - start_time) * 1000
+        log_with_context(
+            level="info",
+            message="Bulk flashcard status update finished",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={
+                "items": len(data.items),
+                "updated": result.updated,
+                "failed": result.failed,
+                "response_time_ms": round(elapsed_time, 2),
+            },
+        )
+
+        return result
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        log_with_context(
+            level="warning",
+            message="Validation error during bulk status update",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={"error": str(e)},
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        log_with_context(
+            level="error",
+            message="Unexpected error during bulk status update",
+            user_id=current_user_id,
+            operation=operation,
+            extra_context={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error occurred while updating flashcards",
+        )
+
+
 @router.get(
     "/{flashcard_id}",
     response_model=FlashcardResponse,
@@ -340,7 +481,7 @@ async def get_flashcard(
             )
 
         # Get flashcard using service with enhanced security
-        flashcard_data = flashcard_service.get_flashcard_by_id(
+        flashcard_data = await flashcard_service.get_flashcard_by_id(
             flashcard_id=validated_flashcard_id, user_id=current_user_id
         )
 
@@ -528,7 +669,7 @@ async def update_flashcard(
             )
 
         # Update flashcard using service with enhanced security
-        updated_flashcard = flashcard_service.update_flashcard(
+        updated_flashcard = await flashcard_service.update_flashcard(
             flashcard_id=validated_flashcard_id,
             user_id=current_user_id,
             updates=updates,
@@ -538,6 +679,10 @@ async def update_flashcard(
         if updated_flashcard is None:
             raise FlashcardNotFoundError(validated_flashcard_id, current_user_id)
 
+        await dashboard_stats_cache.invalidate(current_user_id)
+        if "front_content" in updates:
+            flashcard_dedup_index.add(current_user_id, [updated_flashcard])
+
         # Log successful update with performance metrics
         elapsed_time = (time.time() - start_time) * 1000
         log_with_context(
@@ -696,7 +841,7 @@ async def delete_flashcard(
             )
 
         # Delete flashcard using service with enhanced security
-        deletion_successful = flashcard_service.delete_flashcard_by_id(
+        deletion_successful = await flashcard_service.delete_flashcard_by_id(
             flashcard_id=validated_flashcard_id, user_id=current_user_id
         )
 
@@ -704,6 +849,9 @@ async def delete_flashcard(
         if not deletion_successful:
             raise FlashcardNotFoundError(validated_flashcard_id, current_user_id)
 
+        await dashboard_stats_cache.invalidate(current_user_id)
+        flashcard_dedup_index.remove(current_user_id, validated_flashcard_id)
+
         # Log successful deletion with performance metrics
         elapsed_time = (time.time() - start_time) * 1000
         log_with_context(
@@ -5,9 +5,11 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from postgrest import AsyncPostgrestClient
 
 from src.api.v1.routers.ai_router import get_authenticated_supabase_client
 from src.api.v1.schemas.flashcard_schemas import (
+    CountStrategyEnum,
     FlashcardSourceEnum,
     FlashcardStatusEnum,
     ListFlashcardsQueryParams,
@@ -23,7 +25,6 @@ from src.dtos import (
 from src.middleware.auth_middleware import get_current_user
 from src.services.auth_service import AuthService
 from src.services.flashcard_service import FlashcardService
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,8 @@ templates = Jinja2Templates(directory="templates")
 
 
 def get_flashcard_service_dependency(
-    request: Request, supabase: Client = Depends(get_authenticated_supabase_client)
+    request: Request,
+    supabase: AsyncPostgrestClient = Depends(get_authenticated_supabase_client),
 ) -> FlashcardService:
     """Dependency to get FlashcardService instance with authenticated client."""
     return FlashcardService(supabase)
@@ -71,6 +73,7 @@ async def flashcards_view(
     ),
     page: int = Query(1, ge=1, description="Page number for pagination"),
     size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    after: Optional[str] = Query(None, description="Cursor of the next page"),
     flashcard_service: FlashcardService = Depends(get_flashcard_service_dependency),
     user_data: Dict[str, Any] = Depends(require_auth),
 ):
@@ -82,6 +85,7 @@ async def flashcards_view(
         source: Optional source filter (manual, ai_suggestion)
         page: Page number for pagination (default: 1)
         size: Number of items per page (default: 20, max: 100)
+        after: Opaque keyset cursor; when set, page is ignored
         flashcard_service: Injected flashcard service instance
         user_data: Authenticated user data from middleware
 
@@ -115,12 +119,22 @@ async def flashcards_view(
             source=source_filter,
             page=page,
             size=size,
+            after=after,
+            count=CountStrategyEnum.NONE,  # prev/next only, no COUNT per page
         )
 
-        # Get flashcards using service
-        flashcards_response = flashcard_service.get_flashcards_for_user(
-            user_id=user_id, params=query_params
-        )
+        # Get flashcards using service; fall back to the first page on a bad cursor
+        try:
+            flashcards_response = await flashcard_service.get_flashcards_for_user(
+                user_id=user_id, params=query_params
+            )
+        except ValueError:
+            logger.warning("Invalid flashcards cursor, showing first page")
+            after = None
+            query_params.after = None
+            flashcards_response = await flashcard_service.get_flashcards_for_user(
+                user_id=user_id, params=query_params
+            )
 
         logger.info(
             f"Flashcards view accessed by: {user_email}, "
@@ -133,7 +147,12 @@ async def flashcards_view(
             "request": request,
             "user_email": user_email,
             "flashcards": flashcards_response,
-            "current_filter": {"source": source, "page": page, "size": size},
+            "current_filter": {
+                "source": source,
+                "page": page,
+                "size": size,
+                "after": after,
+            },
             "available_sources": [
                 {"value": "", "label": "Wszystkie"},
                 {"value": "manual", "label": "Ręczne"},
@@ -5,7 +5,9 @@ from datetime import datetime
 from typing import Annotated, Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from postgrest import AsyncPostgrestClient
 
+from src.api.v1.routers.ai_router import get_authenticated_supabase_client
 from src.api.v1.schemas.spaced_repetition_schemas import (
     FlashcardWithRepetition,
     ReviewFlashcardCommand,
@@ -13,11 +15,10 @@ from src.api.v1.schemas.spaced_repetition_schemas import (
     SpacedRepetitionReviewRequest,
     SpacedRepetitionReviewResponse,
 )
-from src.db.supabase_client import get_supabase_client
 from src.middleware.auth_middleware import get_current_user
 from src.services.auth_service import AuthService
+from src.services.dashboard_cache import dashboard_stats_cache
 from src.services.spaced_repetition_service import SpacedRepetitionService
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -79,9 +80,11 @@ async def require_auth_for_api(
 
 
 def get_spaced_repetition_service(
-    supabase: Annotated[Client, Depends(get_supabase_client)],
+    supabase: Annotated[
+        AsyncPostgrestClient, Depends(get_authenticated_supabase_client)
+    ],
 ) -> SpacedRepetitionService:
-    """Dependency to get SpacedRepetitionService instance."""
+    """Dependency to get SpacedRepetitionService instance with authenticated client."""
     return SpacedRepetitionService(supabase)
 
 
@@ -437,6 +440,7 @@ async def submit_flashcard_review(
 
         # Process review using service
         review_result = await spaced_repetition_service.review_flashcard(review_command)
+        await dashboard_stats_cache.invalidate(current_user_id)
 
         # Log successful processing with performance metrics
         elapsed_time = (time.time() - start_time) * 1000
@@ -1,7 +1,9 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from src.api.v1.schemas.flashcard_schemas import CountStrategyEnum
 from src.db.schemas import AiGenerationEvent
 
 
@@ -10,13 +12,60 @@ class AiGenerationStatsQueryParams(BaseModel):
 
     page: int = Field(default=1, ge=1, description="Page number for pagination")
     size: int = Field(default=20, ge=1, le=100, description="Number of items per page")
+    count: CountStrategyEnum = Field(
+        default=CountStrategyEnum.EXACT,
+        description="Count strategy for total/pages ('none' skips counting)",
+    )
 
 
 class PaginatedAiGenerationStatsResponse(BaseModel):
     """Paginated response for AI generation statistics."""
 
     items: List[AiGenerationEvent]
-    total: int = Field(description="Total number of items")
+    total: Optional[int] = Field(
+        default=None, description="Total number of items (None when not counted)"
+    )
     page: int = Field(description="Current page number")
     size: int = Field(description="Items per page")
-    pages: int = Field(description="Total number of pages")
+    pages: Optional[int] = Field(
+        default=None, description="Total number of pages (None when not counted)"
+    )
+    has_more: bool = Field(
+        default=False, description="Whether another page follows this one"
+    )
+
+
+class AiGenerationSummaryStats(BaseModel):
+    """Aggregated counters for a group of AI generation events."""
+
+    events: int = Field(default=0, description="Number of generation events")
+    generated: int = Field(default=0, description="Flashcards generated")
+    accepted: int = Field(default=0, description="Flashcards accepted")
+    rejected: int = Field(default=0, description="Flashcards rejected")
+    cost: float = Field(default=0, description="Total LLM cost")
+
+
+class AiGenerationModelSummary(AiGenerationSummaryStats):
+    """AI generation counters for a single LLM model."""
+
+    model: Optional[str] = Field(default=None, description="LLM model used")
+
+
+class AiGenerationMonthSummary(AiGenerationSummaryStats):
+    """AI generation counters for a single calendar month (UTC)."""
+
+    month: str = Field(description="Month in YYYY-MM format")
+
+
+class AiGenerationSummaryResponse(BaseModel):
+    """Aggregated AI generation statistics with per-model and per-month breakdowns."""
+
+    totals: AiGenerationSummaryStats
+    by_model: List[AiGenerationModelSummary] = Field(default_factory=list)
+    by_month: List[AiGenerationMonthSummary] = Field(default_factory=list)
+    date_from: Optional[datetime] = Field(
+        default=None, description="Inclusive lower bound of created_at"
+    )
+    date_to: Optional[datetime] = Field(
+        default=None, description="Exclusive upper bound of created_at"
+    )
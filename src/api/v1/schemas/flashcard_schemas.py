@@ -18,6 +18,15 @@ class FlashcardSourceEnum(str, Enum):
     AI_SUGGESTION = "ai_suggestion"
 
 
+class CountStrategyEnum(str, Enum):
+    """How list endpoints compute the total row count."""
+
+    EXACT = "exact"  # COUNT(*) over all matching rows
+    PLANNED = "planned"  # planner row estimate, no scan
+    ESTIMATED = "estimated"  # exact for small results, planned above a threshold
+    NONE = "none"  # no count; only has_more from a size+1 fetch
+
+
 class FlashcardManualCreateRequest(BaseModel):
     """Request model for creating a manual flashcard."""
 
@@ -78,13 +87,69 @@ class ListFlashcardsQueryParams(BaseModel):
     )
     page: int = Field(default=1, ge=1, description="Page number for pagination")
     size: int = Field(default=20, ge=1, le=100, description="Number of items per page")
+    after: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from next_cursor; when set, page is ignored",
+    )
+    count: CountStrategyEnum = Field(
+        default=CountStrategyEnum.EXACT,
+        description="Count strategy for total/pages ('none' skips counting)",
+    )
 
 
 class PaginatedFlashcardsResponse(BaseModel):
     """Response model for paginated flashcards list."""
 
     items: List[FlashcardResponse]
-    total: int = Field(description="Total number of flashcards matching criteria")
+    total: Optional[int] = Field(
+        default=None,
+        description="Total number of flashcards matching criteria (None when not counted)",
+    )
     page: int = Field(description="Current page number")
     size: int = Field(description="Number of items per page")
-    pages: int = Field(description="Total number of pages")
+    pages: Optional[int] = Field(
+        default=None, description="Total number of pages (None when not counted)"
+    )
+    has_more: bool = Field(
+        default=False, description="Whether another page follows this one"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor for the next page, None on the last page"
+    )
+
+
+class FlashcardBulkStatusItem(BaseModel):
+    """Single status change in a bulk status update."""
+
+    id: uuid.UUID = Field(description="UUID of the flashcard to update")
+    status: FlashcardStatusEnum = Field(description="Target status")
+
+
+class FlashcardBulkStatusRequest(BaseModel):
+    """Request model for accepting/rejecting several flashcards at once."""
+
+    items: List[FlashcardBulkStatusItem] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Status changes to apply (1-100 items)",
+    )
+
+
+class FlashcardBulkStatusResult(BaseModel):
+    """Outcome of a single item of a bulk status update."""
+
+    id: uuid.UUID
+    success: bool
+    status: Optional[FlashcardStatusEnum] = Field(
+        default=None, description="Status after the request (None if not found)"
+    )
+    error: Optional[str] = Field(default=None, description="Why the item failed")
+
+
+class FlashcardBulkStatusResponse(BaseModel):
+    """Response model for a bulk status update."""
+
+    results: List[FlashcardBulkStatusResult]
+    updated: int = Field(description="Number of flashcards whose status changed")
+    failed: int = Field(description="Number of items that could not be applied")
@@ -1,9 +1,18 @@
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class LLMRoute(BaseModel):
+    """One entry of the LLM routing table."""
+
+    model: str
+    max_chars: Optional[int] = None  # longest source text routed here, None: any
+    max_latency: Optional[float] = None  # seconds (average) before it is skipped
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -11,6 +20,48 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_anon_key: str
     supabase_service_key: Optional[str] = None
+    supabase_jwt_secret: Optional[str] = None  # legacy HS256 signing secret
+    supabase_jwt_audience: str = "authenticated"
+    supabase_jwks_cache_ttl: int = 600  # seconds
+
+    # Supabase HTTP connection pool Configuration
+    supabase_pool_max_connections: int = 100
+    supabase_pool_max_keepalive_connections: int = 20
+    supabase_pool_keepalive_expiry: float = 30.0  # seconds
+    supabase_pool_timeout: float = 10.0  # seconds
+    supabase_pool_http2: bool = True
+    supabase_client_cache_size: int = 256
+
+    # Spaced repetition Configuration
+    spaced_repetition_review_rpc: bool = True  # False: legacy multi-query path
+    spaced_repetition_insert_trigger: bool = True  # rows created by a DB trigger
+
+    # AI generation persistence Configuration
+    ai_generation_persist_rpc: bool = True  # False: legacy per-table inserts
+
+    # AI generation chunking Configuration (long source texts)
+    ai_generation_chunk_max_tokens: int = 2500  # estimated tokens per LLM call
+    ai_generation_chunk_concurrency: int = 4  # parallel LLM calls per generation
+
+    # AI generation jobs Configuration (202 + polling)
+    ai_generation_jobs_concurrency: int = 2  # worker tasks per process
+    ai_generation_jobs_max_queue: int = 100  # queued jobs before new ones are refused
+    ai_generation_jobs_result_ttl: int = 3600  # seconds finished jobs can be polled
+
+    # Near-duplicate detection Configuration (AI suggestions vs. the deck)
+    flashcard_dedup_enabled: bool = True
+    flashcard_dedup_threshold: float = 0.7  # Jaccard of 4-character front shingles
+    flashcard_dedup_max_users: int = 256  # cached per-user indexes
+    flashcard_dedup_ttl: int = 600  # seconds before an index is rebuilt
+
+    # Dashboard Configuration
+    dashboard_stats_table: bool = True  # False: legacy per-request aggregation
+    dashboard_cache_enabled: bool = True
+    dashboard_cache_ttl: int = 30  # seconds served as fresh
+    dashboard_cache_stale_ttl: int = 300  # seconds served stale while refreshing
+    dashboard_cache_max_size: int = 1024  # in-memory backend entries
+    dashboard_cache_backend: str = "memory"  # "memory" or "redis" (shared)
+    dashboard_cache_redis_url: Optional[str] = None
 
     # Application Configuration
     app_secret_key: str
@@ -19,6 +70,8 @@ class Settings(BaseSettings):
     # Auth Configuration
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 hours
+    auth_token_cache_max_size: int = 1024
+    auth_token_cache_max_ttl: int = 300  # seconds, never beyond token exp
 
     # OpenRouter/LLM Configuration
     OPENROUTER_API_KEY: Optional[str] = None
@@ -26,6 +79,39 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "google/gemma-3-27b-it"
     LLM_TIMEOUT: int = 30
     LLM_MAX_TOKENS: int = 2000
+    LLM_HTTP2: bool = True
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    LLM_RETRY_MAX_ATTEMPTS: int = 3  # attempts per call, 1 disables retries
+    LLM_RETRY_BASE_DELAY: float = 0.5  # seconds, doubled per retry (jittered)
+    LLM_RETRY_MAX_DELAY: float = 8.0  # seconds
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive transient failures
+    LLM_CIRCUIT_RECOVERY_TIMEOUT: float = 30.0  # seconds failing fast when open
+    LLM_FALLBACK_MODEL: Optional[str] = None  # hedged requests; None disables
+    LLM_HEDGE_PERCENTILE: float = 0.95  # hedge once a call is slower than this
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # latencies needed before hedging
+
+    # LLM routing Configuration (model per request)
+    LLM_ROUTES: List[LLMRoute] = []  # tried in order; empty: always LLM_MODEL
+    LLM_MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+        "google/gemma-3-27b-it": (0.10, 0.20),  # USD per 1M input/output tokens
+    }
+    LLM_ROUTER_MAX_ERROR_RATE: float = 0.5  # average error rate of a healthy route
+    LLM_ROUTER_MIN_SAMPLES: int = 5  # calls before a route's health is judged
+    LLM_ROUTER_PROBE_INTERVAL: float = 30.0  # seconds between unhealthy route tries
+    LLM_ROUTER_EWMA_ALPHA: float = 0.2  # weight of the newest call in averages
+
+    # LLM scheduling Configuration (global cap, per-user fair queuing)
+    llm_scheduler_enabled: bool = True
+    llm_scheduler_max_concurrency: int = 8  # in-flight LLM calls per process
+    llm_scheduler_user_weights: Dict[str, float] = {}  # user id -> share, default 1
+
+    # LLM generation cache Configuration
+    llm_cache_enabled: bool = True
+    llm_cache_max_size: int = 256  # in-memory entries
+    llm_cache_ttl: int = 7 * 24 * 3600  # seconds, both tiers
+    llm_cache_persistent: bool = True  # llm_generation_cache table tier
 
     model_config = SettingsConfigDict(
         env_file=".env",
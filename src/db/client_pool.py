@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseClientPool:
+    """
+    Process-wide factory for authenticated async PostgREST clients.
+
+    Every client handed out shares a single long-lived httpx.AsyncClient, so
+    TLS sessions and keep-alive connections are reused across requests and
+    queries are awaited without blocking the event loop. Clients are cached
+    per access token (keyed by its SHA-256 hash); PostgREST request builders
+    carry their own headers, so the shared connection pool is never mutated.
+    """
+
+    def __init__(
+        self,
+        supabase_url: str,
+        supabase_key: str,
+        service_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        http2: bool = True,
+        max_cached_clients: int = 256,
+    ):
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.service_key = service_key
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self.max_cached_clients = max_cached_clients
+
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._clients: "OrderedDict[str, AsyncPostgrestClient]" = OrderedDict()
+        self._service_client: Optional[AsyncPostgrestClient] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "SupabaseClientPool":
+        """Build a pool configured from application settings."""
+        return cls(
+            supabase_url=app_settings.supabase_url,
+            supabase_key=app_settings.supabase_anon_key,
+            service_key=app_settings.supabase_service_key,
+            max_connections=app_settings.supabase_pool_max_connections,
+            max_keepalive_connections=app_settings.supabase_pool_max_keepalive_connections,
+            keepalive_expiry=app_settings.supabase_pool_keepalive_expiry,
+            timeout=app_settings.supabase_pool_timeout,
+            http2=app_settings.supabase_pool_http2,
+            max_cached_clients=app_settings.supabase_client_cache_size,
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared async httpx client (connection pool), created on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                follow_redirects=True,
+            )
+            logger.info(
+                f"Created shared Supabase HTTP pool | "
+                f"max_connections={self.limits.max_connections} | "
+                f"max_keepalive={self.limits.max_keepalive_connections}"
+            )
+        return self._http_client
+
+    @staticmethod
+    def _token_key(access_token: str) -> str:
+        """Hash the access token so raw tokens are never used as cache keys."""
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    def _build_client(
+        self, access_token: str, api_key: Optional[str] = None
+    ) -> AsyncPostgrestClient:
+        """Create a PostgREST client bound to the shared pool for one token."""
+        return AsyncPostgrestClient(
+            f"{self.supabase_url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": api_key or self.supabase_key,
+                "Authorization": f"Bearer {access_token}",
+            },
+            http_client=self.http_client,
+        )
+
+    def get_anon_client(self) -> AsyncPostgrestClient:
+        """
+        Return a PostgREST client that uses the anon key as bearer token.
+
+        Returns:
+            Client for queries that run under the anon role
+        """
+        return self.get_client(self.supabase_key)
+
+    def get_service_client(self) -> Optional[AsyncPostgrestClient]:
+        """
+        Return a PostgREST client that runs under the service_role.
+
+        Only for server-side writes that users must not make themselves;
+        the client bypasses Row Level Security.
+
+        Returns:
+            Service client, or None if SUPABASE_SERVICE_KEY is not configured
+        """
+        if not self.service_key:
+            return None
+
+        with self._lock:
+            client = self._service_client
+        if client is None:
+            client = self._build_client(self.service_key, api_key=self.service_key)
+            with self._lock:
+                self._service_client = client
+        return client
+
+    def get_client(self, access_token: str) -> AsyncPostgrestClient:
+        """
+        Return a PostgREST client authenticated with the given access token.
+
+        Args:
+            access_token: Supabase JWT used for Row Level Security
+
+        Returns:
+            Client that sends the token as bearer and uses the shared pool
+        """
+        key = self._token_key(access_token)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            self.misses += 1
+
+        client = self._build_client(access_token)
+
+        with self._lock:
+            self._clients[key] = client
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_cached_clients:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+
+        return client
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return pool configuration and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "cached_clients": len(self._clients),
+                "max_cached_clients": self.max_cached_clients,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            }
+
+    async def aclose(self) -> None:
+        """Drop cached clients and close the shared connection pool."""
+        with self._lock:
+            self._clients.clear()
+            self._service_client = None
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+            logger.info("Closed shared Supabase HTTP pool")
+        self._http_client = None
+
+
+# Create global pool instance
+client_pool = SupabaseClientPool.from_settings(settings)
+
+
+def get_client_pool() -> SupabaseClientPool:
+    """Dependency function to get the process-wide client pool."""
+    return client_pool
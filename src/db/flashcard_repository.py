@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from supabase import Client
+from postgrest import AsyncPostgrestClient
 
 logger = logging.getLogger(__name__)
 
@@ -11,10 +11,10 @@ logger = logging.getLogger(__name__)
 class FlashcardRepository:
     """Repository pattern for optimized flashcard database operations."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: AsyncPostgrestClient):
         self.supabase = supabase_client
 
-    def get_flashcard_by_id_and_user(
+    async def get_flashcard_by_id_and_user(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID
     ) -> Optional[Dict[str, Any]]:
         """
@@ -28,7 +28,7 @@ class FlashcardRepository:
             Flashcard data if found and accessible, None otherwise
         """
         try:
-            response = (
+            response = await (
                 self.supabase.table("flashcards")
                 .select("*")
                 .eq("id", str(flashcard_id))
@@ -45,7 +45,7 @@ class FlashcardRepository:
             logger.error(f"Error getting flashcard {flashcard_id}: {str(e)}")
             raise
 
-    def update_flashcard_optimized(
+    async def update_flashcard_optimized(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """
@@ -65,7 +65,7 @@ class FlashcardRepository:
             updates_with_timestamp["updated_at"] = datetime.utcnow().isoformat()
 
             # Single query with ownership verification built-in
-            response = (
+            response = await (
                 self.supabase.table("flashcards")
                 .update(updates_with_timestamp)
                 .eq("id", str(flashcard_id))
@@ -81,70 +81,6 @@ class FlashcardRepository:
             logger.error(f"Error updating flashcard {flashcard_id}: {str(e)}")
             raise
 
-    def get_ai_generation_event_by_source_text(
-        self, source_text_id: uuid.UUID
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Get AI generation event by source text ID for statistics updates.
-
-        Args:
-            source_text_id: UUID of the source text
-
-        Returns:
-            AI generation event data if found, None otherwise
-        """
-        try:
-            response = (
-                self.supabase.table("ai_generation_events")
-                .select("*")
-                .eq("source_text_id", str(source_text_id))
-                .limit(1)
-                .execute()
-            )
-
-            if response.data:
-                return response.data[0]
-            return None
-
-        except Exception as e:
-            logger.error(
-                f"Error getting AI generation event for source_text {source_text_id}: {str(e)}"
-            )
-            raise
-
-    def update_ai_generation_event_stats(
-        self, event_id: uuid.UUID, stats_updates: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Update AI generation event statistics using optimized query.
-
-        Args:
-            event_id: UUID of the AI generation event
-            stats_updates: Dictionary of statistics to update
-
-        Returns:
-            Updated event data if successful, None otherwise
-        """
-        try:
-            # Add automatic timestamp update
-            stats_with_timestamp = stats_updates.copy()
-            stats_with_timestamp["updated_at"] = datetime.utcnow().isoformat()
-
-            response = (
-                self.supabase.table("ai_generation_events")
-                .update(stats_with_timestamp)
-                .eq("id", str(event_id))
-                .execute()
-            )
-
-            if response.data:
-                return response.data[0]
-            return None
-
-        except Exception as e:
-            logger.error(f"Error updating AI generation event {event_id}: {str(e)}")
-            raise
-
     async def batch_get_flashcards_with_stats(
         self, user_id: uuid.UUID, flashcard_ids: List[uuid.UUID]
     ) -> List[Dict[str, Any]]:
@@ -165,7 +101,7 @@ class FlashcardRepository:
             # Convert UUIDs to strings for query
             id_strings = [str(fid) for fid in flashcard_ids]
 
-            response = (
+            response = await (
                 self.supabase.table("flashcards")
                 .select("*")
                 .eq("user_id", str(user_id))
@@ -260,7 +196,7 @@ class FlashcardRepository:
                     for key, value in conditions.items():
                         query = query.eq(key, value)
 
-                    response = query.execute()
+                    response = await query.execute()
                     result = response.data[0] if response.data else None
                     results.append(result)
                     executed_operations.append(
@@ -268,7 +204,7 @@ class FlashcardRepository:
                     )
 
                 elif op_type == "insert":
-                    response = self.supabase.table(table).insert(data).execute()
+                    response = await self.supabase.table(table).insert(data).execute()
                     result = response.data[0] if response.data else None
                     results.append(result)
                     executed_operations.append(
@@ -304,7 +240,7 @@ class FlashcardRepository:
                     result = operation.get("result")
                     if result and "id" in result:
                         try:
-                            self.supabase.table(operation["table"]).delete().eq(
+                            await self.supabase.table(operation["table"]).delete().eq(
                                 "id", result["id"]
                             ).execute()
                             logger.info(
@@ -330,7 +266,9 @@ class FlashcardRepository:
         """
         try:
             # Simple query to check connection
-            response = self.supabase.table("flashcards").select("id").limit(1).execute()
+            response = (
+                await self.supabase.table("flashcards").select("id").limit(1).execute()
+            )
 
             return {
                 "status": "healthy",
@@ -29,6 +29,7 @@ class AiGenerationEventBase(BaseModel):
     rejected_cards_count: int
     llm_model_used: Optional[str] = None
     cost: Optional[float] = None
+    cache_hit: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -83,6 +84,7 @@ class AiGenerationEventCreate(BaseModel):
     rejected_cards_count: int = 0
     llm_model_used: Optional[str] = None
     cost: Optional[float] = None
+    cache_hit: bool = False
     # id, created_at, updated_at are typically generated by the database or ORM
 
 
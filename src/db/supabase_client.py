@@ -1,6 +1,8 @@
 import logging
+from typing import Any, Dict
 
 from src.core.config import settings
+from src.db.client_pool import client_pool
 from supabase import Client, create_client
 
 logger = logging.getLogger(__name__)
@@ -69,12 +71,24 @@ async def get_session():
         raise
 
 
-async def refresh_session():
-    """Refresh current session."""
+async def refresh_session(refresh_token: str) -> Dict[str, Any]:
+    """
+    Exchange a refresh token for a new session.
+
+    Calls the GoTrue token endpoint directly over the shared connection pool,
+    so no session state is stored on the global client and concurrent
+    requests for different users cannot see each other's tokens.
+    """
     try:
-        session = supabase.auth.refresh_session()
+        response = await client_pool.http_client.post(
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/token",
+            params={"grant_type": "refresh_token"},
+            headers={"apikey": settings.supabase_anon_key},
+            json={"refresh_token": refresh_token},
+        )
+        response.raise_for_status()
         logger.info("Session refreshed successfully")
-        return session
+        return response.json()
     except Exception as e:
         logger.error(f"Failed to refresh session: {str(e)}")
         raise
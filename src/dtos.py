@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from enum import Enum
 from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
@@ -47,6 +48,12 @@ class LLMGenerateResponse(BaseModel):
     )
     model_used: str = Field(..., description="Name of the LLM model used")
     cost: Optional[float] = Field(None, description="Cost of the LLM request in USD")
+    cache_hit: bool = Field(
+        False, description="Whether the response was served from the generation cache"
+    )
+    failed_chunks: int = Field(
+        0, description="Chunks of a long source text whose generation failed"
+    )
 
 
 # --- Modele dla zasobu Flashcards ---
@@ -87,8 +94,12 @@ class AIGenerateFlashcardsRequest(BaseModel):
     text_content: str = Field(
         ...,
         min_length=1000,
-        max_length=10000,
-        description="Text content to generate flashcards from (1000-10000 characters).",
+        max_length=100000,
+        description="Text content to generate flashcards from (1000-100000 characters). "
+        "Long texts are split into chunks that are generated in parallel.",
+    )
+    force_regenerate: bool = Field(
+        False, description="Skip the generation cache and call the LLM again."
     )
 
 
@@ -99,6 +110,34 @@ class AIGenerateFlashcardsResponse(BaseModel):
     source_text_id: uuid.UUID
     ai_generation_event_id: uuid.UUID
     suggested_flashcards: List[FlashcardResponse]
+    cache_hit: bool = False
+    duplicates_dropped: int = Field(
+        default=0,
+        description="Suggestions not stored because they nearly duplicate existing flashcards",
+    )
+    failed_chunks: int = Field(
+        default=0,
+        description="Chunks of a long source text that produced no flashcards because their LLM call failed",
+    )
+
+
+class AIGenerationJobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class AIGenerationJobResponse(BaseModel):
+    job_id: uuid.UUID
+    status: AIGenerationJobStatusEnum
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[AIGenerateFlashcardsResponse] = Field(
+        None, description="Generated flashcards once the job has succeeded."
+    )
+    error: Optional[str] = Field(None, description="Error message if the job failed.")
 
 
 class AIGenerationEventResponse(AiGenerationEventBase):
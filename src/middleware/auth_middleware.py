@@ -3,10 +3,9 @@ from typing import Callable
 
 import jwt
 from fastapi import Request, Response
-from fastapi.responses import RedirectResponse
 
-from src.db.supabase_client import get_session, supabase
 from src.services.auth_service import AuthService
+from src.services.token_verifier import token_verifier
 
 logger = logging.getLogger(__name__)
 
@@ -26,85 +25,56 @@ class AuthMiddleware:
                 "/register",
                 "/verify-email",
                 "/reset-password",
+                "/health",
+                "/metrics",
+                "/favicon.ico",
             ]
         ):
             return await call_next(request)
 
-        # Check if user has auth tokens
-        auth_data = AuthService.get_auth_data(request)
+        access_token = request.cookies.get("access_token")
 
-        if auth_data and auth_data.get("access_token"):
+        if access_token:
+            # Only verification is guarded; errors raised by the route handler
+            # must not run it a second time
+            claims = None
             try:
-                # Verify token with Supabase
-                access_token = auth_data["access_token"]
-                refresh_token = request.cookies.get("refresh_token")
-
-                # Try to get current session from Supabase
-                if refresh_token:
-                    supabase.auth.set_session(access_token, refresh_token)
-                else:
-                    # If no refresh token, try to validate access token differently
-                    try:
-                        user_response = supabase.auth.get_user(access_token)
-                        if user_response.user:
-                            request.state.user = {
-                                "id": user_response.user.id,
-                                "email": user_response.user.email,
-                            }
-                            response = await call_next(request)
-                            return response
-                    except Exception:
-                        pass
-
-                session = await get_session()
-
-                if session and hasattr(session, "user") and session.user:
-                    # Session is valid, continue
-                    request.state.user = {
-                        "id": session.user.id,
-                        "email": session.user.email,
-                        "session": session,
-                    }
-                    response = await call_next(request)
-                    return response
-                else:
-                    # Token might be expired, try to refresh
-                    logger.info("Access token expired, attempting refresh")
-
-                    # Create temporary response to handle cookies
-                    temp_response = Response()
-                    if await AuthService.refresh_auth_token(request, temp_response):
-                        # Refresh successful, retry with new token
-                        response = await call_next(request)
-
-                        # Copy cookies from temp response
-                        for cookie in temp_response.raw_headers:
-                            if cookie[0] == b"set-cookie":
-                                response.raw_headers.append(cookie)
-
-                        return response
-                    else:
-                        # Refresh failed, clear cookies
-                        logger.warning("Token refresh failed, clearing auth")
-                        response = await call_next(request)
-                        AuthService.clear_auth_cookie(response)
-                        return response
-
+                # Verify token locally (signature, audience, issuer, expiry)
+                claims = await token_verifier.verify(access_token)
             except jwt.ExpiredSignatureError:
-                logger.info("JWT expired, attempting refresh")
-
-                # Try to refresh token
-                temp_response = Response()
-                if await AuthService.refresh_auth_token(request, temp_response):
-                    response = await call_next(request)
-                    # Copy cookies from temp response
-                    for cookie in temp_response.raw_headers:
-                        if cookie[0] == b"set-cookie":
-                            response.raw_headers.append(cookie)
-                    return response
-
+                logger.info("Access token expired, attempting refresh")
+            except jwt.InvalidTokenError as e:
+                logger.warning(f"Invalid access token, attempting refresh: {str(e)}")
             except Exception as e:
                 logger.error(f"Auth middleware error: {str(e)}")
+                return await call_next(request)
+
+            if claims is not None:
+                request.state.user = {
+                    "id": claims["sub"],
+                    "email": claims.get("email"),
+                }
+                request.state.access_token = access_token
+                return await call_next(request)
+
+            # Only the refresh goes to the auth server
+            temp_response = Response()
+            if await AuthService.refresh_auth_token(request, temp_response):
+                # Refresh successful, continue with the new token
+                response = await call_next(request)
+
+                # Copy cookies from temp response
+                for cookie in temp_response.raw_headers:
+                    if cookie[0] == b"set-cookie":
+                        response.raw_headers.append(cookie)
+
+                return response
+            else:
+                # Refresh failed, clear cookies
+                logger.warning("Token refresh failed, clearing auth")
+                response = await call_next(request)
+                AuthService.clear_auth_cookie(response)
+                return response
 
         # Continue without auth for public routes
         response = await call_next(request)
@@ -1,11 +1,18 @@
 import logging
 import math
 import uuid
+from datetime import datetime, timezone
 from typing import Optional
 
-from src.api.v1.schemas.ai_schemas import PaginatedAiGenerationStatsResponse
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
+
+from src.api.v1.schemas.ai_schemas import (
+    AiGenerationSummaryResponse,
+    PaginatedAiGenerationStatsResponse,
+)
+from src.api.v1.schemas.flashcard_schemas import CountStrategyEnum
 from src.db.schemas import AiGenerationEvent
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +29,27 @@ class AiGenerationServiceError(Exception):
 class AiGenerationService:
     """Service for AI generation statistics and operations."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: AsyncPostgrestClient):
         self.supabase = supabase_client
 
     async def get_user_generation_stats(
-        self, user_id: uuid.UUID, page: int, size: int
+        self,
+        user_id: uuid.UUID,
+        page: int,
+        size: int,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
     ) -> PaginatedAiGenerationStatsResponse:
         """
         Get paginated AI generation statistics for a user.
 
+        The count (if any) is returned together with the page in one request.
+        A page past the end is empty; its total comes from a count-only query.
+
         Args:
             user_id: User UUID
             page: Page number (starts from 1)
             size: Items per page
+            count: Count strategy; 'none' skips counting and reports has_more
 
         Returns:
             Paginated response with AI generation events
@@ -46,29 +61,35 @@ class AiGenerationService:
             # Calculate offset for pagination
             offset = (page - 1) * size
 
-            # Count total records for the user
-            count_response = (
-                self.supabase.table("ai_generation_events")
-                .select("*", count="exact")
-                .eq("user_id", str(user_id))
-                .execute()
-            )
-
-            total = count_response.count or 0
-
-            # Fetch paginated records
-            data_response = (
-                self.supabase.table("ai_generation_events")
-                .select("*")
-                .eq("user_id", str(user_id))
-                .order("created_at", desc=True)
-                .range(offset, offset + size - 1)
-                .execute()
-            )
+            count_method = None if count == CountStrategyEnum.NONE else count.value
+
+            # Fetch paginated records (plus one to detect a next page) and count
+            try:
+                data_response = await (
+                    self.supabase.table("ai_generation_events")
+                    .select("*", count=count_method)
+                    .eq("user_id", str(user_id))
+                    .order("created_at", desc=True)
+                    .range(offset, offset + size)
+                    .execute()
+                )
+            except APIError as e:
+                # Offset past the last counted row: nothing left on this page
+                if e.code != "PGRST103":
+                    raise
+                data_response = None
+
+            records = (data_response.data if data_response else None) or []
+            has_more = len(records) > size
+            total = None
+            if count_method and data_response is not None:
+                total = data_response.count or 0
+            elif count_method:
+                total = await self._count_events(user_id, count_method)
 
             # Convert to Pydantic models
             items = []
-            for record in data_response.data:
+            for record in records[:size]:
                 # Convert record to AiGenerationEvent
                 event = AiGenerationEvent(
                     id=record["id"],
@@ -79,20 +100,28 @@ class AiGenerationService:
                     rejected_cards_count=record["rejected_cards_count"],
                     llm_model_used=record.get("llm_model_used"),
                     cost=record.get("cost"),
+                    cache_hit=record.get("cache_hit", False),
                     created_at=record["created_at"],
                     updated_at=record["updated_at"],
                 )
                 items.append(event)
 
-            # Calculate total pages (ceiling division)
-            pages = math.ceil(total / size) if total > 0 else 1
+            # Calculate total pages (ceiling division, unknown without a count)
+            pages = None
+            if total is not None:
+                pages = math.ceil(total / size) if total > 0 else 1
 
             logger.info(
                 f"Retrieved {len(items)} AI generation events for user {user_id} (page {page}/{pages})"
             )
 
             return PaginatedAiGenerationStatsResponse(
-                items=items, total=total, page=page, size=size, pages=pages
+                items=items,
+                total=total,
+                page=page,
+                size=size,
+                pages=pages,
+                has_more=has_more,
             )
 
         except Exception as e:
@@ -104,7 +133,88 @@ class AiGenerationService:
                 details=f"Database query failed: {str(e)}",
             )
 
+    async def _count_events(self, user_id: uuid.UUID, count_method: str) -> int:
+        """Count the user's generation events without fetching rows."""
+        count_response = await (
+            self.supabase.table("ai_generation_events")
+            .select("id", count=count_method, head=True)
+            .eq("user_id", str(user_id))
+            .execute()
+        )
+        return count_response.count or 0
+
+    async def get_user_generation_summary(
+        self,
+        user_id: uuid.UUID,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> AiGenerationSummaryResponse:
+        """
+        Get aggregated AI generation statistics for a user.
+
+        Totals and the per-model and per-month breakdowns are computed by the
+        ai_generation_summary database function in a single call. Both bounds
+        are converted to UTC; naive ones are taken as UTC.
+
+        Args:
+            user_id: User UUID
+            date_from: Optional inclusive lower bound of created_at
+            date_to: Optional exclusive upper bound of created_at
+
+        Returns:
+            Aggregated statistics with breakdowns
+
+        Raises:
+            ValueError: If date_from is not before date_to
+            AiGenerationServiceError: If database operation fails
+        """
+        date_from = self._to_utc(date_from)
+        date_to = self._to_utc(date_to)
+        if date_from and date_to and date_from >= date_to:
+            raise ValueError("date_from must be earlier than date_to")
+
+        try:
+            response = await self.supabase.rpc(
+                "ai_generation_summary",
+                {
+                    "p_user_id": str(user_id),
+                    "p_from": date_from.isoformat() if date_from else None,
+                    "p_to": date_to.isoformat() if date_to else None,
+                },
+            ).execute()
+
+            summary = AiGenerationSummaryResponse(
+                **(response.data or {"totals": {}}),
+                date_from=date_from,
+                date_to=date_to,
+            )
+
+            logger.info(
+                f"Retrieved AI generation summary for user {user_id} "
+                f"({summary.totals.events} events)"
+            )
+
+            return summary
+
+        except Exception as e:
+            logger.error(
+                f"Error retrieving AI generation summary for user {user_id}: {str(e)}"
+            )
+            raise AiGenerationServiceError(
+                operation="get_user_generation_summary",
+                details=f"Database query failed: {str(e)}",
+            )
+
+    @staticmethod
+    def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+        """Return an aware UTC datetime, treating naive values as UTC."""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
 
-def get_ai_generation_service(supabase: Client) -> AiGenerationService:
+def get_ai_generation_service(supabase: AsyncPostgrestClient) -> AiGenerationService:
     """Dependency factory for AiGenerationService."""
     return AiGenerationService(supabase)
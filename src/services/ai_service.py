@@ -1,8 +1,14 @@
+import asyncio
+import hashlib
 import logging
 import uuid
 from datetime import datetime
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import settings
+from src.db.client_pool import client_pool
 from src.db.schemas import (
     AiGenerationEventCreate,
     FlashcardCreate,
@@ -15,9 +21,19 @@ from src.dtos import (
     AIGenerateFlashcardsRequest,
     AIGenerateFlashcardsResponse,
     FlashcardResponse,
+    LLMFlashcardSuggestion,
+    LLMGenerateResponse,
+)
+from src.services.flashcard_dedup import FlashcardDedupIndex, flashcard_dedup_index
+from src.services.llm_cache import (
+    LLMGenerationCache,
+    llm_generation_cache,
+    make_cache_key,
+    normalize_text,
 )
-from src.services.llm_client import LLMClient, LLMServiceError
-from supabase import Client
+from src.services.llm_client import LLMServiceError, get_llm_client
+from src.services.single_flight import SingleFlight
+from src.services.text_chunker import split_text_into_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +48,44 @@ class AIServiceError(Exception):
         super().__init__(f"AI service error during {operation}: {details}")
 
 
+# In-flight generations shared by all AIService instances of the process
+ai_generation_single_flight = SingleFlight()
+
+
 class AIService:
     """Service for AI-powered flashcard generation."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(
+        self,
+        supabase_client: AsyncPostgrestClient,
+        use_persist_rpc: Optional[bool] = None,
+        use_repetition_trigger: Optional[bool] = None,
+        llm_cache: Optional[LLMGenerationCache] = None,
+        chunk_max_tokens: Optional[int] = None,
+        chunk_concurrency: Optional[int] = None,
+        single_flight: Optional[SingleFlight] = None,
+        dedup_index: Optional[FlashcardDedupIndex] = None,
+    ):
         self.supabase = supabase_client
+        self.dedup_index = dedup_index or flashcard_dedup_index
+        self.llm_cache = llm_cache or llm_generation_cache
+        self.single_flight = single_flight or ai_generation_single_flight
+        self.chunk_max_tokens = (
+            chunk_max_tokens or settings.ai_generation_chunk_max_tokens
+        )
+        self.chunk_concurrency = (
+            chunk_concurrency or settings.ai_generation_chunk_concurrency
+        )
+        self.use_persist_rpc = (
+            settings.ai_generation_persist_rpc
+            if use_persist_rpc is None
+            else use_persist_rpc
+        )
+        self.use_repetition_trigger = (
+            settings.spaced_repetition_insert_trigger
+            if use_repetition_trigger is None
+            else use_repetition_trigger
+        )
 
     async def generate_flashcards_from_text(
         self, request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
@@ -44,6 +93,10 @@ class AIService:
         """
         Generate flashcards from text using AI and save to database.
 
+        Identical requests of the same user that arrive while a generation is
+        in flight (double clicks, client retries) share its result instead of
+        calling the LLM and storing the source text again.
+
         Args:
             request: Request containing text content
             user_id: ID of the authenticated user
@@ -54,10 +107,22 @@ class AIService:
         Raises:
             AIServiceError: If any step of the process fails
         """
+        return await self.single_flight.do(
+            self._single_flight_key(request, user_id),
+            lambda: self._generate_flashcards(request, user_id),
+        )
+
+    async def _generate_flashcards(
+        self, request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
+    ) -> AIGenerateFlashcardsResponse:
+        """Run one generation: LLM call and persistence."""
         operation = "generate_flashcards_from_text"
         logger.info(f"Starting AI flashcard generation for user {user_id}")
 
         try:
+            if self.use_persist_rpc:
+                return await self._generate_and_persist_rpc(request, user_id)
+
             # Step 1: Create source_text record
             source_text = await self._create_source_text(
                 text_content=request.text_content, user_id=user_id
@@ -65,53 +130,245 @@ class AIService:
             logger.info(f"Created source text {source_text['id']} for user {user_id}")
 
             # Step 2: Generate flashcards using LLM
-            llm_response = await self._generate_with_llm(request.text_content)
+            llm_response = await self._generate_with_llm(
+                request.text_content,
+                force_regenerate=request.force_regenerate,
+                user_id=user_id,
+            )
             logger.info(
                 f"LLM generated {len(llm_response.flashcards)} flashcards using {llm_response.model_used}"
             )
 
-            # Step 3: Create flashcard records with active status
-            created_flashcards = await self._create_flashcard_records(
-                llm_suggestions=llm_response.flashcards,
-                user_id=user_id,
+            # Step 3: Skip near-duplicates of cards already in the deck
+            llm_response, duplicates_dropped = await self._drop_near_duplicates(
+                llm_response, user_id
+            )
+
+            # Step 4: Create flashcard, spaced repetition and generation event records
+            generation = await self._persist_generation_rows(
                 source_text_id=uuid.UUID(source_text["id"]),
+                llm_response=llm_response,
+                user_id=user_id,
             )
-            logger.info(f"Created {len(created_flashcards)} flashcard records")
 
-            # Step 3.5: Create spaced repetition records for all flashcards
-            await self._create_spaced_repetition_records(
-                flashcards=created_flashcards, user_id=user_id
+            # Step 5: Convert to response models
+            response = self._build_generation_response(
+                generation, llm_response, duplicates_dropped
             )
+
             logger.info(
-                f"Created spaced repetition records for {len(created_flashcards)} flashcards"
+                f"Successfully completed AI flashcard generation for user {user_id}"
             )
+            return response
 
-            # Step 4: Create AI generation event record
-            ai_event = await self._create_ai_generation_event(
+        except AIServiceError:
+            raise
+        except LLMServiceError as e:
+            logger.error(f"LLM service error for user {user_id}: {e.details}")
+            raise AIServiceError(
+                operation=operation,
+                details=f"LLM service failed: {e.details}",
+                user_id=user_id,
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error in AI service for user {user_id}: {str(e)}")
+            raise AIServiceError(
+                operation=operation,
+                details=f"Unexpected error: {str(e)}",
                 user_id=user_id,
-                source_text_id=uuid.UUID(source_text["id"]),
-                generated_count=len(llm_response.flashcards),
-                model_used=llm_response.model_used,
-                cost=llm_response.cost,
             )
-            logger.info(f"Created AI generation event {ai_event['id']}")
 
-            # Step 5: Convert to response models
-            flashcard_responses = [
-                FlashcardResponse(**flashcard) for flashcard in created_flashcards
-            ]
+    async def _generate_and_persist_rpc(
+        self, request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
+    ) -> AIGenerateFlashcardsResponse:
+        """
+        Generate flashcards and store the whole generation in one transaction.
 
-            response = AIGenerateFlashcardsResponse(
-                source_text_id=uuid.UUID(source_text["id"]),
-                ai_generation_event_id=uuid.UUID(ai_event["id"]),
-                suggested_flashcards=flashcard_responses,
+        The LLM is called first; the source text, flashcards, spaced repetition
+        records and generation event are then written by the
+        persist_ai_generation database function, so a failure leaves no
+        partial rows behind. Near-duplicates of existing cards are dropped
+        before storing.
+
+        Args:
+            request: Request containing text content
+            user_id: ID of the authenticated user
+
+        Returns:
+            Response with generated flashcards and metadata
+        """
+        llm_response = await self._generate_with_llm(
+            request.text_content,
+            force_regenerate=request.force_regenerate,
+            user_id=user_id,
+        )
+        logger.info(
+            f"LLM generated {len(llm_response.flashcards)} flashcards using {llm_response.model_used}"
+        )
+
+        llm_response, duplicates_dropped = await self._drop_near_duplicates(
+            llm_response, user_id
+        )
+        generation = await self._persist_generation(
+            text_content=request.text_content,
+            llm_response=llm_response,
+            user_id=user_id,
+        )
+        logger.info(
+            f"Persisted AI generation {generation['ai_generation_event_id']} with "
+            f"{len(generation['flashcards'])} flashcards for user {user_id}"
+        )
+
+        return self._build_generation_response(
+            generation, llm_response, duplicates_dropped
+        )
+
+    async def stream_flashcards_from_text(
+        self, request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate flashcards with a streamed LLM completion.
+
+        Yields a ``card`` event for every flashcard as soon as the model has
+        finished it, then persists the generation (in one transaction with
+        persist_ai_generation when enabled, table by table otherwise) and yields a ``complete`` event carrying the
+        stored flashcards. Cached generations are replayed without an LLM call.
+
+        Args:
+            request: Request containing text content
+            user_id: ID of the authenticated user
+
+        Yields:
+            ``{"type": "card", "index": int, "flashcard": {...}}`` events,
+            followed by ``{"type": "complete", "result": {...}}``
+
+        Raises:
+            AIServiceError: If generation or persistence fails
+        """
+        call, leader = self.single_flight.claim(
+            self._single_flight_key(request, user_id)
+        )
+
+        if not leader:
+            # An identical generation is in flight: replay its stored result
+            result = await asyncio.shield(call)
+            for index, flashcard in enumerate(result.suggested_flashcards):
+                yield self._card_event(
+                    index,
+                    LLMFlashcardSuggestion(
+                        front_content=flashcard.front_content,
+                        back_content=flashcard.back_content,
+                    ),
+                )
+            yield {"type": "complete", "result": result.model_dump(mode="json")}
+            return
+
+        try:
+            async for event in self._stream_generation(request, user_id):
+                if event["type"] == "complete":
+                    call.set_result(event["result"])
+                    event = {
+                        "type": "complete",
+                        "result": event["result"].model_dump(mode="json"),
+                    }
+                yield event
+        except Exception as e:
+            if not call.done():
+                call.set_exception(e)
+            raise
+        finally:
+            if not call.done():
+                # The client disconnected before the generation finished
+                call.set_exception(
+                    AIServiceError(
+                        operation="stream_flashcards_from_text",
+                        details="Generation was cancelled",
+                        user_id=user_id,
+                    )
+                )
+
+    async def _stream_generation(
+        self, request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run one streamed generation; the complete event carries the response model."""
+        operation = "stream_flashcards_from_text"
+        logger.info(f"Starting streamed AI flashcard generation for user {user_id}")
+
+        try:
+            llm_client = await get_llm_client()
+            chunks = self._split_text(request.text_content)
+            cache_model = self._cache_model(llm_client, chunks)
+            cache_key = self._generation_cache_key(
+                llm_client, request.text_content, cache_model
             )
 
+            llm_response = None
+            if not request.force_regenerate:
+                llm_response = await self._get_cached_generation(cache_key)
+
+            if llm_response is None and len(chunks) > 1:
+                # Long texts fan out over concurrent chunk calls; the merged
+                # cards are sent once all chunks are done
+                llm_response, models_used = await self._generate_chunked(
+                    llm_client, chunks, user_id=user_id
+                )
+                await self._cache_generation(
+                    cache_key, cache_model, models_used, llm_client, llm_response
+                )
+
+            if llm_response is not None:
+                for index, flashcard in enumerate(llm_response.flashcards):
+                    yield self._card_event(index, flashcard)
+            else:
+                stream = llm_client.stream_flashcards(
+                    request.text_content, user_id=user_id
+                )
+                index = 0
+                async for flashcard in stream:
+                    yield self._card_event(index, flashcard)
+                    index += 1
+
+                llm_response = stream.response
+                await self._cache_generation(
+                    cache_key,
+                    cache_model,
+                    {llm_response.model_used},
+                    llm_client,
+                    llm_response,
+                )
+
+            # Near-duplicates were already streamed as previews; the complete
+            # event carries only the stored cards
+            llm_response, duplicates_dropped = await self._drop_near_duplicates(
+                llm_response, user_id
+            )
+            if self.use_persist_rpc:
+                generation = await self._persist_generation(
+                    text_content=request.text_content,
+                    llm_response=llm_response,
+                    user_id=user_id,
+                )
+            else:
+                source_text = await self._create_source_text(
+                    text_content=request.text_content, user_id=user_id
+                )
+                generation = await self._persist_generation_rows(
+                    source_text_id=uuid.UUID(source_text["id"]),
+                    llm_response=llm_response,
+                    user_id=user_id,
+                )
             logger.info(
-                f"Successfully completed AI flashcard generation for user {user_id}"
+                f"Persisted streamed AI generation {generation['ai_generation_event_id']} "
+                f"with {len(generation['flashcards'])} flashcards for user {user_id}"
             )
-            return response
 
+            result = self._build_generation_response(
+                generation, llm_response, duplicates_dropped
+            )
+            yield {"type": "complete", "result": result}
+
+        except AIServiceError:
+            raise
         except LLMServiceError as e:
             logger.error(f"LLM service error for user {user_id}: {e.details}")
             raise AIServiceError(
@@ -127,6 +384,173 @@ class AIService:
                 user_id=user_id,
             )
 
+    @staticmethod
+    def _single_flight_key(
+        request: AIGenerateFlashcardsRequest, user_id: uuid.UUID
+    ) -> str:
+        """Coalescing key of a generation request: user, options and text hash."""
+        text_hash = hashlib.sha256(
+            normalize_text(request.text_content).encode("utf-8")
+        ).hexdigest()
+        return f"ai_generation:{user_id}:{int(request.force_regenerate)}:{text_hash}"
+
+    @staticmethod
+    def _card_event(index: int, flashcard: LLMFlashcardSuggestion) -> Dict[str, Any]:
+        """Build the stream event for one generated flashcard."""
+        return {"type": "card", "index": index, "flashcard": flashcard.model_dump()}
+
+    @staticmethod
+    def _build_generation_response(
+        generation: dict, llm_response: LLMGenerateResponse, duplicates_dropped: int = 0
+    ) -> AIGenerateFlashcardsResponse:
+        """Convert a stored generation (persist_ai_generation shape) into the API response."""
+        return AIGenerateFlashcardsResponse(
+            source_text_id=uuid.UUID(generation["source_text_id"]),
+            ai_generation_event_id=uuid.UUID(generation["ai_generation_event_id"]),
+            suggested_flashcards=[
+                FlashcardResponse(**flashcard) for flashcard in generation["flashcards"]
+            ],
+            cache_hit=llm_response.cache_hit,
+            duplicates_dropped=duplicates_dropped,
+            failed_chunks=llm_response.failed_chunks,
+        )
+
+    async def _drop_near_duplicates(
+        self, llm_response: LLMGenerateResponse, user_id: uuid.UUID
+    ) -> Tuple[LLMGenerateResponse, int]:
+        """
+        Drop suggestions that nearly duplicate a flashcard of the user's deck.
+
+        The check is best effort: if the user's index cannot be built, every
+        suggestion is kept.
+
+        Returns:
+            Tuple of the response with the remaining suggestions and the number
+            of suggestions dropped
+
+        Raises:
+            AIServiceError: If every suggestion is a near-duplicate
+        """
+        try:
+            kept, dropped = await self.dedup_index.filter_duplicates(
+                user_id, llm_response.flashcards, self.supabase
+            )
+        except Exception as e:
+            logger.warning(f"Near-duplicate check skipped for user {user_id}: {str(e)}")
+            return llm_response, 0
+
+        if not kept:
+            raise AIServiceError(
+                operation="deduplicate_flashcards",
+                details="All generated flashcards duplicate existing flashcards",
+                user_id=user_id,
+            )
+
+        if dropped:
+            llm_response = llm_response.model_copy(update={"flashcards": kept})
+        return llm_response, dropped
+
+    async def _persist_generation(
+        self,
+        text_content: str,
+        llm_response: LLMGenerateResponse,
+        user_id: uuid.UUID,
+    ) -> dict:
+        """Store a generation with the persist_ai_generation database function."""
+        if not llm_response.flashcards:
+            raise AIServiceError(
+                operation="persist_generation",
+                details="No flashcards to create",
+                user_id=user_id,
+            )
+
+        try:
+            result = await self.supabase.rpc(
+                "persist_ai_generation",
+                {
+                    "p_user_id": str(user_id),
+                    "p_text_content": text_content,
+                    "p_suggestions": [
+                        suggestion.model_dump(mode="json")
+                        for suggestion in llm_response.flashcards
+                    ],
+                    "p_llm_model_used": llm_response.model_used,
+                    "p_cost": llm_response.cost,
+                    "p_cache_hit": llm_response.cache_hit,
+                },
+            ).execute()
+
+            if not result.data:
+                raise AIServiceError(
+                    operation="persist_generation",
+                    details="Failed to persist AI generation",
+                    user_id=user_id,
+                )
+
+            self.dedup_index.add(user_id, result.data["flashcards"])
+            return result.data
+
+        except AIServiceError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Database error persisting AI generation for user {user_id}: {str(e)}"
+            )
+            raise AIServiceError(
+                operation="persist_generation",
+                details=f"Database operation failed: {str(e)}",
+                user_id=user_id,
+            )
+
+    async def _persist_generation_rows(
+        self,
+        source_text_id: uuid.UUID,
+        llm_response: LLMGenerateResponse,
+        user_id: uuid.UUID,
+    ) -> dict:
+        """
+        Store a generation table by table, without the persist_ai_generation RPC.
+
+        Creates the flashcards, their spaced repetition records (unless the
+        insert trigger does) and the generation event for an existing source
+        text. Rows written before a failure are not rolled back.
+
+        Returns:
+            Dict shaped like the persist_ai_generation result
+        """
+        created_flashcards = await self._create_flashcard_records(
+            llm_suggestions=llm_response.flashcards,
+            user_id=user_id,
+            source_text_id=source_text_id,
+        )
+        self.dedup_index.add(user_id, created_flashcards)
+        logger.info(f"Created {len(created_flashcards)} flashcard records")
+
+        # Done by the create_spaced_repetition_records trigger if enabled
+        if not self.use_repetition_trigger:
+            await self._create_spaced_repetition_records(
+                flashcards=created_flashcards, user_id=user_id
+            )
+            logger.info(
+                f"Created spaced repetition records for {len(created_flashcards)} flashcards"
+            )
+
+        ai_event = await self._create_ai_generation_event(
+            user_id=user_id,
+            source_text_id=source_text_id,
+            generated_count=len(llm_response.flashcards),
+            model_used=llm_response.model_used,
+            cost=llm_response.cost,
+            cache_hit=llm_response.cache_hit,
+        )
+        logger.info(f"Created AI generation event {ai_event['id']}")
+
+        return {
+            "source_text_id": str(source_text_id),
+            "ai_generation_event_id": str(ai_event["id"]),
+            "flashcards": created_flashcards,
+        }
+
     async def _create_source_text(self, text_content: str, user_id: uuid.UUID) -> dict:
         """Create source text record in database."""
         try:
@@ -134,7 +558,7 @@ class AIService:
                 user_id=user_id, text_content=text_content
             )
 
-            result = (
+            result = await (
                 self.supabase.table("source_texts")
                 .insert(source_text_data.model_dump(mode="json"))
                 .execute()
@@ -159,10 +583,199 @@ class AIService:
                 user_id=user_id,
             )
 
-    async def _generate_with_llm(self, text_content: str):
-        """Generate flashcards using LLM service."""
-        async with LLMClient() as llm_client:
-            return await llm_client.generate_flashcards(text_content)
+    async def _generate_with_llm(
+        self,
+        text_content: str,
+        force_regenerate: bool = False,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> LLMGenerateResponse:
+        """
+        Generate flashcards using LLM service, reusing cached generations.
+
+        The cache key covers the normalized text, model, prompt version and
+        sampling parameters; the model is the one the text's chunks are routed
+        to when every route is healthy, and answers from any other model
+        (rerouted or hedged calls) are not cached. A hit is returned with
+        ``cache_hit`` set and zero cost; ``force_regenerate`` skips the lookup
+        but still refreshes the cached entry. Texts longer than one chunk are generated chunk by chunk
+        in parallel and merged into a single response. LLM calls are queued
+        fairly per ``user_id`` by the client's scheduler.
+        """
+        llm_client = await get_llm_client()
+        chunks = self._split_text(text_content)
+        cache_model = self._cache_model(llm_client, chunks)
+        cache_key = self._generation_cache_key(llm_client, text_content, cache_model)
+
+        if not force_regenerate:
+            cached = await self._get_cached_generation(cache_key)
+            if cached is not None:
+                return cached
+
+        if len(chunks) > 1:
+            llm_response, models_used = await self._generate_chunked(
+                llm_client, chunks, user_id=user_id
+            )
+        else:
+            llm_response = await llm_client.generate_flashcards(
+                text_content, user_id=user_id
+            )
+            models_used = {llm_response.model_used}
+
+        await self._cache_generation(
+            cache_key, cache_model, models_used, llm_client, llm_response
+        )
+        return llm_response
+
+    def _split_text(self, text_content: str) -> List[str]:
+        """Split the source text into token-budgeted chunks."""
+        return split_text_into_chunks(text_content, self.chunk_max_tokens)
+
+    async def _generate_chunked(
+        self,
+        llm_client,
+        chunks: List[str],
+        user_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[LLMGenerateResponse, Set[str]]:
+        """
+        Generate flashcards for every chunk concurrently and merge the results.
+
+        At most ``chunk_concurrency`` LLM calls run at once, so the wall-clock
+        time is close to one chunk's latency for typical chapter lengths.
+        Failed chunks are skipped as long as at least one chunk succeeds; their
+        number is reported in ``failed_chunks``.
+
+        Returns:
+            Tuple of the merged response and the models that answered the chunks
+        """
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def generate_chunk(chunk: str) -> LLMGenerateResponse:
+            async with semaphore:
+                return await llm_client.generate_flashcards(chunk, user_id=user_id)
+
+        logger.info(
+            f"Generating flashcards for {len(chunks)} chunks "
+            f"(concurrency {self.chunk_concurrency})"
+        )
+        results = await asyncio.gather(
+            *(generate_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        responses = []
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"Flashcard generation failed for chunk {index + 1}/{len(chunks)}: "
+                    f"{str(result)}"
+                )
+                continue
+            responses.append(result)
+
+        failed_chunks = len(chunks) - len(responses)
+        if not responses:
+            failure = results[0]
+            if isinstance(failure, LLMServiceError):
+                raise failure
+            raise LLMServiceError(
+                operation="generate_chunks",
+                details=f"All {len(chunks)} chunks failed: {str(failure)}",
+            )
+
+        if failed_chunks:
+            logger.warning(
+                f"Flashcards generated for {len(responses)} of {len(chunks)} chunks; "
+                f"{failed_chunks} failed"
+            )
+        models_used = {response.model_used for response in responses}
+        return self._merge_chunk_responses(responses, failed_chunks), models_used
+
+    @staticmethod
+    def _merge_chunk_responses(
+        responses: List[LLMGenerateResponse], failed_chunks: int = 0
+    ) -> LLMGenerateResponse:
+        """Concatenate chunk generations in order, dropping repeated questions."""
+        flashcards = []
+        seen_fronts = set()
+        for response in responses:
+            for flashcard in response.flashcards:
+                front_key = normalize_text(flashcard.front_content).casefold()
+                if front_key in seen_fronts:
+                    continue
+                seen_fronts.add(front_key)
+                flashcards.append(flashcard)
+
+        costs = [response.cost for response in responses if response.cost is not None]
+        # Chunks may be routed to different models; record the most used one
+        models = [response.model_used for response in responses]
+        return LLMGenerateResponse(
+            flashcards=flashcards,
+            model_used=max(models, key=models.count),
+            cost=sum(costs) if costs else None,
+            failed_chunks=failed_chunks,
+        )
+
+    @staticmethod
+    def _cache_model(llm_client, chunks: List[str]) -> Optional[str]:
+        """Model all chunks are routed to when healthy, or None if they differ."""
+        models = {llm_client.router.preferred_model(len(chunk)) for chunk in chunks}
+        return models.pop() if len(models) == 1 else None
+
+    @staticmethod
+    def _generation_cache_key(
+        llm_client, text_content: str, model: Optional[str]
+    ) -> str:
+        """Cache key of a generation with the routed model, prompt and params."""
+        return make_cache_key(
+            text_content,
+            model=model,
+            prompt_version=llm_client.PROMPT_VERSION,
+            sampling_params=llm_client.sampling_params,
+        )
+
+    async def _cache_generation(
+        self,
+        cache_key: str,
+        cache_model: Optional[str],
+        models_used: Set[str],
+        llm_client,
+        llm_response: LLMGenerateResponse,
+    ) -> None:
+        """
+        Cache a complete generation made by the cache key's model only.
+
+        Partial chunked generations and answers from rerouted or hedged models
+        are not stored, so a cache hit always replays the key's model output.
+        """
+        if cache_model is None or models_used != {cache_model}:
+            logger.info(
+                f"Not caching generation answered by {sorted(models_used)} "
+                f"instead of {cache_model}"
+            )
+            return
+        if llm_response.failed_chunks:
+            logger.info(
+                f"Not caching generation with {llm_response.failed_chunks} failed chunks"
+            )
+            return
+
+        # Shared cache rows are written by the server only (service_role)
+        await self.llm_cache.set(
+            cache_key,
+            llm_response,
+            llm_client.PROMPT_VERSION,
+            client_pool.get_service_client(),
+        )
+
+    async def _get_cached_generation(
+        self, cache_key: str
+    ) -> Optional[LLMGenerateResponse]:
+        """Return a cached generation marked as a zero-cost cache hit."""
+        cached = await self.llm_cache.get(cache_key, self.supabase)
+        if cached is None:
+            return None
+
+        logger.info(f"LLM generation cache hit for key {cache_key[:12]}")
+        return cached.model_copy(update={"cost": 0.0, "cache_hit": True})
 
     async def _create_flashcard_records(
         self, llm_suggestions: List, user_id: uuid.UUID, source_text_id: uuid.UUID
@@ -189,7 +802,7 @@ class AIService:
                     user_id=user_id,
                 )
 
-            result = (
+            result = await (
                 self.supabase.table("flashcards").insert(flashcard_creates).execute()
             )
 
@@ -239,20 +852,18 @@ class AIService:
                     user_id=user_id,
                 )
 
-            result = (
+            # The trigger may still exist in the database, so skip duplicates
+            result = await (
                 self.supabase.table("user_flashcard_spaced_repetition")
-                .insert(spaced_repetition_creates)
+                .upsert(
+                    spaced_repetition_creates,
+                    on_conflict="user_id,flashcard_id",
+                    ignore_duplicates=True,
+                )
                 .execute()
             )
 
-            if not result.data:
-                raise AIServiceError(
-                    operation="create_spaced_repetition",
-                    details="Failed to insert spaced repetition records",
-                    user_id=user_id,
-                )
-
-            return result.data
+            return result.data or []
 
         except Exception as e:
             logger.error(
@@ -271,6 +882,7 @@ class AIService:
         generated_count: int,
         model_used: str,
         cost: float = None,
+        cache_hit: bool = False,
     ) -> dict:
         """Create AI generation event record in database."""
         try:
@@ -282,9 +894,10 @@ class AIService:
                 rejected_cards_count=0,  # Initially 0, will be updated when user reviews
                 llm_model_used=model_used,
                 cost=cost,
+                cache_hit=cache_hit,
             )
 
-            result = (
+            result = await (
                 self.supabase.table("ai_generation_events")
                 .insert(event_data.model_dump(exclude_none=True, mode="json"))
                 .execute()
@@ -310,6 +923,6 @@ class AIService:
             )
 
 
-def get_ai_service(supabase_client: Client) -> AIService:
+def get_ai_service(supabase_client: AsyncPostgrestClient) -> AIService:
     """Dependency function to get AI service instance."""
     return AIService(supabase_client)
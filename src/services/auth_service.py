@@ -7,7 +7,7 @@ import jwt
 from fastapi import Request, Response
 
 from src.core.config import settings
-from src.db.supabase_client import get_session, refresh_session
+from src.db.supabase_client import refresh_session
 
 logger = logging.getLogger(__name__)
 
@@ -207,16 +207,21 @@ class AuthService:
                 return False
 
             # Try to refresh session with Supabase
-            new_session = await refresh_session()
-            if new_session and new_session.session:
+            new_session = await refresh_session(refresh_token)
+            if new_session and new_session.get("access_token"):
+                user = new_session.get("user") or {}
                 # Update cookies with new tokens
                 user_data = {
-                    "id": new_session.session.user.id,
-                    "email": new_session.session.user.email,
-                    "access_token": new_session.session.access_token,
-                    "refresh_token": new_session.session.refresh_token,
+                    "id": user.get("id"),
+                    "email": user.get("email"),
+                    "access_token": new_session["access_token"],
+                    "refresh_token": new_session.get("refresh_token"),
                 }
                 AuthService.set_auth_cookie(response, user_data)
+
+                # Expose the fresh token to the rest of this request only
+                request.state.access_token = new_session["access_token"]
+                request.state.user = {"id": user.get("id"), "email": user.get("email")}
                 return True
 
             return False
@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from src.core.config import Settings, settings
+from src.dtos import DashboardStats
+
+logger = logging.getLogger(__name__)
+
+# (stored_at epoch seconds, serialized DashboardStats)
+CacheEntry = Tuple[float, Dict[str, Any]]
+
+
+class DashboardStatsCacheBackend(ABC):
+    """
+    Storage interface for cached dashboard stats.
+
+    Backends only store and expire entries; freshness, background refresh and
+    metrics are handled by DashboardStatsCache.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the stored entry for a key, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        """Store an entry that may be dropped after ``ttl`` seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the entry for a key, if present."""
+
+    def size(self) -> Optional[int]:
+        """Number of stored entries, if cheaply known."""
+        return None
+
+    async def aclose(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryDashboardStatsBackend(DashboardStatsCacheBackend):
+    """Per-process LRU backend; each worker keeps its own entries."""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, CacheEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            expires_at, entry = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisDashboardStatsBackend(DashboardStatsCacheBackend):
+    """
+    Redis backend shared by all workers, so an invalidation on one worker is
+    seen by the others. Requires the optional ``redis`` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, redis_url: str, key_prefix: str = "dashboard_stats:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis dashboard cache backend requires the 'redis' package"
+            ) from e
+
+        self.key_prefix = key_prefix
+        self._redis = redis_asyncio.from_url(redis_url)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raw = await self._redis.get(self.key_prefix + key)
+        if raw is None:
+            return None
+
+        stored = json.loads(raw)
+        return stored["stored_at"], stored["stats"]
+
+    async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        stored_at, stats = entry
+        await self._redis.set(
+            self.key_prefix + key,
+            json.dumps({"stored_at": stored_at, "stats": stats}),
+            ex=ttl,
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.key_prefix + key)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+class DashboardStatsCache:
+    """
+    Per-user stale-while-revalidate cache for DashboardStats.
+
+    Entries younger than ``ttl`` are served as is. Older entries, up to
+    ``stale_ttl``, are still served while a single background task per user
+    reloads them. Writes that change the stats call ``invalidate`` so the next
+    read goes to the database; a refresh that was in flight when the user was
+    invalidated is not stored.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[DashboardStatsCacheBackend] = None,
+        ttl: int = 30,
+        stale_ttl: int = 300,
+        enabled: bool = True,
+    ):
+        self.backend = backend or InMemoryDashboardStatsBackend()
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.enabled = enabled
+
+        # key -> loads in flight
+        self._loading: Dict[str, int] = {}
+        # key -> invalidations while loads were in flight
+        self._generations: Dict[str, int] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.refresh_errors = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "DashboardStatsCache":
+        """Build a cache configured from application settings."""
+        if app_settings.dashboard_cache_backend == "redis":
+            if not app_settings.dashboard_cache_redis_url:
+                raise ValueError(
+                    "DASHBOARD_CACHE_REDIS_URL is required for the redis backend"
+                )
+            backend: DashboardStatsCacheBackend = RedisDashboardStatsBackend(
+                app_settings.dashboard_cache_redis_url
+            )
+        else:
+            backend = InMemoryDashboardStatsBackend(
+                max_size=app_settings.dashboard_cache_max_size
+            )
+
+        return cls(
+            backend=backend,
+            ttl=app_settings.dashboard_cache_ttl,
+            stale_ttl=app_settings.dashboard_cache_stale_ttl,
+            enabled=app_settings.dashboard_cache_enabled,
+        )
+
+    async def get_or_load(
+        self,
+        user_id: uuid.UUID,
+        loader: Callable[[], Awaitable[DashboardStats]],
+    ) -> DashboardStats:
+        """
+        Return cached stats for a user, loading them on a miss.
+
+        Args:
+            user_id: User UUID
+            loader: Coroutine factory computing fresh stats
+
+        Returns:
+            Fresh or (at most ``stale_ttl`` seconds) stale DashboardStats
+        """
+        if not self.enabled:
+            return await loader()
+
+        key = str(user_id)
+        entry = await self._backend_get(key)
+
+        if entry is not None:
+            stored_at, payload = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                return DashboardStats.model_validate(payload)
+            if age < self.stale_ttl:
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader)
+                return DashboardStats.model_validate(payload)
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        """
+        Drop the cached stats of a user after a write that changes them.
+
+        Args:
+            user_id: User UUID
+        """
+        if not self.enabled:
+            return
+
+        key = str(user_id)
+        if key in self._loading:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+        try:
+            await self.backend.delete(key)
+            self.invalidations += 1
+        except Exception as e:
+            logger.warning(f"Failed to invalidate dashboard stats for {key}: {str(e)}")
+
+    async def _backend_get(self, key: str) -> Optional[CacheEntry]:
+        """Read an entry, treating backend failures as a miss."""
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Dashboard stats cache read failed for {key}: {str(e)}")
+            return None
+
+    async def _load(
+        self, key: str, loader: Callable[[], Awaitable[DashboardStats]]
+    ) -> DashboardStats:
+        """Run the loader and store its result unless invalidated meanwhile."""
+        self._loading[key] = self._loading.get(key, 0) + 1
+        generation = self._generations.get(key, 0)
+        try:
+            stats = await loader()
+            if self._generations.get(key, 0) == generation:
+                try:
+                    await self.backend.set(
+                        key,
+                        (time.time(), stats.model_dump(mode="json")),
+                        self.stale_ttl,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Dashboard stats cache write failed for {key}: {str(e)}"
+                    )
+            return stats
+        finally:
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key]
+                self._generations.pop(key, None)
+
+    def _schedule_refresh(
+        self, key: str, loader: Callable[[], Awaitable[DashboardStats]]
+    ) -> None:
+        """Start one background reload per key."""
+        if key in self._loading:
+            return
+
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(
+        self, key: str, loader: Callable[[], Awaitable[DashboardStats]]
+    ) -> None:
+        """Background reload; failures keep serving the stale entry."""
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Background dashboard stats refresh failed: {str(e)}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return hit/miss counters and backend information."""
+        total = self.hits + self.stale_hits + self.misses
+        served = self.hits + self.stale_hits
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "refresh_errors": self.refresh_errors,
+            "hit_ratio": round(served / total, 4) if total else 0.0,
+            "size": self.backend.size(),
+            "refreshing": len(self._refresh_tasks),
+        }
+
+
+# Create global cache instance
+dashboard_stats_cache = DashboardStatsCache.from_settings(settings)
@@ -4,8 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import settings
 from src.dtos import AIGenerationSummary, DashboardContext, DashboardStats
-from supabase import Client
+from src.services.dashboard_cache import DashboardStatsCache, dashboard_stats_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +25,21 @@ class DashboardServiceError(Exception):
 class DashboardService:
     """Service for aggregating dashboard statistics and data."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(
+        self,
+        supabase_client: AsyncPostgrestClient,
+        use_stats_table: Optional[bool] = None,
+        cache: Optional[DashboardStatsCache] = None,
+    ):
         self.supabase = supabase_client
+        self.cache = cache
+        # Read totals from the trigger-maintained user_stats table (one RPC call)
+        # instead of aggregating the source tables on every request.
+        self.use_stats_table = (
+            settings.dashboard_stats_table
+            if use_stats_table is None
+            else use_stats_table
+        )
 
     def _validate_user_access(self, user_id: uuid.UUID) -> None:
         """
@@ -61,44 +77,12 @@ class DashboardService:
 
             logger.info(f"Fetching dashboard stats for user {user_id}")
 
-            # Równoległe wywołania wszystkich trzech endpointów dla performance
-            total_flashcards_task = self._get_total_active_flashcards(user_id)
-            due_cards_today_task = self._get_due_cards_today(user_id)
-            ai_stats_task = self._get_ai_generation_summary(user_id)
-
-            # Czekamy na wszystkie równoległe operacje
-            total_flashcards, due_cards_today, ai_stats = await asyncio.gather(
-                total_flashcards_task,
-                due_cards_today_task,
-                ai_stats_task,
-                return_exceptions=True,
-            )
-
-            # Error handling dla każdego endpoint osobno z fallback values
-            if isinstance(total_flashcards, Exception):
-                logger.warning(
-                    f"Failed to get total flashcards for user {user_id}: {total_flashcards}"
+            if self.cache is not None:
+                return await self.cache.get_or_load(
+                    user_id, lambda: self._load_dashboard_stats(user_id)
                 )
-                total_flashcards = 0
-
-            if isinstance(due_cards_today, Exception):
-                logger.warning(
-                    f"Failed to get due cards for user {user_id}: {due_cards_today}"
-                )
-                due_cards_today = 0
-
-            if isinstance(ai_stats, Exception):
-                logger.warning(f"Failed to get AI stats for user {user_id}: {ai_stats}")
-                ai_stats = AIGenerationSummary(total_generated=0, total_accepted=0)
-
-            dashboard_stats = DashboardStats(
-                total_flashcards=total_flashcards,
-                due_cards_today=due_cards_today,
-                ai_stats=ai_stats,
-            )
 
-            logger.info(f"Successfully aggregated dashboard stats for user {user_id}")
-            return dashboard_stats
+            return await self._load_dashboard_stats(user_id)
 
         except ValueError as e:
             logger.warning(f"Input validation failed for dashboard stats: {str(e)}")
@@ -109,6 +93,75 @@ class DashboardService:
                 operation="get_dashboard_stats", details=f"Unexpected error: {str(e)}"
             )
 
+    async def _load_dashboard_stats(self, user_id: uuid.UUID) -> DashboardStats:
+        """Oblicza statystyki z bazy danych (bez cache)."""
+        if self.use_stats_table:
+            return await self._get_stats_from_table(user_id)
+
+        # Równoległe wywołania wszystkich trzech endpointów dla performance
+        total_flashcards_task = self._get_total_active_flashcards(user_id)
+        due_cards_today_task = self._get_due_cards_today(user_id)
+        ai_stats_task = self._get_ai_generation_summary(user_id)
+
+        # Czekamy na wszystkie równoległe operacje
+        total_flashcards, due_cards_today, ai_stats = await asyncio.gather(
+            total_flashcards_task,
+            due_cards_today_task,
+            ai_stats_task,
+            return_exceptions=True,
+        )
+
+        # Error handling dla każdego endpoint osobno z fallback values
+        if isinstance(total_flashcards, Exception):
+            logger.warning(
+                f"Failed to get total flashcards for user {user_id}: {total_flashcards}"
+            )
+            total_flashcards = 0
+
+        if isinstance(due_cards_today, Exception):
+            logger.warning(
+                f"Failed to get due cards for user {user_id}: {due_cards_today}"
+            )
+            due_cards_today = 0
+
+        if isinstance(ai_stats, Exception):
+            logger.warning(f"Failed to get AI stats for user {user_id}: {ai_stats}")
+            ai_stats = AIGenerationSummary(total_generated=0, total_accepted=0)
+
+        dashboard_stats = DashboardStats(
+            total_flashcards=total_flashcards,
+            due_cards_today=due_cards_today,
+            ai_stats=ai_stats,
+        )
+
+        logger.info(f"Successfully aggregated dashboard stats for user {user_id}")
+        return dashboard_stats
+
+    async def _get_stats_from_table(self, user_id: uuid.UUID) -> DashboardStats:
+        """
+        Pobiera statystyki z tabeli user_stats jednym wywołaniem RPC.
+
+        Totals are kept current by database triggers; only the due count is
+        computed per call, since it depends on the current time.
+        """
+        response = await self.supabase.rpc(
+            "get_dashboard_stats", {"p_user_id": str(user_id)}
+        ).execute()
+
+        row = response.data[0] if response.data else {}
+
+        dashboard_stats = DashboardStats(
+            total_flashcards=row.get("total_flashcards") or 0,
+            due_cards_today=row.get("due_cards_today") or 0,
+            ai_stats=AIGenerationSummary(
+                total_generated=row.get("total_generated") or 0,
+                total_accepted=row.get("total_accepted") or 0,
+            ),
+        )
+
+        logger.info(f"Successfully read dashboard stats for user {user_id}")
+        return dashboard_stats
+
     async def _get_total_active_flashcards(self, user_id: uuid.UUID) -> int:
         """
         Pobiera łączną liczbę aktywnych fiszek użytkownika.
@@ -116,7 +169,7 @@ class DashboardService:
         """
         try:
             # Count query dla aktywnych fiszek
-            response = (
+            response = await (
                 self.supabase.table("flashcards")
                 .select("id", count="exact")
                 .eq("user_id", str(user_id))
@@ -141,7 +194,7 @@ class DashboardService:
             current_time = datetime.utcnow()
 
             # Count query dla fiszek do powtórki dziś
-            response = (
+            response = await (
                 self.supabase.table("user_flashcard_spaced_repetition")
                 .select("id", count="exact")
                 .eq("user_id", str(user_id))
@@ -160,30 +213,19 @@ class DashboardService:
     ) -> AIGenerationSummary:
         """
         Pobiera zagregowane statystyki AI (suma wszystkich generated i accepted).
-        Odpowiednik: GET /api/v1/ai/generation-stats?page=1&size=100
+        Odpowiednik: GET /api/v1/ai/generation-stats/summary
         """
         try:
-            # Pobranie wszystkich ai_generation_events dla użytkownika
-            response = (
-                self.supabase.table("ai_generation_events")
-                .select("generated_cards_count, accepted_cards_count")
-                .eq("user_id", str(user_id))
-                .execute()
-            )
+            # Agregacja sum po stronie bazy (ai_generation_summary RPC)
+            response = await self.supabase.rpc(
+                "ai_generation_summary", {"p_user_id": str(user_id)}
+            ).execute()
 
-            if not response.data:
-                return AIGenerationSummary(total_generated=0, total_accepted=0)
-
-            # Agregacja sum ze wszystkich eventów
-            total_generated = sum(
-                event.get("generated_cards_count", 0) for event in response.data
-            )
-            total_accepted = sum(
-                event.get("accepted_cards_count", 0) for event in response.data
-            )
+            totals = (response.data or {}).get("totals") or {}
 
             return AIGenerationSummary(
-                total_generated=total_generated, total_accepted=total_accepted
+                total_generated=totals.get("generated", 0),
+                total_accepted=totals.get("accepted", 0),
             )
 
         except Exception as e:
@@ -231,6 +273,6 @@ class DashboardService:
             )
 
 
-def get_dashboard_service(supabase_client: Client) -> DashboardService:
+def get_dashboard_service(supabase_client: AsyncPostgrestClient) -> DashboardService:
     """Dependency function to get Dashboard service instance."""
-    return DashboardService(supabase_client)
+    return DashboardService(supabase_client, cache=dashboard_stats_cache)
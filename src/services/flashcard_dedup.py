@@ -0,0 +1,338 @@
+import asyncio
+import logging
+import random
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import Settings, settings
+from src.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_HASH_MASK = (1 << 64) - 1
+# Cards fetched per request while building an index
+BUILD_PAGE_SIZE = 1000
+# Cards hashed between yields to the event loop while building
+BUILD_YIELD_EVERY = 200
+
+
+def normalize_front(text: str) -> str:
+    """Casefold, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[\W_]+", " ", text.casefold()).split())
+
+
+def shingles(normalized: str, size: int = 4) -> Set[str]:
+    """Character n-grams of a normalized text (the whole text if shorter)."""
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """
+    MinHash signatures of shingle sets, used for LSH bucketing.
+
+    Each shingle is hashed once with Python's string hash and every
+    permutation XORs it with a random 64-bit mask; the signature holds the
+    minimum per permutation. The string hash is salted per process, so
+    signatures are only comparable within the process that computed them.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._masks = [rng.getrandbits(64) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[str]) -> Tuple[int, ...]:
+        hashes = [hash(shingle) & _HASH_MASK for shingle in shingle_set]
+        return tuple(min([value ^ mask for value in hashes]) for mask in self._masks)
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive hashing index over the card fronts of one user.
+
+    MinHash signatures are split into ``bands`` bands; cards sharing any
+    band bucket with a query are candidates, and only those are compared by
+    exact shingle Jaccard similarity, so a lookup touches a handful of cards
+    instead of the whole deck. With 64 permutations in 16 bands of 4, a card
+    at 0.7 similarity is a candidate with about 99% probability.
+    """
+
+    def __init__(self, hasher: MinHasher, bands: int = 16):
+        if hasher.num_perm % bands:
+            raise ValueError("MinHash permutations must divide evenly into bands")
+        self.hasher = hasher
+        self.bands = bands
+        self.rows = hasher.num_perm // bands
+        # card id -> (normalized front, band keys)
+        self._cards: Dict[str, Tuple[str, List[int]]] = {}
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def _band_keys(self, shingle_set: Set[str]) -> List[int]:
+        signature = self.hasher.signature(shingle_set)
+        return [
+            hash(signature[band * self.rows : (band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, card_id: str, front_content: str) -> None:
+        """Index a card, replacing its previous front if already indexed."""
+        self.remove(card_id)
+        normalized = normalize_front(front_content)
+        band_keys = self._band_keys(shingles(normalized))
+        self._cards[card_id] = (normalized, band_keys)
+        for buckets, key in zip(self._buckets, band_keys):
+            buckets.setdefault(key, set()).add(card_id)
+
+    def remove(self, card_id: str) -> None:
+        """Drop a card from the index, if present."""
+        card = self._cards.pop(card_id, None)
+        if card is None:
+            return
+        for buckets, key in zip(self._buckets, card[1]):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(card_id)
+                if not bucket:
+                    del buckets[key]
+
+    def find(self, front_content: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed card at or above the threshold.
+
+        Returns:
+            Tuple of card id and Jaccard similarity, or None
+        """
+        shingle_set = shingles(normalize_front(front_content))
+        candidates: Set[str] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(shingle_set)):
+            candidates.update(buckets.get(key, ()))
+
+        best: Optional[Tuple[str, float]] = None
+        for card_id in candidates:
+            similarity = jaccard(shingle_set, shingles(self._cards[card_id][0]))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (card_id, similarity)
+        return best
+
+
+class FlashcardDedupIndex:
+    """
+    Per-user near-duplicate indexes of flashcard fronts.
+
+    A user's index is built lazily from the flashcards table on first use,
+    kept in an LRU of ``max_users`` entries and rebuilt after ``ttl``
+    seconds to pick up changes made by other workers. Card creation, edits
+    and deletion in this process update cached indexes in place.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        threshold: float = 0.7,
+        max_users: int = 256,
+        ttl: int = 600,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_users = max_users
+        self.ttl = ttl
+        self.bands = bands
+        self.hasher = MinHasher(num_perm)
+        # user id -> (built at monotonic time, index)
+        self._indexes: "OrderedDict[str, Tuple[float, NearDuplicateIndex]]" = (
+            OrderedDict()
+        )
+        self._builds = SingleFlight()
+        self._building: Set[str] = set()
+        # Users whose cards changed while their index was being built
+        self._changed_during_build: Set[str] = set()
+
+        # Metrics
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+        self.checked = 0
+        self.duplicates = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "FlashcardDedupIndex":
+        """Build the index cache configured from application settings."""
+        return cls(
+            enabled=app_settings.flashcard_dedup_enabled,
+            threshold=app_settings.flashcard_dedup_threshold,
+            max_users=app_settings.flashcard_dedup_max_users,
+            ttl=app_settings.flashcard_dedup_ttl,
+        )
+
+    async def get_index(
+        self, user_id: uuid.UUID, supabase_client: AsyncPostgrestClient
+    ) -> NearDuplicateIndex:
+        """Return the user's index, building it if not cached or expired."""
+        key = str(user_id)
+        entry = self._indexes.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._indexes.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        return await self._builds.do(key, lambda: self._build(key, supabase_client))
+
+    async def _build(
+        self, key: str, supabase_client: AsyncPostgrestClient
+    ) -> NearDuplicateIndex:
+        self._changed_during_build.discard(key)
+        self._building.add(key)
+        try:
+            index = await self._load(key, supabase_client)
+        finally:
+            self._building.discard(key)
+
+        if key in self._changed_during_build:
+            # Cards changed mid-build may be missing; use it once, rebuild later
+            self._changed_during_build.discard(key)
+            return index
+
+        self._indexes[key] = (time.monotonic(), index)
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+            self.evictions += 1
+        return index
+
+    async def _load(
+        self, key: str, supabase_client: AsyncPostgrestClient
+    ) -> NearDuplicateIndex:
+        """Index all flashcards of a user, page by page."""
+        started = time.monotonic()
+        index = NearDuplicateIndex(self.hasher, self.bands)
+
+        offset = 0
+        while True:
+            result = await (
+                supabase_client.table("flashcards")
+                .select("id, front_content")
+                .eq("user_id", key)
+                .order("id")
+                .range(offset, offset + BUILD_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = result.data or []
+            for position, row in enumerate(rows, start=1):
+                index.add(row["id"], row["front_content"])
+                if position % BUILD_YIELD_EVERY == 0:
+                    # Hashing is CPU-bound; let other requests run
+                    await asyncio.sleep(0)
+            if len(rows) < BUILD_PAGE_SIZE:
+                break
+            offset += BUILD_PAGE_SIZE
+
+        self.builds += 1
+        logger.info(
+            f"Built near-duplicate index of {len(index)} flashcards for user {key} "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return index
+
+    def _cached(self, user_id: uuid.UUID) -> Optional[NearDuplicateIndex]:
+        key = str(user_id)
+        if key in self._building:
+            self._changed_during_build.add(key)
+        entry = self._indexes.get(key)
+        return entry[1] if entry is not None else None
+
+    def add(self, user_id: uuid.UUID, flashcards: Iterable[Dict[str, Any]]) -> None:
+        """Index newly created (or edited) cards if the user's index is cached."""
+        index = self._cached(user_id)
+        if index is None:
+            return
+        for flashcard in flashcards:
+            index.add(str(flashcard["id"]), flashcard["front_content"])
+
+    def remove(self, user_id: uuid.UUID, flashcard_id: uuid.UUID) -> None:
+        """Drop a deleted card if the user's index is cached."""
+        index = self._cached(user_id)
+        if index is not None:
+            index.remove(str(flashcard_id))
+
+    async def filter_duplicates(
+        self,
+        user_id: uuid.UUID,
+        suggestions: List[Any],
+        supabase_client: AsyncPostgrestClient,
+    ) -> Tuple[List[Any], int]:
+        """
+        Drop suggestions whose front nearly duplicates an existing card or an
+        earlier suggestion of the same batch.
+
+        Args:
+            user_id: Owner of the deck
+            suggestions: Objects with a ``front_content`` attribute
+            supabase_client: User's client, used to build the index
+
+        Returns:
+            Tuple of the kept suggestions and the number dropped
+        """
+        if not self.enabled or not suggestions:
+            return suggestions, 0
+
+        index = await self.get_index(user_id, supabase_client)
+        batch = NearDuplicateIndex(self.hasher, self.bands)
+        kept = []
+        for position, suggestion in enumerate(suggestions):
+            match = index.find(suggestion.front_content, self.threshold) or batch.find(
+                suggestion.front_content, self.threshold
+            )
+            if match is not None:
+                logger.debug(
+                    f"Dropping near-duplicate suggestion {suggestion.front_content!r} "
+                    f"(similarity {match[1]:.2f} to {match[0]})"
+                )
+                continue
+            batch.add(str(position), suggestion.front_content)
+            kept.append(suggestion)
+
+        dropped = len(suggestions) - len(kept)
+        self.checked += len(suggestions)
+        self.duplicates += dropped
+        if dropped:
+            logger.info(
+                f"Dropped {dropped} of {len(suggestions)} suggestions as "
+                f"near-duplicates for user {user_id}"
+            )
+        return kept, dropped
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache usage and duplicate counters."""
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "cached_users": len(self._indexes),
+            "max_users": self.max_users,
+            "indexed_cards": sum(len(index) for _, index in self._indexes.values()),
+            "hits": self.hits,
+            "builds": self.builds,
+            "evictions": self.evictions,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+        }
+
+
+# Create global near-duplicate index cache
+flashcard_dedup_index = FlashcardDedupIndex.from_settings(settings)
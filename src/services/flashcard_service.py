@@ -1,17 +1,28 @@
+import asyncio
+import base64
+import json
 import logging
 import math
 import secrets
 import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
 
 from src.api.v1.schemas.flashcard_schemas import (
+    CountStrategyEnum,
+    FlashcardBulkStatusItem,
+    FlashcardBulkStatusResponse,
+    FlashcardBulkStatusResult,
     FlashcardManualCreateRequest,
     FlashcardResponse,
     ListFlashcardsQueryParams,
     PaginatedFlashcardsResponse,
 )
+from src.core.config import settings
 from src.db.flashcard_repository import FlashcardRepository
 from src.db.schemas import (
     FlashcardCreate,
@@ -19,7 +30,6 @@ from src.db.schemas import (
     FlashcardStatusEnum,
     UserFlashcardSpacedRepetitionCreate,
 )
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +37,20 @@ logger = logging.getLogger(__name__)
 class FlashcardService:
     """Service for managing flashcard operations with enhanced security."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(
+        self,
+        supabase_client: AsyncPostgrestClient,
+        use_repetition_trigger: Optional[bool] = None,
+    ):
         self.supabase = supabase_client
         self.repository = FlashcardRepository(supabase_client)
+        self.use_repetition_trigger = (
+            settings.spaced_repetition_insert_trigger
+            if use_repetition_trigger is None
+            else use_repetition_trigger
+        )
 
-    def _add_timing_protection(self, min_time_ms: int = 100) -> None:
+    async def _add_timing_protection(self, min_time_ms: int = 100) -> None:
         """
         Add artificial delay to prevent timing attacks.
 
@@ -40,7 +59,7 @@ class FlashcardService:
         """
         # Add random delay to prevent timing analysis
         delay = secrets.randbelow(50) + min_time_ms
-        time.sleep(delay / 1000.0)
+        await asyncio.sleep(delay / 1000.0)
 
     def _validate_user_access(self, user_id: uuid.UUID) -> None:
         """
@@ -59,12 +78,15 @@ class FlashcardService:
         if user_id == uuid.UUID("00000000-0000-0000-0000-000000000000"):
             raise ValueError("Invalid user ID provided")
 
-    def create_manual_flashcard(
+    async def create_manual_flashcard(
         self, user_id: uuid.UUID, data: FlashcardManualCreateRequest
     ) -> dict:
         """
         Create a manual flashcard with associated spaced repetition record.
 
+        The repetition record is created by a database trigger on insert; the
+        explicit insert is only made when use_repetition_trigger is off.
+
         Args:
             user_id: UUID of the authenticated user
             data: Validated flashcard creation data
@@ -87,7 +109,7 @@ class FlashcardService:
             )
 
             # Insert flashcard
-            flashcard_response = (
+            flashcard_response = await (
                 self.supabase.table("flashcards")
                 .insert(flashcard_data.model_dump(exclude_unset=True, mode="json"))
                 .execute()
@@ -99,32 +121,29 @@ class FlashcardService:
             created_flashcard = flashcard_response.data[0]
             flashcard_id = created_flashcard["id"]
 
-            # Prepare spaced repetition data
-            spaced_repetition_data = UserFlashcardSpacedRepetitionCreate(
-                user_id=user_id,
-                flashcard_id=uuid.UUID(flashcard_id),
-                due_date=datetime.utcnow(),  # Ready for first review
-                current_interval=1,
-                last_reviewed_at=None,
-            )
-
-            # Insert spaced repetition record
-            spaced_rep_response = (
-                self.supabase.table("user_flashcard_spaced_repetition")
-                .insert(
-                    spaced_repetition_data.model_dump(exclude_unset=True, mode="json")
+            # The create_spaced_repetition_records trigger adds the repetition
+            # record in the same statement; otherwise insert it here
+            if not self.use_repetition_trigger:
+                spaced_repetition_data = UserFlashcardSpacedRepetitionCreate(
+                    user_id=user_id,
+                    flashcard_id=uuid.UUID(flashcard_id),
+                    due_date=datetime.utcnow(),  # Ready for first review
+                    current_interval=1,
+                    last_reviewed_at=None,
                 )
-                .execute()
-            )
 
-            if not spaced_rep_response.data:
-                # If spaced repetition fails, we should rollback flashcard creation
-                # Note: Supabase doesn't support manual transactions, but RLS policies
-                # should prevent inconsistent state
-                logger.error(
-                    f"Failed to create spaced repetition record for flashcard {flashcard_id}"
+                # The trigger may still exist in the database, so skip duplicates
+                await (
+                    self.supabase.table("user_flashcard_spaced_repetition")
+                    .upsert(
+                        spaced_repetition_data.model_dump(
+                            exclude_unset=True, mode="json"
+                        ),
+                        on_conflict="user_id,flashcard_id",
+                        ignore_duplicates=True,
+                    )
+                    .execute()
                 )
-                raise Exception("Failed to initialize spaced repetition for flashcard")
 
             logger.info(
                 f"Successfully created manual flashcard {flashcard_id} for user {user_id}"
@@ -137,12 +156,73 @@ class FlashcardService:
             )
             raise
 
-    def get_flashcards_for_user(
+    @staticmethod
+    def _encode_cursor(created_at: str, flashcard_id: str) -> str:
+        """
+        Encode the (created_at, id) position of a flashcard as an opaque cursor.
+
+        Args:
+            created_at: created_at value exactly as returned by the database
+            flashcard_id: ID of the flashcard
+
+        Returns:
+            URL-safe cursor string
+        """
+        raw = json.dumps([created_at, flashcard_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        """
+        Decode a cursor produced by _encode_cursor.
+
+        Args:
+            cursor: Opaque cursor string
+
+        Returns:
+            Tuple of (created_at, id)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, flashcard_id = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii"))
+            )
+            datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+            return str(created_at), str(uuid.UUID(str(flashcard_id)))
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+
+    @staticmethod
+    def _filter_flashcards(
+        query, user_id: uuid.UUID, params: ListFlashcardsQueryParams
+    ):
+        """Apply the user, status and source filters of a list request."""
+        # RLS enforces the user filter too
+        query = query.eq("user_id", str(user_id))
+        if params.status:
+            query = query.eq("status", params.status.value)
+        if params.source:
+            query = query.eq("source", params.source.value)
+        return query
+
+    async def get_flashcards_for_user(
         self, user_id: uuid.UUID, params: ListFlashcardsQueryParams
     ) -> PaginatedFlashcardsResponse:
         """
         Get paginated list of flashcards for a user with optional filtering.
 
+        Pages are ordered by (created_at desc, id desc). When ``params.after``
+        is set the page starts right after that cursor (keyset pagination),
+        otherwise ``params.page`` is used as an offset for compatibility.
+
+        The total is requested in the same round trip as the rows using
+        ``params.count``; with ``none`` no count is made and only ``has_more``
+        (from fetching one extra row) is reported. A page past the end is empty;
+        its total then comes from a separate count-only query.
+
         Args:
             user_id: UUID of the authenticated user
             params: Query parameters for filtering and pagination
@@ -151,60 +231,88 @@ class FlashcardService:
             PaginatedFlashcardsResponse with flashcards and metadata
 
         Raises:
+            ValueError: If the cursor is malformed
             Exception: If database operations fail
         """
         try:
-            # Build query with user_id filter (RLS will enforce this too)
-            query = (
-                self.supabase.table("flashcards")
-                .select("*")
-                .eq("user_id", str(user_id))
-            )
-            count_query = (
-                self.supabase.table("flashcards")
-                .select("id", count="exact")
-                .eq("user_id", str(user_id))
-            )
+            # Decode cursor before touching the database
+            cursor = self._decode_cursor(params.after) if params.after else None
 
-            # Apply status filter
-            if params.status:
-                query = query.eq("status", params.status.value)
-                count_query = count_query.eq("status", params.status.value)
-
-            # Apply source filter
-            if params.source:
-                query = query.eq("source", params.source.value)
-                count_query = count_query.eq("source", params.source.value)
+            # Count (if any) is returned with the rows in the same request
+            count_method = (
+                None if params.count == CountStrategyEnum.NONE else params.count.value
+            )
 
-            # Get total count for pagination metadata
-            count_response = count_query.execute()
-            total = count_response.count if count_response.count is not None else 0
+            # Build query with user_id, status and source filters
+            query = self._filter_flashcards(
+                self.supabase.table("flashcards").select("*", count=count_method),
+                user_id,
+                params,
+            )
 
-            # Apply pagination
-            offset = (params.page - 1) * params.size
-            query = query.limit(params.size).offset(offset)
+            # Apply pagination; one extra row tells whether a next page exists
+            if cursor:
+                cursor_created_at, cursor_id = cursor
+                query = query.or_(
+                    f'created_at.lt."{cursor_created_at}",'
+                    f'and(created_at.eq."{cursor_created_at}",id.lt.{cursor_id})'
+                )
+                query = query.limit(params.size + 1)
+            else:
+                offset = (params.page - 1) * params.size
+                query = query.limit(params.size + 1).offset(offset)
 
-            # Order by created_at desc for consistent pagination
-            query = query.order("created_at", desc=True)
+            # Order by (created_at, id) desc so the order is total and stable
+            query = query.order("created_at", desc=True).order("id", desc=True)
 
             # Execute main query
-            flashcards_response = query.execute()
-
-            if not flashcards_response.data:
+            try:
+                flashcards_response = await query.execute()
+            except APIError as e:
+                # Offset past the last counted row: nothing left on this page
+                if e.code != "PGRST103":
+                    raise
+                flashcards_response = None
+
+            total = None
+            if flashcards_response is None or not flashcards_response.data:
                 flashcards_data = []
             else:
                 flashcards_data = flashcards_response.data
+            if count_method and flashcards_response is not None:
+                total = flashcards_response.count or 0
+            elif count_method:
+                count_response = await self._filter_flashcards(
+                    self.supabase.table("flashcards").select(
+                        "id", count=count_method, head=True
+                    ),
+                    user_id,
+                    params,
+                ).execute()
+                total = count_response.count or 0
+
+            has_more = len(flashcards_data) > params.size
+            flashcards_data = flashcards_data[: params.size]
 
             # Convert to response models
             flashcards = [
                 FlashcardResponse(**flashcard) for flashcard in flashcards_data
             ]
 
-            # Calculate pages
-            pages = math.ceil(total / params.size) if total > 0 else 1
+            next_cursor = None
+            if has_more:
+                last = flashcards_data[-1]
+                next_cursor = self._encode_cursor(last["created_at"], last["id"])
+
+            # Calculate pages (unknown without a count)
+            pages = None
+            if total is not None:
+                pages = math.ceil(total / params.size) if total > 0 else 1
 
             logger.info(
-                f"Retrieved {len(flashcards)} flashcards for user {user_id} (page {params.page}/{pages})"
+                f"Retrieved {len(flashcards)} flashcards for user {user_id} "
+                f"({'cursor' if cursor else f'page {params.page}/{pages}'}, "
+                f"count={params.count.value})"
             )
 
             return PaginatedFlashcardsResponse(
@@ -213,13 +321,15 @@ class FlashcardService:
                 page=params.page,
                 size=params.size,
                 pages=pages,
+                has_more=has_more,
+                next_cursor=next_cursor,
             )
 
         except Exception as e:
             logger.error(f"Error retrieving flashcards for user {user_id}: {str(e)}")
             raise
 
-    def get_flashcard_by_id(
+    async def get_flashcard_by_id(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID
     ) -> Optional[dict]:
         """
@@ -261,12 +371,12 @@ class FlashcardService:
             )  # Explicit limit for security
 
             # Execute query
-            flashcard_response = query.execute()
+            flashcard_response = await query.execute()
 
             # Consistent timing to prevent enumeration attacks
             elapsed_time = (time.time() - start_time) * 1000
             if elapsed_time < 100:  # Ensure minimum response time
-                self._add_timing_protection(100 - int(elapsed_time))
+                await self._add_timing_protection(100 - int(elapsed_time))
 
             if not flashcard_response.data:
                 logger.info(
@@ -290,16 +400,16 @@ class FlashcardService:
 
         except ValueError as e:
             logger.warning(f"Input validation failed for flashcard retrieval: {str(e)}")
-            self._add_timing_protection()  # Consistent timing even for errors
+            await self._add_timing_protection()  # Consistent timing even for errors
             raise
         except Exception as e:
             logger.error(
                 f"Error retrieving flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()  # Consistent timing even for errors
+            await self._add_timing_protection()  # Consistent timing even for errors
             raise
 
-    def update_flashcard(
+    async def update_flashcard(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID, updates: dict
     ) -> Optional[dict]:
         """
@@ -335,7 +445,7 @@ class FlashcardService:
             )
 
             # First, get the current flashcard to validate ownership and current state
-            current_flashcard_response = (
+            current_flashcard_response = await (
                 self.supabase.table("flashcards")
                 .select("*")
                 .eq("id", str(flashcard_id))
@@ -366,13 +476,8 @@ class FlashcardService:
                         f"Invalid status transition from {current_status} to {new_status} for {current_source} flashcard"
                     )
 
-                # For AI suggestions, prepare to update generation event statistics
-                if current_source == "ai_suggestion" and current_status != new_status:
-                    self._should_update_ai_stats = {
-                        "source_text_id": current_flashcard.get("source_text_id"),
-                        "old_status": current_status,
-                        "new_status": new_status,
-                    }
+                # AI generation event counters are maintained by the
+                # update_ai_generation_counters trigger on flashcards
 
             # Enhanced content validation
             if "front_content" in updates:
@@ -418,7 +523,7 @@ class FlashcardService:
             updates["updated_at"] = datetime.utcnow().isoformat()
 
             # Perform the update with security filters
-            update_response = (
+            update_response = await (
                 self.supabase.table("flashcards")
                 .update(updates)
                 .eq("id", str(flashcard_id))
@@ -434,18 +539,6 @@ class FlashcardService:
 
             updated_flashcard = update_response.data[0]
 
-            # Update AI generation event statistics if needed
-            if hasattr(self, "_should_update_ai_stats"):
-                try:
-                    self._update_ai_generation_stats(self._should_update_ai_stats)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to update AI generation stats for flashcard {flashcard_id}: {str(e)}"
-                    )
-                    # Don't fail the entire operation for stats update failure
-                finally:
-                    delattr(self, "_should_update_ai_stats")
-
             # Log successful update with performance metrics
             elapsed_time = (time.time() - start_time) * 1000
             logger.info(
@@ -458,13 +551,13 @@ class FlashcardService:
             logger.warning(
                 f"Validation error updating flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()
+            await self._add_timing_protection()
             raise
         except Exception as e:
             logger.error(
                 f"Error updating flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()
+            await self._add_timing_protection()
             raise
 
     def _validate_status_transition(
@@ -502,7 +595,7 @@ class FlashcardService:
         # Default: no transition allowed
         return False
 
-    def update_flashcard_optimized(
+    async def update_flashcard_optimized(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID, updates: dict
     ) -> Optional[dict]:
         """
@@ -538,7 +631,7 @@ class FlashcardService:
             )
 
             # Single query to get current flashcard with ownership verification
-            current_flashcard = self.repository.get_flashcard_by_id_and_user(
+            current_flashcard = await self.repository.get_flashcard_by_id_and_user(
                 flashcard_id, user_id
             )
 
@@ -562,19 +655,8 @@ class FlashcardService:
                         f"Invalid status transition from {current_status} to {new_status} for {current_source} flashcard"
                     )
 
-                # Prepare AI stats update if needed
-                if current_source == "ai_suggestion" and current_status != new_status:
-                    source_text_id = current_flashcard.get("source_text_id")
-                    if source_text_id:
-                        try:
-                            self._update_ai_generation_stats_optimized(
-                                source_text_id, current_status, new_status
-                            )
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to update AI generation stats: {str(e)}"
-                            )
-                            # Don't fail the entire operation for stats update failure
+                # AI generation event counters are maintained by the
+                # update_ai_generation_counters trigger on flashcards
 
             # Enhanced content validation
             self._validate_content_updates(updates)
@@ -587,7 +669,7 @@ class FlashcardService:
                 )
 
             # Single optimized query for update with ownership check built-in
-            updated_flashcard = self.repository.update_flashcard_optimized(
+            updated_flashcard = await self.repository.update_flashcard_optimized(
                 flashcard_id, user_id, updates
             )
 
@@ -609,73 +691,138 @@ class FlashcardService:
             logger.warning(
                 f"Validation error updating flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()
+            await self._add_timing_protection()
             raise
         except Exception as e:
             logger.error(
                 f"Error updating flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()
+            await self._add_timing_protection()
             raise
 
-    def _update_ai_generation_stats_optimized(
-        self, source_text_id: str, old_status: str, new_status: str
-    ) -> None:
+    async def bulk_update_status(
+        self, user_id: uuid.UUID, items: List[FlashcardBulkStatusItem]
+    ) -> FlashcardBulkStatusResponse:
         """
-        Optimized version of AI generation stats update using repository.
+        Apply several status changes with one read and one update statement.
+
+        Current statuses are read in a single query and every transition is
+        validated with the same rules as update_flashcard. Valid changes are
+        written by the bulk_update_flashcard_status database function in one
+        statement, so generation-event counters are adjusted once per source
+        text. Items are reported individually instead of failing the batch.
 
         Args:
-            source_text_id: Source text UUID string
-            old_status: Previous status
-            new_status: New status
+            user_id: UUID of the authenticated user
+            items: Requested status changes
+
+        Returns:
+            FlashcardBulkStatusResponse with one result per requested item
+
+        Raises:
+            ValueError: If user_id is invalid or no items are given
+            Exception: If database operations fail
         """
-        try:
-            source_text_uuid = uuid.UUID(source_text_id)
-            event = self.repository.get_ai_generation_event_by_source_text(
-                source_text_uuid
-            )
+        start_time = time.time()
 
-            if not event:
-                logger.warning(
-                    f"AI generation event not found for source_text_id: {source_text_id}"
-                )
-                return
+        self._validate_user_access(user_id)
 
-            # Calculate counter updates
-            updates = {}
-            if old_status == "pending_review" and new_status == "active":
-                updates["accepted_cards_count"] = (
-                    event.get("accepted_cards_count", 0) + 1
-                )
-            elif old_status == "pending_review" and new_status == "rejected":
-                updates["rejected_cards_count"] = (
-                    event.get("rejected_cards_count", 0) + 1
-                )
-            elif old_status == "active" and new_status == "rejected":
-                updates["accepted_cards_count"] = max(
-                    0, event.get("accepted_cards_count", 0) - 1
-                )
-                updates["rejected_cards_count"] = (
-                    event.get("rejected_cards_count", 0) + 1
+        if not items:
+            raise ValueError("At least one status change is required")
+
+        logger.info(
+            f"Bulk flashcard status update attempt: user={user_id}, items={len(items)}"
+        )
+
+        flashcard_ids = list(dict.fromkeys(str(item.id) for item in items))
+        current_response = await (
+            self.supabase.table("flashcards")
+            .select("id, source, status")
+            .eq("user_id", str(user_id))
+            .in_("id", flashcard_ids)
+            .execute()
+        )
+        current_flashcards = {row["id"]: row for row in current_response.data or []}
+
+        results: List[FlashcardBulkStatusResult] = []
+        changes: List[Dict[str, str]] = []
+        seen_ids = set()
+
+        for item in items:
+            flashcard_id = str(item.id)
+            new_status = item.status.value
+            current_flashcard = current_flashcards.get(flashcard_id)
+
+            if flashcard_id in seen_ids:
+                error = "Duplicate flashcard id in request"
+            elif not current_flashcard:
+                error = "Flashcard not found"
+            elif not self._validate_status_transition(
+                current_flashcard["source"], current_flashcard["status"], new_status
+            ):
+                error = (
+                    f"Invalid status transition from {current_flashcard['status']} "
+                    f"to {new_status} for {current_flashcard['source']} flashcard"
                 )
-            elif old_status == "rejected" and new_status == "active":
-                updates["rejected_cards_count"] = max(
-                    0, event.get("rejected_cards_count", 0) - 1
+            else:
+                error = None
+
+            seen_ids.add(flashcard_id)
+
+            if error:
+                results.append(
+                    FlashcardBulkStatusResult(
+                        id=item.id,
+                        success=False,
+                        status=(
+                            current_flashcard["status"] if current_flashcard else None
+                        ),
+                        error=error,
+                    )
                 )
-                updates["accepted_cards_count"] = (
-                    event.get("accepted_cards_count", 0) + 1
+                continue
+
+            if current_flashcard["status"] != new_status:
+                changes.append(
+                    {
+                        "id": flashcard_id,
+                        "from_status": current_flashcard["status"],
+                        "to_status": new_status,
+                    }
                 )
+            results.append(
+                FlashcardBulkStatusResult(id=item.id, success=True, status=new_status)
+            )
 
-            if updates:
-                event_id = uuid.UUID(event["id"])
-                self.repository.update_ai_generation_event_stats(event_id, updates)
-                logger.info(
-                    f"Updated AI generation stats for event {event_id}: {updates}"
-                )
+        updated_ids = set()
+        if changes:
+            update_response = await self.supabase.rpc(
+                "bulk_update_flashcard_status",
+                {"p_user_id": str(user_id), "p_changes": changes},
+            ).execute()
+            updated_ids = {row["id"] for row in update_response.data or []}
+
+            # Rows whose status changed after the read were not updated
+            changed_ids = {change["id"] for change in changes}
+            for index, result in enumerate(results):
+                result_id = str(result.id)
+                if result_id in changed_ids and result_id not in updated_ids:
+                    results[index] = FlashcardBulkStatusResult(
+                        id=result.id,
+                        success=False,
+                        error="Flashcard was modified concurrently",
+                    )
 
-        except Exception as e:
-            logger.error(f"Error updating AI generation stats: {str(e)}")
-            raise
+        failed = sum(1 for result in results if not result.success)
+        elapsed_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Bulk status update for user {user_id}: updated={len(updated_ids)}, "
+            f"failed={failed} in {round(elapsed_time, 2)}ms"
+        )
+
+        return FlashcardBulkStatusResponse(
+            results=results, updated=len(updated_ids), failed=failed
+        )
 
     def _validate_content_updates(self, updates: dict) -> None:
         """
@@ -715,89 +862,6 @@ class FlashcardService:
             ):
                 raise ValueError("Back content contains potentially unsafe content")
 
-    def _update_ai_generation_stats(self, stats_data: dict) -> None:
-        """
-        Update AI generation event statistics when flashcard status changes.
-
-        Args:
-            stats_data: Dictionary containing source_text_id, old_status, new_status
-        """
-        try:
-            source_text_id = stats_data["source_text_id"]
-            old_status = stats_data["old_status"]
-            new_status = stats_data["new_status"]
-
-            if not source_text_id:
-                logger.warning("Cannot update AI stats: source_text_id is missing")
-                return
-
-            # Find the corresponding AI generation event
-            event_response = (
-                self.supabase.table("ai_generation_events")
-                .select("*")
-                .eq("source_text_id", str(source_text_id))
-                .limit(1)
-                .execute()
-            )
-
-            if not event_response.data:
-                logger.warning(
-                    f"AI generation event not found for source_text_id: {source_text_id}"
-                )
-                return
-
-            event = event_response.data[0]
-            updates = {}
-
-            # Handle status transitions and update counters accordingly
-            if old_status == "pending_review" and new_status == "active":
-                updates["accepted_cards_count"] = (
-                    event.get("accepted_cards_count", 0) + 1
-                )
-            elif old_status == "pending_review" and new_status == "rejected":
-                updates["rejected_cards_count"] = (
-                    event.get("rejected_cards_count", 0) + 1
-                )
-            elif old_status == "active" and new_status == "rejected":
-                # Card was accepted before, now rejected
-                updates["accepted_cards_count"] = max(
-                    0, event.get("accepted_cards_count", 0) - 1
-                )
-                updates["rejected_cards_count"] = (
-                    event.get("rejected_cards_count", 0) + 1
-                )
-            elif old_status == "rejected" and new_status == "active":
-                # Card was rejected before, now accepted
-                updates["rejected_cards_count"] = max(
-                    0, event.get("rejected_cards_count", 0) - 1
-                )
-                updates["accepted_cards_count"] = (
-                    event.get("accepted_cards_count", 0) + 1
-                )
-
-            if updates:
-                # Add timestamp for update tracking
-                updates["updated_at"] = datetime.utcnow().isoformat()
-
-                # Update the AI generation event
-                update_response = (
-                    self.supabase.table("ai_generation_events")
-                    .update(updates)
-                    .eq("id", event["id"])
-                    .execute()
-                )
-
-                if update_response.data:
-                    logger.info(
-                        f"Updated AI generation stats for event {event['id']}: {updates}"
-                    )
-                else:
-                    logger.error(f"Failed to update AI generation event {event['id']}")
-
-        except Exception as e:
-            logger.error(f"Error updating AI generation stats: {str(e)}")
-            raise
-
     def _validate_enum_values(
         self, field_name: str, value: str, allowed_values: list
     ) -> bool:
@@ -821,7 +885,7 @@ class FlashcardService:
             )
         return True
 
-    def _validate_concurrent_update_protection(
+    async def _validate_concurrent_update_protection(
         self, flashcard_id: uuid.UUID, expected_updated_at: datetime
     ) -> bool:
         """
@@ -837,7 +901,7 @@ class FlashcardService:
         Raises:
             ValueError: If concurrent modification detected
         """
-        current_response = (
+        current_response = await (
             self.supabase.table("flashcards")
             .select("updated_at")
             .eq("id", str(flashcard_id))
@@ -867,7 +931,7 @@ class FlashcardService:
 
         return True
 
-    def delete_flashcard_by_id(
+    async def delete_flashcard_by_id(
         self, flashcard_id: uuid.UUID, user_id: uuid.UUID
     ) -> bool:
         """
@@ -900,7 +964,7 @@ class FlashcardService:
             )
 
             # First verify ownership and existence with detailed security checks
-            current_flashcard_response = (
+            current_flashcard_response = await (
                 self.supabase.table("flashcards")
                 .select("id, user_id, source, status, source_text_id")
                 .eq("id", str(flashcard_id))
@@ -932,7 +996,7 @@ class FlashcardService:
             # Perform the DELETE operation with security filters
             # RLS policies ensure user can only delete their own flashcards
             # CASCADE constraints automatically handle related spaced_repetition data
-            delete_response = (
+            delete_response = await (
                 self.supabase.table("flashcards")
                 .delete()
                 .eq("id", str(flashcard_id))
@@ -968,11 +1032,11 @@ class FlashcardService:
 
         except ValueError as e:
             logger.warning(f"Input validation failed for flashcard deletion: {str(e)}")
-            self._add_timing_protection()  # Consistent timing even for errors
+            await self._add_timing_protection()  # Consistent timing even for errors
             raise
         except Exception as e:
             logger.error(
                 f"Error deleting flashcard {flashcard_id} for user {user_id}: {str(e)}"
             )
-            self._add_timing_protection()  # Consistent timing even for errors
+            await self._add_timing_protection()  # Consistent timing even for errors
             raise
@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import jwt
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import Settings, settings
+from src.dtos import (
+    AIGenerateFlashcardsRequest,
+    AIGenerateFlashcardsResponse,
+    AIGenerationJobResponse,
+    AIGenerationJobStatusEnum,
+)
+from src.services.ai_service import AIService, AIServiceError, get_ai_service
+from src.services.dashboard_cache import dashboard_stats_cache
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationJobQueueError(Exception):
+    """Raised when a generation job cannot be accepted."""
+
+    def __init__(self, operation: str, details: str):
+        self.operation = operation
+        self.details = details
+        super().__init__(f"Generation job queue error during {operation}: {details}")
+
+
+class GenerationJob:
+    """State of one queued AI generation."""
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        request: AIGenerateFlashcardsRequest,
+        supabase_client: AsyncPostgrestClient,
+        token_expires_at: Optional[float] = None,
+    ):
+        self.id = uuid.uuid4()
+        self.user_id = user_id
+        self.request = request
+        self.supabase = supabase_client
+        # Epoch time at which the client's access token expires, if known
+        self.token_expires_at = token_expires_at
+        self.status = AIGenerationJobStatusEnum.QUEUED
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[AIGenerateFlashcardsResponse] = None
+        self.error: Optional[str] = None
+        # Monotonic time after which a finished job is dropped
+        self.expires_at: Optional[float] = None
+
+    def to_response(self) -> AIGenerationJobResponse:
+        """Convert the job into its API representation."""
+        return AIGenerationJobResponse(
+            job_id=self.id,
+            status=self.status,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class GenerationJobQueue:
+    """
+    Bounded in-process queue of AI generation jobs.
+
+    ``submit`` only enqueues the job, so the HTTP request returns at once;
+    ``concurrency`` worker tasks started with ``start`` run the generations
+    independently of the submitting connection. Finished jobs stay pollable
+    for ``result_ttl`` seconds. The worker uses the submitter's access token,
+    so a job whose token has less than ``min_token_lifetime`` seconds left
+    when it is picked up fails before the LLM is called. Jobs live in this process only: they are not
+    shared between workers and queued jobs are dropped on shutdown.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        max_queue_size: int = 100,
+        result_ttl: int = 3600,
+        min_token_lifetime: int = 120,
+        service_factory: Callable[[AsyncPostgrestClient], AIService] = get_ai_service,
+    ):
+        self.concurrency = concurrency
+        self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+        self.min_token_lifetime = min_token_lifetime
+        self.service_factory = service_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[uuid.UUID, GenerationJob] = {}
+
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "GenerationJobQueue":
+        """Build a queue configured from application settings."""
+        return cls(
+            concurrency=app_settings.ai_generation_jobs_concurrency,
+            max_queue_size=app_settings.ai_generation_jobs_max_queue,
+            result_ttl=app_settings.ai_generation_jobs_result_ttl,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> "GenerationJobQueue":
+        """Create the queue and start the worker tasks if not running yet."""
+        if self.running:
+            return self
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"generation-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(
+            f"Started {self.concurrency} generation job workers "
+            f"(queue size {self.max_queue_size})"
+        )
+        return self
+
+    async def aclose(self) -> None:
+        """Stop the workers; jobs still queued are abandoned."""
+        if not self.running:
+            return
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        logger.info("Stopped generation job workers")
+
+    def submit(
+        self,
+        request: AIGenerateFlashcardsRequest,
+        user_id: uuid.UUID,
+        supabase_client: AsyncPostgrestClient,
+        access_token: Optional[str] = None,
+    ) -> GenerationJob:
+        """
+        Enqueue a generation job.
+
+        Args:
+            request: Generation request
+            user_id: ID of the authenticated user
+            supabase_client: User's client, used by the worker for RLS
+            access_token: Token the client is bound to; its expiry is checked
+                before the job runs
+
+        Returns:
+            The queued job
+
+        Raises:
+            GenerationJobQueueError: If the workers are not running or the
+                queue is full
+        """
+        if not self.running:
+            raise GenerationJobQueueError(
+                operation="submit", details="Generation job workers are not running"
+            )
+
+        self._purge_expired()
+        job = GenerationJob(
+            user_id,
+            request,
+            supabase_client,
+            token_expires_at=self._token_expiry(access_token),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise GenerationJobQueueError(
+                operation="submit",
+                details=f"Generation job queue is full ({self.max_queue_size} jobs)",
+            )
+
+        self._jobs[job.id] = job
+        self.submitted += 1
+        logger.info(f"Queued generation job {job.id} for user {user_id}")
+        return job
+
+    def get(self, job_id: uuid.UUID, user_id: uuid.UUID) -> Optional[GenerationJob]:
+        """Return a job of the user, or None if unknown, expired or not theirs."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.expires_at is not None and job.expires_at <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _token_expiry(access_token: Optional[str]) -> Optional[float]:
+        """Read the ``exp`` claim (epoch seconds) without verifying the token."""
+        if not access_token:
+            return None
+        try:
+            payload = jwt.decode(access_token, options={"verify_signature": False})
+            exp = payload.get("exp")
+            return float(exp) if exp is not None else None
+        except jwt.InvalidTokenError:
+            return None
+
+    def _token_expiring(self, job: GenerationJob) -> bool:
+        """Whether the job's token may expire before its results are stored."""
+        if job.token_expires_at is None:
+            return False
+        return job.token_expires_at - time.time() < self.min_token_lifetime
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: GenerationJob) -> None:
+        """Run one job and record its outcome."""
+        job.status = AIGenerationJobStatusEnum.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        logger.info(f"Running generation job {job.id} for user {job.user_id}")
+
+        try:
+            if self._token_expiring(job):
+                raise GenerationJobQueueError(
+                    operation="run",
+                    details="Access token expired while the job was queued",
+                )
+            service = self.service_factory(job.supabase)
+            job.result = await service.generate_flashcards_from_text(
+                request=job.request, user_id=job.user_id
+            )
+            job.status = AIGenerationJobStatusEnum.SUCCEEDED
+            self.succeeded += 1
+            await dashboard_stats_cache.invalidate(job.user_id)
+            logger.info(
+                f"Generation job {job.id} succeeded with "
+                f"{len(job.result.suggested_flashcards)} flashcards"
+            )
+        except Exception as e:
+            job.status = AIGenerationJobStatusEnum.FAILED
+            job.error = self._public_error(e)
+            self.failed += 1
+            logger.error(f"Generation job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            job.expires_at = time.monotonic() + self.result_ttl
+            # The client is only needed while the job runs
+            job.supabase = None
+
+    @staticmethod
+    def _public_error(error: Exception) -> str:
+        """Map an internal error to the message exposed to the client."""
+        if isinstance(error, GenerationJobQueueError) and error.operation == "run":
+            return (
+                "Your session expired before the job started. "
+                "Please sign in again and resubmit."
+            )
+        if (
+            isinstance(error, AIServiceError)
+            and error.operation == "deduplicate_flashcards"
+        ):
+            return "All generated flashcards already exist in your deck."
+        if isinstance(error, AIServiceError) and (
+            "llm service failed" in error.details.lower()
+        ):
+            return "AI service is temporarily unavailable. Please try again later."
+        return "Internal error occurred while processing your request."
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return queue depth, job counts and outcome counters."""
+        statuses = [job.status for job in self._jobs.values()]
+        return {
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "in_progress": statuses.count(AIGenerationJobStatusEnum.RUNNING),
+            "stored_jobs": len(self._jobs),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+
+# Create global job queue instance (workers are started in the app lifespan)
+generation_job_queue = GenerationJobQueue.from_settings(settings)
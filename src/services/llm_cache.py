@@ -0,0 +1,222 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from postgrest import AsyncPostgrestClient
+
+from src.core.config import Settings, settings
+from src.dtos import LLMGenerateResponse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text_content: str) -> str:
+    """
+    Normalize source text for cache keys.
+
+    Applies Unicode NFC and collapses whitespace runs, so re-submissions that
+    only differ in line breaks or indentation share a key.
+    """
+    return " ".join(unicodedata.normalize("NFC", text_content).split())
+
+
+def make_cache_key(
+    text_content: str,
+    model: str,
+    prompt_version: str,
+    sampling_params: Dict[str, Any],
+) -> str:
+    """
+    Build the content-addressed key of an LLM generation.
+
+    Args:
+        text_content: Source text (normalized here)
+        model: LLM model name
+        prompt_version: Version of the generation prompt
+        sampling_params: Sampling parameters sent to the model
+
+    Returns:
+        Hex SHA-256 of the canonical JSON of all inputs
+    """
+    payload = json.dumps(
+        {
+            "text": normalize_text(text_content),
+            "model": model,
+            "prompt_version": prompt_version,
+            "params": sampling_params,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMGenerationCache:
+    """
+    Two-tier cache of parsed LLM generations.
+
+    The first tier is an in-process LRU; the second is the llm_generation_cache
+    table, reached through security definer RPCs so entries survive restarts
+    and are shared between workers. Rows are read with the caller's client
+    but written with a service_role client only, since users could otherwise
+    store arbitrary responses under any key. Both tiers expire
+    entries after ``ttl`` seconds. Table failures are logged and treated as
+    misses, so the cache never fails a generation.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        ttl: int = 7 * 24 * 3600,
+        persistent: bool = True,
+        enabled: bool = True,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persistent = persistent
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, LLMGenerateResponse]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.memory_hits = 0
+        self.table_hits = 0
+        self.misses = 0
+        self.table_errors = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "LLMGenerationCache":
+        """Build a cache configured from application settings."""
+        return cls(
+            max_size=app_settings.llm_cache_max_size,
+            ttl=app_settings.llm_cache_ttl,
+            persistent=app_settings.llm_cache_persistent,
+            enabled=app_settings.llm_cache_enabled,
+        )
+
+    def _memory_get(self, key: str) -> Optional[LLMGenerateResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, response = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return response
+
+    def _memory_set(self, key: str, response: LLMGenerateResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(
+        self, key: str, supabase: Optional[AsyncPostgrestClient] = None
+    ) -> Optional[LLMGenerateResponse]:
+        """
+        Look up a generation, first in memory, then in the table.
+
+        Args:
+            key: Cache key from make_cache_key
+            supabase: Client used for the table tier (skipped when None)
+
+        Returns:
+            Cached LLM response or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        response = self._memory_get(key)
+        if response is not None:
+            self.memory_hits += 1
+            return response
+
+        if self.persistent and supabase is not None:
+            try:
+                result = await supabase.rpc(
+                    "get_llm_generation_cache", {"p_cache_key": key}
+                ).execute()
+                if result.data:
+                    response = LLMGenerateResponse.model_validate(result.data)
+                    self._memory_set(key, response)
+                    self.table_hits += 1
+                    return response
+            except Exception as e:
+                self.table_errors += 1
+                logger.warning(f"LLM cache table read failed: {str(e)}")
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        response: LLMGenerateResponse,
+        prompt_version: str,
+        supabase: Optional[AsyncPostgrestClient] = None,
+    ) -> None:
+        """
+        Store a generation in both tiers.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Parsed LLM response
+            prompt_version: Prompt version, stored with the table row
+            supabase: Service_role client used for the table tier (skipped
+                when None, e.g. without SUPABASE_SERVICE_KEY)
+        """
+        if not self.enabled:
+            return
+
+        self._memory_set(key, response)
+
+        if self.persistent and supabase is not None:
+            try:
+                await supabase.rpc(
+                    "put_llm_generation_cache",
+                    {
+                        "p_cache_key": key,
+                        "p_llm_model_used": response.model_used,
+                        "p_prompt_version": prompt_version,
+                        "p_response": response.model_dump(
+                            mode="json", exclude={"cache_hit"}
+                        ),
+                        "p_ttl_seconds": self.ttl,
+                    },
+                ).execute()
+            except Exception as e:
+                self.table_errors += 1
+                logger.warning(f"LLM cache table write failed: {str(e)}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            hits = self.memory_hits + self.table_hits
+            total = hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "persistent": self.persistent,
+                "memory_hits": self.memory_hits,
+                "table_hits": self.table_hits,
+                "misses": self.misses,
+                "table_errors": self.table_errors,
+                "hit_ratio": round(hits / total, 4) if total else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+# Create global cache instance
+llm_generation_cache = LLMGenerationCache.from_settings(settings)
@@ -1,16 +1,35 @@
 import asyncio
 import json
 import logging
+import time
+import uuid
 from datetime import datetime
-from typing import Optional
-
-from openai import AsyncOpenAI
-
-from src.core.config import Settings
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import httpx
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI
+
+from src.core.config import Settings, settings
 from src.dtos import LLMFlashcardSuggestion, LLMGenerateResponse
+from src.services.llm_resilience import CircuitBreaker, RetryPolicy
+from src.services.llm_router import LLMRouter
+from src.services.llm_scheduler import LLMScheduler, llm_scheduler
+from src.services.llm_stream_parser import IncrementalFlashcardParser
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class LLMServiceError(Exception):
     """Raised when LLM service operations fail."""
@@ -23,11 +42,50 @@ class LLMServiceError(Exception):
 
 
 class LLMClient:
-    """Client for communicating with OpenRouter.ai LLM service using OpenAI SDK."""
-
-    def __init__(self):
-        self.settings = Settings()
+    """
+    Client for communicating with OpenRouter.ai LLM service using OpenAI SDK.
+
+    One instance is shared per process (see ``llm_client``): the underlying
+    AsyncOpenAI client and its httpx connection pool are created on first use
+    and kept open until ``aclose``, so generations reuse warm connections.
+    Every call holds a slot of the LLM scheduler while it talks to the
+    provider, which caps concurrency and queues users fairly. Transient
+    provider errors are retried with jittered backoff behind a circuit
+    breaker, and slow calls can be hedged with a fallback model. The model of
+    each call is picked by the LLM router from the text length and the
+    observed health of each model.
+    """
+
+    # Bump whenever the prompt changes, so cached generations are not reused
+    PROMPT_VERSION = "v1"
+
+    def __init__(
+        self,
+        app_settings: Optional[Settings] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        router: Optional[LLMRouter] = None,
+    ):
+        self.settings = app_settings or settings
+        self.scheduler = scheduler or llm_scheduler
+        self.router = router or LLMRouter.from_settings(self.settings)
         self.client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+        # Resilience: retries, fail-fast breaker, hedging on slow calls
+        self.retry_policy = RetryPolicy.from_settings(self.settings)
+        self.circuit_breaker = CircuitBreaker.from_settings(self.settings)
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+        # Sampling parameters (part of the generation cache key)
+        self.sampling_params = {
+            "max_tokens": self.settings.LLM_MAX_TOKENS,
+            "temperature": 0.7,  # Some creativity but not too random
+            "top_p": 0.9,
+            "frequency_penalty": 0.1,
+            "presence_penalty": 0.1,
+        }
 
         # Prompt template for flashcard generation
         self.flashcard_generation_prompt = """
@@ -55,30 +113,82 @@ Return response in the following JSON format:
 Respond ONLY with valid JSON. Do not include any other text or explanations.
         """.strip()
 
-    async def __aenter__(self):
-        """Async context manager entry."""
+    def start(self) -> "LLMClient":
+        """Create the AsyncOpenAI client and connection pool if not open yet."""
+        if self.client is not None and not self._http_client.is_closed:
+            return self
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.settings.LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=self.settings.LLM_TIMEOUT,
+            http2=self.settings.LLM_HTTP2,
+        )
         self.client = AsyncOpenAI(
             base_url=self.settings.OPENROUTER_BASE_URL,
             api_key=self.settings.OPENROUTER_API_KEY,
             timeout=self.settings.LLM_TIMEOUT,
+            max_retries=0,  # retries are handled by _call_with_retry
             default_headers={
                 "HTTP-Referer": "https://localhost:3000",  # Optional: replace with your domain
                 "X-Title": "Flashcard Generator",  # Optional: app name
             },
+            http_client=http_client,
+        )
+        self._http_client = http_client
+        logger.info(
+            f"Created shared LLM HTTP pool | "
+            f"max_connections={self.settings.LLM_MAX_CONNECTIONS} | "
+            f"http2={self.settings.LLM_HTTP2}"
         )
         return self
 
+    async def aclose(self) -> None:
+        """Close the AsyncOpenAI client and its connection pool."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+            logger.info("Closed shared LLM HTTP pool")
+        self._http_client = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self.start()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.client:
-            await self.client.close()
+        await self.aclose()
+
+    def stream_flashcards(
+        self, text_content: str, user_id: Optional[uuid.UUID] = None
+    ) -> "LLMFlashcardStream":
+        """
+        Generate flashcards with a streamed completion.
+
+        Args:
+            text_content: Source text to generate flashcards from
+            user_id: User the call is scheduled for
+
+        Returns:
+            Async iterator yielding each flashcard as soon as it is complete;
+            its ``response`` attribute is set once the stream is exhausted
+        """
+        return LLMFlashcardStream(self, text_content, user_id)
 
-    async def generate_flashcards(self, text_content: str) -> LLMGenerateResponse:
+    async def generate_flashcards(
+        self, text_content: str, user_id: Optional[uuid.UUID] = None
+    ) -> LLMGenerateResponse:
         """
         Generate flashcards from text using OpenRouter.ai LLM via OpenAI SDK.
 
         Args:
             text_content: Source text to generate flashcards from
+            user_id: User the call is scheduled for
 
         Returns:
             LLM response with generated flashcards
@@ -89,7 +199,7 @@ Respond ONLY with valid JSON. Do not include any other text or explanations.
         if not self.client:
             raise LLMServiceError(
                 operation="generate_flashcards",
-                details="LLM client not initialized. Use async context manager.",
+                details="LLM client not initialized. Call start() or use get_llm_client().",
             )
 
         try:
@@ -98,18 +208,11 @@ Respond ONLY with valid JSON. Do not include any other text or explanations.
                 text_content=text_content
             )
 
-            logger.info(f"Sending request to LLM service: {self.settings.LLM_MODEL}")
             start_time = datetime.utcnow()
 
             # Make async request to OpenRouter.ai via OpenAI SDK
-            response = await self.client.chat.completions.create(
-                model=self.settings.LLM_MODEL,
-                messages=[{"role": "user", "content": formatted_prompt}],
-                max_tokens=self.settings.LLM_MAX_TOKENS,
-                temperature=0.7,  # Some creativity but not too random
-                top_p=0.9,
-                frequency_penalty=0.1,
-                presence_penalty=0.1,
+            response, model_used = await self._scheduled_completion(
+                formatted_prompt, len(text_content), user_id
             )
 
             elapsed_time = (datetime.utcnow() - start_time).total_seconds()
@@ -177,30 +280,31 @@ Respond ONLY with valid JSON. Do not include any other text or explanations.
                 )
 
             # Calculate cost if available (OpenRouter provides usage info)
-            cost = None
-            if hasattr(response, "usage") and response.usage:
-                # Using OpenRouter pricing for Gemma 3 27B: $0.10/M input, $0.20/M output
-                input_tokens = response.usage.prompt_tokens
-                output_tokens = response.usage.completion_tokens
-
-                input_cost = (input_tokens / 1_000_000) * 0.10
-                output_cost = (output_tokens / 1_000_000) * 0.20
-                cost = input_cost + output_cost
+            cost = self.router.calculate_cost(
+                getattr(response, "usage", None), model_used
+            )
 
             logger.info(
-                f"Successfully generated {len(flashcards)} flashcards using {self.settings.LLM_MODEL}"
+                f"Successfully generated {len(flashcards)} flashcards using {model_used}"
             )
 
             return LLMGenerateResponse(
-                flashcards=flashcards, model_used=self.settings.LLM_MODEL, cost=cost
+                flashcards=flashcards, model_used=model_used, cost=cost
             )
 
-        except asyncio.TimeoutError:
+        except LLMServiceError:
+            raise
+        except (asyncio.TimeoutError, APITimeoutError):
             logger.error(f"LLM request timeout after {self.settings.LLM_TIMEOUT}s")
             raise LLMServiceError(
                 operation="timeout",
                 details=f"Request timeout after {self.settings.LLM_TIMEOUT} seconds",
             )
+        except APIConnectionError as e:
+            logger.error(f"LLM connection error: {str(e)}")
+            raise LLMServiceError(
+                operation="api_request", details=f"Connection error: {str(e)}"
+            )
         except Exception as e:
             # Handle OpenAI SDK specific exceptions
             if hasattr(e, "status_code"):
@@ -219,7 +323,305 @@ Respond ONLY with valid JSON. Do not include any other text or explanations.
                     operation="unexpected_error", details=f"Unexpected error: {str(e)}"
                 )
 
+    async def _call_with_retry(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a provider call behind the circuit breaker, retrying transient errors.
+
+        Timeouts, connection errors and retryable status codes (429, 5xx) are
+        retried up to ``LLM_RETRY_MAX_ATTEMPTS`` attempts with jittered
+        exponential backoff and count as breaker failures. While the circuit
+        is open, calls fail fast with a ``circuit_open`` LLMServiceError.
+
+        ``LLM_TIMEOUT`` bounds the whole call, not each attempt: an attempt
+        only gets the time left, and no retry is made once the backoff would
+        use up the rest. Callers hold their scheduler slot around this call,
+        so queue waits never count against the deadline or the breaker.
+        """
+        deadline = time.monotonic() + self.settings.LLM_TIMEOUT
+        retry = 0
+        while True:
+            if not self.circuit_breaker.allow_request():
+                raise LLMServiceError(
+                    operation="circuit_open",
+                    details="LLM provider is unavailable, failing fast (circuit open)",
+                    status_code=503,
+                )
+
+            try:
+                result = await asyncio.wait_for(
+                    call(), timeout=deadline - time.monotonic()
+                )
+            except Exception as e:
+                if not self.retry_policy.is_retryable(e):
+                    # The provider answered; the request itself was rejected
+                    self.circuit_breaker.record_success()
+                    raise
+
+                self.circuit_breaker.record_failure()
+                retry += 1
+                if retry >= self.retry_policy.max_attempts:
+                    raise
+
+                delay = self.retry_policy.backoff(retry, e)
+                if delay >= deadline - time.monotonic():
+                    logger.warning(
+                        f"LLM call failed with {type(e).__name__}: {str(e)}; "
+                        f"no time left for a retry within {self.settings.LLM_TIMEOUT}s"
+                    )
+                    raise
+                self.retries += 1
+                logger.warning(
+                    f"LLM call failed with {type(e).__name__}: {str(e)}; "
+                    f"retry {retry}/{self.retry_policy.max_attempts - 1} "
+                    f"in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.circuit_breaker.record_success()
+            return result
+
+    async def _scheduled_completion(
+        self, formatted_prompt: str, text_length: int, user_id: Optional[uuid.UUID]
+    ) -> Tuple[Any, str]:
+        """
+        Run a completion with retries inside one scheduler slot.
+
+        The slot is granted before the retry deadline starts; every attempt is
+        routed with the freshest model stats.
+        """
+        async with self.scheduler.slot(user_id):
+            return await self._call_with_retry(
+                lambda: self._routed_completion(formatted_prompt, text_length)
+            )
+
+    async def _routed_completion(
+        self, formatted_prompt: str, text_length: int
+    ) -> Tuple[Any, str]:
+        """Route and run one (possibly hedged) completion."""
+        model = self.router.choose(text_length)
+        logger.info(f"Sending request to LLM service: {model}")
+        return await self._hedged_completion(formatted_prompt, model)
+
+    async def _hedged_completion(
+        self, formatted_prompt: str, primary_model: str
+    ) -> Tuple[Any, str]:
+        """
+        Request a completion, hedging with the fallback model if it is slow.
+
+        Once the primary call has taken longer than the configured latency
+        percentile of recent calls to its model, the same prompt is sent to
+        ``LLM_FALLBACK_MODEL``; the first successful answer wins and the other
+        request is cancelled. The hedge runs inside the primary's slot.
+
+        Returns:
+            Tuple of the chat completion and the model that produced it
+        """
+        primary = asyncio.ensure_future(
+            self._completion(primary_model, formatted_prompt)
+        )
+        tasks = {primary: primary_model}
+
+        try:
+            hedge_delay = self._hedge_delay(primary_model)
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+                if not done:
+                    fallback_model = self.settings.LLM_FALLBACK_MODEL
+                    self.hedged += 1
+                    logger.info(
+                        f"LLM call slower than {hedge_delay:.2f}s, "
+                        f"hedging with {fallback_model}"
+                    )
+                    hedge = asyncio.ensure_future(
+                        self._completion(fallback_model, formatted_prompt)
+                    )
+                    tasks[hedge] = fallback_model
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result(), tasks[task]
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _completion(self, model: str, formatted_prompt: str) -> Any:
+        """Send one chat completion request and record it in the model's stats."""
+        started = time.monotonic()
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": formatted_prompt}],
+                **self.sampling_params,
+            )
+        except Exception:
+            self.router.record_failure(model)
+            raise
+
+        self.router.record_success(
+            model, time.monotonic() - started, getattr(response, "usage", None)
+        )
+        return response
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds after which to hedge a call, or None if it cannot be hedged."""
+        fallback_model = self.settings.LLM_FALLBACK_MODEL
+        if not fallback_model or fallback_model == model:
+            return None
+        latency = self.router.stats(model).latency
+        if len(latency) < self.settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return latency.percentile(self.settings.LLM_HEDGE_PERCENTILE)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return retry, hedging and circuit breaker counters."""
+        return {
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "circuit_breaker": self.circuit_breaker.get_metrics(),
+        }
+
+
+# Create global client instance (connections are opened on first use)
+llm_client = LLMClient()
+
+
+class LLMFlashcardStream:
+    """
+    Async iterator over flashcards of a streamed LLM completion.
+
+    Cards are yielded as soon as their JSON object is complete. After the
+    iteration finishes, ``response`` holds the full LLMGenerateResponse
+    (all cards, model and cost) for persistence and caching.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        text_content: str,
+        user_id: Optional[uuid.UUID] = None,
+    ):
+        self.llm_client = llm_client
+        self.text_content = text_content
+        self.user_id = user_id
+        self.response: Optional[LLMGenerateResponse] = None
+
+    def __aiter__(self) -> AsyncIterator[LLMFlashcardSuggestion]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[LLMFlashcardSuggestion]:
+        if not self.llm_client.client:
+            raise LLMServiceError(
+                operation="stream_flashcards",
+                details="LLM client not initialized. Call start() or use get_llm_client().",
+            )
+
+        parser = IncrementalFlashcardParser()
+        flashcards: List[LLMFlashcardSuggestion] = []
+        usage = None
+        router = self.llm_client.router
+        model: Optional[str] = None
+        stream = None
+
+        try:
+            formatted_prompt = self.llm_client.flashcard_generation_prompt.format(
+                text_content=self.text_content
+            )
+
+            # The slot is held until the provider stream is fully consumed
+            async with self.llm_client.scheduler.slot(self.user_id):
+                model = router.choose(len(self.text_content))
+                logger.info(f"Streaming request to LLM service: {model}")
+                start_time = datetime.utcnow()
+                started = time.monotonic()
+
+                async def open_stream():
+                    try:
+                        return await self.llm_client.client.chat.completions.create(
+                            model=model,
+                            messages=[{"role": "user", "content": formatted_prompt}],
+                            stream=True,
+                            stream_options={"include_usage": True},
+                            **self.llm_client.sampling_params,
+                        )
+                    except Exception:
+                        router.record_failure(model)
+                        raise
+
+                # Only opening the stream is retried; cards already sent
+                # cannot be taken back
+                stream = await self.llm_client._call_with_retry(open_stream)
+
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+
+                    content = chunk.choices[0].delta.content
+                    if not content:
+                        continue
+
+                    for flashcard in parser.feed(content):
+                        if not flashcards:
+                            elapsed = (datetime.utcnow() - start_time).total_seconds()
+                            logger.info(
+                                f"First streamed flashcard after {elapsed:.2f}s"
+                            )
+                        flashcards.append(flashcard)
+                        yield flashcard
+
+                router.record_success(model, time.monotonic() - started, usage)
+
+            elapsed_time = (datetime.utcnow() - start_time).total_seconds()
+            logger.info(
+                f"LLM stream completed in {elapsed_time:.2f}s with "
+                f"{len(flashcards)} flashcards ({parser.skipped} skipped)"
+            )
+
+        except LLMServiceError:
+            raise
+        except Exception as e:
+            if stream is not None:
+                # Failed while streaming (opening failures are already counted)
+                router.record_failure(model)
+            if hasattr(e, "status_code"):
+                logger.error(f"OpenAI API error {e.status_code}: {str(e)}")
+                raise LLMServiceError(
+                    operation="api_error",
+                    details=f"API error: {str(e)}",
+                    status_code=e.status_code,
+                )
+            logger.error(f"Unexpected error in LLM stream: {str(e)}")
+            raise LLMServiceError(
+                operation="unexpected_error", details=f"Unexpected error: {str(e)}"
+            )
+
+        if not flashcards:
+            raise LLMServiceError(
+                operation="validate_flashcards",
+                details="No valid flashcards generated from LLM response",
+            )
+
+        self.response = LLMGenerateResponse(
+            flashcards=flashcards,
+            model_used=model,
+            cost=router.calculate_cost(usage, model),
+        )
+
 
 async def get_llm_client() -> LLMClient:
-    """Dependency function to get LLM client instance."""
-    return LLMClient()
+    """Dependency function to get the process-wide LLM client."""
+    return llm_client.start()
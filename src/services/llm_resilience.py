@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, Optional
+
+import httpx
+from openai import APIConnectionError
+
+from src.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Provider answers worth another attempt: timeouts, conflicts, rate limits, 5xx
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient provider errors.
+
+    Attempt ``n`` (1-based retry count) waits a random time between 0 and
+    ``min(max_delay, base_delay * 2 ** (n - 1))``; a ``Retry-After`` header
+    on the error response is honoured up to ``max_delay``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retryable_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_status_codes = retryable_status_codes
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "RetryPolicy":
+        """Build a retry policy configured from application settings."""
+        return cls(
+            max_attempts=app_settings.LLM_RETRY_MAX_ATTEMPTS,
+            base_delay=app_settings.LLM_RETRY_BASE_DELAY,
+            max_delay=app_settings.LLM_RETRY_MAX_DELAY,
+        )
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether an error is transient (timeout, connection, retryable status)."""
+        if isinstance(
+            error, (asyncio.TimeoutError, APIConnectionError, httpx.TransportError)
+        ):
+            return True
+        return getattr(error, "status_code", None) in self.retryable_status_codes
+
+    def backoff(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """
+        Delay before the given retry.
+
+        Args:
+            retry: Retry number, starting at 1
+            error: Error of the failed attempt, checked for Retry-After
+
+        Returns:
+            Seconds to wait
+        """
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _retry_after(error: Optional[BaseException]) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            return max(0.0, float(headers.get("retry-after")))
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for the LLM provider.
+
+    ``closed``: calls pass; ``failure_threshold`` consecutive transient
+    failures open the circuit. ``open``: calls fail fast for
+    ``recovery_timeout`` seconds. ``half_open``: one probe call is let
+    through; its success closes the circuit, its failure opens it again. A
+    probe that never reports back is replaced after ``recovery_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+
+        # Metrics
+        self.opened = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "CircuitBreaker":
+        """Build a circuit breaker configured from application settings."""
+        return cls(
+            failure_threshold=app_settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=app_settings.LLM_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may be made now (claims the probe when half open)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and (
+            self._probe_started_at is None
+            or time.monotonic() - self._probe_started_at >= self.recovery_timeout
+        ):
+            self._probe_started_at = time.monotonic()
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record that the provider answered."""
+        if self._state != self.CLOSED:
+            logger.info("LLM circuit breaker closed")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Record a transient provider failure."""
+        self._failures += 1
+        self._probe_started_at = None
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opened += 1
+                logger.warning(
+                    f"LLM circuit breaker opened after {self._failures} failures; "
+                    f"failing fast for {self.recovery_timeout}s"
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Sliding window of call latencies with percentile lookup."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency at the given fraction (0-1), or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
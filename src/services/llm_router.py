@@ -0,0 +1,276 @@
+import bisect
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.config import LLMRoute, Settings
+from src.services.llm_resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (the last bucket is unbounded)
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)  # seconds
+TOKENS_PER_SECOND_BUCKETS = (5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0)
+COST_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)  # USD
+
+
+class Histogram:
+    """Running histogram over fixed buckets, with count, sum and maximum."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction (0-1)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self, digits: int = 3) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, digits) if self.count else None,
+            "p50": self._rounded(self.quantile(0.5), digits),
+            "p95": self._rounded(self.quantile(0.95), digits),
+            "max": round(self.max, digits),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+    @staticmethod
+    def _rounded(value: Optional[float], digits: int) -> Optional[float]:
+        return round(value, digits) if value is not None else None
+
+
+class ModelStats:
+    """
+    Telemetry of one model.
+
+    Exponentially weighted averages of latency and error rate drive routing;
+    the histograms of latency, output tokens per second and cost per call are
+    kept for reporting, and a window of recent latencies for hedging.
+    """
+
+    def __init__(self, ewma_alpha: float = 0.2):
+        self.ewma_alpha = ewma_alpha
+        self.requests = 0
+        self.errors = 0
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.last_attempt_at: Optional[float] = None
+        self.latency = LatencyTracker()
+        self.latency_histogram = Histogram(LATENCY_BUCKETS)
+        self.tokens_per_second_histogram = Histogram(TOKENS_PER_SECOND_BUCKETS)
+        self.cost_histogram = Histogram(COST_BUCKETS)
+
+    def record_success(
+        self,
+        latency: float,
+        completion_tokens: Optional[int] = None,
+        cost: Optional[float] = None,
+    ) -> None:
+        self.requests += 1
+        self.last_attempt_at = time.monotonic()
+        self.ewma_latency = (
+            latency
+            if self.ewma_latency is None
+            else self._ewma(self.ewma_latency, latency)
+        )
+        self.ewma_error_rate = self._ewma(self.ewma_error_rate, 0.0)
+        self.latency.record(latency)
+        self.latency_histogram.observe(latency)
+        if completion_tokens and latency > 0:
+            self.tokens_per_second_histogram.observe(completion_tokens / latency)
+        if cost is not None:
+            self.cost_histogram.observe(cost)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.last_attempt_at = time.monotonic()
+        self.errors += 1
+        self.ewma_error_rate = self._ewma(self.ewma_error_rate, 1.0)
+
+    def expected_latency(self) -> float:
+        """Average latency divided by the success rate (inf without successes)."""
+        if self.ewma_latency is None:
+            return math.inf
+        return self.ewma_latency / max(1.0 - self.ewma_error_rate, 0.05)
+
+    def _ewma(self, average: float, value: float) -> float:
+        return self.ewma_alpha * value + (1 - self.ewma_alpha) * average
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "ewma_latency_s": (
+                round(self.ewma_latency, 3) if self.ewma_latency is not None else None
+            ),
+            "ewma_error_rate": round(self.ewma_error_rate, 3),
+            "latency_s": self.latency_histogram.to_dict(),
+            "tokens_per_second": self.tokens_per_second_histogram.to_dict(digits=1),
+            "cost_usd": self.cost_histogram.to_dict(digits=6),
+        }
+
+
+class LLMRouter:
+    """
+    Picks the model of each LLM call from a routing table.
+
+    Routes are tried in table order (typically fastest and cheapest first);
+    a route is eligible when the source text fits its ``max_chars``. The
+    first eligible route that is healthy wins: its recent error rate is at
+    most ``max_error_rate`` and its average latency within the route's
+    ``max_latency``. Routes need ``min_samples`` calls before they can be
+    judged, and an unhealthy route is still tried once per ``probe_interval``
+    so it can recover. If no eligible route is healthy, the one with the
+    lowest expected latency (latency over success rate) is used.
+
+    Costs are computed from per-model token prices; every call's latency,
+    throughput and cost is recorded per model.
+    """
+
+    def __init__(
+        self,
+        routes: List[LLMRoute],
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_error_rate: float = 0.5,
+        min_samples: int = 5,
+        probe_interval: float = 30.0,
+        ewma_alpha: float = 0.2,
+    ):
+        if not routes:
+            raise ValueError("LLM routing table must contain at least one route")
+        self.routes = list(routes)
+        self.prices = dict(prices or {})
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.ewma_alpha = ewma_alpha
+        self._stats: Dict[str, ModelStats] = {}
+        self.decisions: Dict[str, int] = {}
+        self.rerouted = 0
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "LLMRouter":
+        """Build a router from settings; no routes sends everything to LLM_MODEL."""
+        return cls(
+            routes=app_settings.LLM_ROUTES or [LLMRoute(model=app_settings.LLM_MODEL)],
+            prices=app_settings.LLM_MODEL_PRICES,
+            max_error_rate=app_settings.LLM_ROUTER_MAX_ERROR_RATE,
+            min_samples=app_settings.LLM_ROUTER_MIN_SAMPLES,
+            probe_interval=app_settings.LLM_ROUTER_PROBE_INTERVAL,
+            ewma_alpha=app_settings.LLM_ROUTER_EWMA_ALPHA,
+        )
+
+    def stats(self, model: str) -> ModelStats:
+        """Telemetry of a model, created on first use."""
+        if model not in self._stats:
+            self._stats[model] = ModelStats(self.ewma_alpha)
+        return self._stats[model]
+
+    def preferred_model(self, text_length: int) -> str:
+        """Model the text is routed to when every route is healthy."""
+        return self._eligible(text_length)[0].model
+
+    def choose(self, text_length: int) -> str:
+        """
+        Pick the model for a call.
+
+        Args:
+            text_length: Length of the source text in characters
+
+        Returns:
+            Model name to send the call to
+        """
+        eligible = self._eligible(text_length)
+        chosen = next((route for route in eligible if self._healthy(route)), None)
+        if chosen is None:
+            chosen = min(
+                eligible, key=lambda route: self.stats(route.model).expected_latency()
+            )
+        if chosen is not eligible[0]:
+            self.rerouted += 1
+            logger.info(f"LLM route {eligible[0].model} degraded, using {chosen.model}")
+
+        self.stats(chosen.model).last_attempt_at = time.monotonic()
+        self.decisions[chosen.model] = self.decisions.get(chosen.model, 0) + 1
+        return chosen.model
+
+    def _eligible(self, text_length: int) -> List[LLMRoute]:
+        eligible = [
+            route
+            for route in self.routes
+            if route.max_chars is None or text_length <= route.max_chars
+        ]
+        if eligible:
+            return eligible
+        # Longer than every limit: the route taking the longest texts
+        return [max(self.routes, key=lambda route: route.max_chars)]
+
+    def _healthy(self, route: LLMRoute) -> bool:
+        stats = self.stats(route.model)
+        if stats.requests < self.min_samples:
+            return True
+
+        # A model that never succeeded has no latency to be within the limit
+        healthy = stats.ewma_error_rate <= self.max_error_rate and (
+            route.max_latency is None
+            or (
+                stats.ewma_latency is not None
+                and stats.ewma_latency <= route.max_latency
+            )
+        )
+        if healthy:
+            return True
+
+        # Let one call through now and then so the route can recover
+        return time.monotonic() - stats.last_attempt_at >= self.probe_interval
+
+    def calculate_cost(self, usage, model: str) -> Optional[float]:
+        """Estimate a call's cost from token usage and the model's prices."""
+        if not usage or model not in self.prices:
+            return None
+
+        input_price, output_price = self.prices[model]  # USD per 1M tokens
+        input_cost = (usage.prompt_tokens / 1_000_000) * input_price
+        output_cost = (usage.completion_tokens / 1_000_000) * output_price
+        return input_cost + output_cost
+
+    def record_success(self, model: str, latency: float, usage) -> None:
+        """Record a completed call of a model."""
+        self.stats(model).record_success(
+            latency,
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            cost=self.calculate_cost(usage, model),
+        )
+
+    def record_failure(self, model: str) -> None:
+        """Record a failed call of a model."""
+        self.stats(model).record_failure()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return the routing table, decisions and per-model telemetry."""
+        return {
+            "routes": [route.model_dump() for route in self.routes],
+            "decisions": dict(self.decisions),
+            "rerouted": self.rerouted,
+            "models": {model: stats.to_dict() for model, stats in self._stats.items()},
+        }
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from src.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+# Queue key of LLM calls made outside a user request
+SYSTEM_USER_KEY = "system"
+
+
+class LLMScheduler:
+    """
+    Global concurrency cap with per-user weighted fair queuing for LLM calls.
+
+    At most ``max_concurrency`` calls run at once per process. When all slots
+    are busy, waiting calls are granted in start-time fair queuing order:
+    each call gets a start tag ``max(virtual_time, user's last finish tag)``
+    and advances the user's finish tag by ``cost / weight``. A user with many
+    queued calls therefore only gets their weighted share of the slots, and a
+    user arriving later is served next instead of waiting behind the backlog.
+    Queue waits are recorded for sizing the provider tier.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        user_weights: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+        wait_samples: int = 1000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.user_weights = dict(user_weights or {})
+        self.enabled = enabled
+        self._active = 0
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        # (start tag, sequence, user key, future); cancelled waiters are skipped
+        self._waiters: List[Tuple[float, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        # Metrics
+        self.granted = 0
+        self.delayed = 0
+        self.cancelled = 0
+        self.peak_queued = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._waits: Deque[float] = deque(maxlen=wait_samples)
+
+    @classmethod
+    def from_settings(cls, app_settings: Settings) -> "LLMScheduler":
+        """Build a scheduler configured from application settings."""
+        return cls(
+            max_concurrency=app_settings.llm_scheduler_max_concurrency,
+            user_weights=app_settings.llm_scheduler_user_weights,
+            enabled=app_settings.llm_scheduler_enabled,
+        )
+
+    def set_weight(self, user_id: uuid.UUID, weight: float) -> None:
+        """Give a user a larger (or smaller) share of the LLM slots."""
+        if weight <= 0:
+            raise ValueError("Scheduler weight must be positive")
+        self.user_weights[str(user_id)] = weight
+
+    @asynccontextmanager
+    async def slot(
+        self, user_id: Optional[uuid.UUID] = None, cost: float = 1.0
+    ) -> AsyncIterator[None]:
+        """
+        Hold one LLM slot for the duration of the block.
+
+        Args:
+            user_id: User the call is made for (None for system calls)
+            cost: Relative cost of the call for fairness accounting
+        """
+        if not self.enabled:
+            yield
+            return
+
+        await self._acquire(str(user_id) if user_id else SYSTEM_USER_KEY, cost)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _tag(self, key: str, cost: float) -> float:
+        """Assign the start tag of a call and advance the user's finish tag."""
+        start = max(self._virtual_time, self._finish_tags.get(key, 0.0))
+        self._finish_tags[key] = start + cost / self.user_weights.get(key, 1.0)
+        return start
+
+    async def _acquire(self, key: str, cost: float) -> None:
+        start = self._tag(key, cost)
+
+        if self._active < self.max_concurrency and not self._waiters:
+            self._virtual_time = start
+            self._active += 1
+            self._record_wait(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (start, next(self._sequence), key, future))
+        self.delayed += 1
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        enqueued_at = time.monotonic()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if future.done() and not future.cancelled():
+                # Granted just before the caller was cancelled
+                self._release()
+            raise
+
+        self._record_wait(time.monotonic() - enqueued_at)
+
+    def _release(self) -> None:
+        self._active -= 1
+
+        while self._waiters and self._active < self.max_concurrency:
+            start, _, key, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._virtual_time = start
+            self._active += 1
+            future.set_result(None)
+
+        if not self._waiters:
+            # Tags at or behind the virtual time carry no history
+            self._finish_tags = {
+                key: tag
+                for key, tag in self._finish_tags.items()
+                if tag > self._virtual_time
+            }
+
+    def _record_wait(self, wait: float) -> None:
+        self.granted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._waits.append(wait)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return slot usage and queue-wait statistics (milliseconds)."""
+        waits = sorted(self._waits)
+
+        def percentile(fraction: float) -> float:
+            if not waits:
+                return 0.0
+            index = min(len(waits) - 1, int(fraction * len(waits)))
+            return round(waits[index] * 1000, 2)
+
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": sum(1 for waiter in self._waiters if not waiter[3].done()),
+            "peak_queued": self.peak_queued,
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "cancelled": self.cancelled,
+            "wait_ms_avg": (
+                round(self._total_wait / self.granted * 1000, 2)
+                if self.granted
+                else 0.0
+            ),
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": round(self._max_wait * 1000, 2),
+        }
+
+
+# Create global scheduler instance
+llm_scheduler = LLMScheduler.from_settings(settings)
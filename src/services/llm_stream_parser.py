@@ -0,0 +1,101 @@
+import json
+import logging
+from typing import List, Optional
+
+from src.dtos import LLMFlashcardSuggestion
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalFlashcardParser:
+    """
+    Incremental parser for the streamed flashcard JSON document.
+
+    The model answers with ``{"flashcards": [{...}, {...}]}``, possibly wrapped
+    in code fences. Text is fed in arbitrary chunks; every object that is an
+    element of an array directly inside the root object is returned as soon as
+    its closing brace arrives. Strings and escapes are tracked, so braces
+    inside card text do not confuse the scanner. Anything before the first
+    ``{`` (e.g. a code fence) is ignored.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._item: Optional[List[str]] = None
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[LLMFlashcardSuggestion]:
+        """
+        Consume a chunk of model output.
+
+        Args:
+            chunk: Next piece of streamed text
+
+        Returns:
+            Flashcards whose JSON object was completed by this chunk
+        """
+        completed: List[LLMFlashcardSuggestion] = []
+
+        for char in chunk:
+            if not self._stack and char != "{":
+                # Outside the root object (code fences, stray text)
+                continue
+
+            if self._item is not None:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack == ["{", "["]:
+                    self._item = ["{"]
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._stack == ["{", "["] and self._item is not None:
+                    flashcard = self._parse_item("".join(self._item))
+                    self._item = None
+                    if flashcard is not None:
+                        completed.append(flashcard)
+
+        return completed
+
+    def _parse_item(self, raw: str) -> Optional[LLMFlashcardSuggestion]:
+        """Parse one completed array element into a flashcard suggestion."""
+        try:
+            card_data = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unparsable streamed flashcard: {raw[:200]}")
+            self.skipped += 1
+            return None
+
+        if (
+            not isinstance(card_data, dict)
+            or "front_content" not in card_data
+            or "back_content" not in card_data
+        ):
+            logger.warning(f"Skipping invalid flashcard: {card_data}")
+            self.skipped += 1
+            return None
+
+        try:
+            return LLMFlashcardSuggestion(
+                front_content=str(card_data["front_content"]).strip(),
+                back_content=str(card_data["back_content"]).strip(),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create flashcard from data {card_data}: {e}")
+            self.skipped += 1
+            return None
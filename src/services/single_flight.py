@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) starts the work; callers arriving
+    while it is in flight await the same future and receive the same result
+    or exception. Keys are forgotten as soon as the call finishes, so this is
+    not a cache. Coalescing is per process (per event loop).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+        # Metrics
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _register(self, key: Hashable, call: asyncio.Future) -> None:
+        self._calls[key] = call
+        call.add_done_callback(lambda done: self._forget(key, done))
+
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved when no caller joined the leader
+        if not call.cancelled():
+            call.exception()
+
+    def _in_flight(self, key: Hashable) -> Any:
+        call = self._calls.get(key)
+        if call is None or call.done():
+            return None
+        return call
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` once for all concurrent callers with the same key.
+
+        The work runs in its own task, so a cancelled caller (e.g. a closed
+        connection) neither cancels it nor fails the callers that joined.
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function performing the work
+
+        Returns:
+            The result shared by all callers
+        """
+        call = self._in_flight(key)
+        if call is None:
+            self.leaders += 1
+            call = asyncio.ensure_future(fn())
+            self._register(key, call)
+        else:
+            self.coalesced += 1
+            logger.info(f"Joining in-flight call {key}")
+
+        return await asyncio.shield(call)
+
+    def claim(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """
+        Join the in-flight call for a key or become its leader.
+
+        Used when the leader cannot run as a task (e.g. a streaming
+        generator). The leader must complete the returned future with
+        ``set_result`` or ``set_exception``; other callers await it.
+
+        Args:
+            key: Identity of the call
+
+        Returns:
+            Tuple of the shared future and whether the caller is the leader
+        """
+        call = self._in_flight(key)
+        if call is not None:
+            self.coalesced += 1
+            logger.info(f"Joining in-flight call {key}")
+            return call, False
+
+        self.leaders += 1
+        call = asyncio.get_running_loop().create_future()
+        self._register(key, call)
+        return call, True
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return in-flight and coalescing counters."""
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -3,14 +3,17 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
+
 from src.api.v1.schemas.spaced_repetition_schemas import (
     FlashcardWithRepetition,
     RepetitionData,
     ReviewFlashcardCommand,
     SpacedRepetitionReviewResponse,
 )
+from src.core.config import settings
 from src.db.schemas import FlashcardBase
-from supabase import Client
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +21,17 @@ logger = logging.getLogger(__name__)
 class SpacedRepetitionService:
     """Service for managing spaced repetition operations."""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(
+        self,
+        supabase_client: AsyncPostgrestClient,
+        use_review_rpc: Optional[bool] = None,
+    ):
         self.supabase = supabase_client
+        self.use_review_rpc = (
+            settings.spaced_repetition_review_rpc
+            if use_review_rpc is None
+            else use_review_rpc
+        )
 
     def _validate_user_access(self, user_id: uuid.UUID) -> None:
         """
@@ -93,7 +105,7 @@ class SpacedRepetitionService:
         """
         try:
             # Optimized query: select only necessary fields to reduce bandwidth
-            response = (
+            response = await (
                 self.supabase.table("flashcards")
                 .select("id, user_id, status, created_at")
                 .eq("id", str(flashcard_id))
@@ -150,7 +162,7 @@ class SpacedRepetitionService:
         """
         try:
             # Optimized query: select only necessary fields
-            response = (
+            response = await (
                 self.supabase.table("user_flashcard_spaced_repetition")
                 .select("id, current_interval, data_extra, created_at")
                 .eq("user_id", str(user_id))
@@ -228,6 +240,158 @@ class SpacedRepetitionService:
 
         return rating
 
+    async def _submit_review_rpc(
+        self, command: ReviewFlashcardCommand, sanitized_rating: int
+    ) -> Dict[str, Any]:
+        """
+        Record a review with the review_flashcard database function.
+
+        Ownership and status checks, rate limiting, the interval update and
+        the upsert all run in one RPC call (see the review_flashcard_function
+        migration); _calculate_next_interval is the reference for its rules.
+
+        Args:
+            command: Review command with user_id, flashcard_id and rating
+            sanitized_rating: Performance rating clamped to 1-5
+
+        Returns:
+            Upserted spaced repetition record
+
+        Raises:
+            ValueError: If the function rejects the review
+            Exception: If the database call fails
+        """
+        try:
+            response = await self.supabase.rpc(
+                "review_flashcard",
+                {
+                    "p_user_id": str(command.user_id),
+                    "p_flashcard_id": str(command.flashcard_id),
+                    "p_performance_rating": sanitized_rating,
+                },
+            ).execute()
+        except APIError as e:
+            # Validation failures are raised by the function as P0001
+            if e.code == "P0001":
+                raise ValueError(e.message)
+            raise
+
+        record = response.data[0] if isinstance(response.data, list) else response.data
+        if not record:
+            raise Exception("Failed to upsert spaced repetition record")
+
+        return record
+
+    async def _submit_review_legacy(
+        self, command: ReviewFlashcardCommand, sanitized_rating: int
+    ) -> Dict[str, Any]:
+        """
+        Record a review with separate validation, read and upsert queries.
+
+        Args:
+            command: Review command with user_id, flashcard_id and rating
+            sanitized_rating: Performance rating clamped to 1-5
+
+        Returns:
+            Upserted spaced repetition record
+
+        Raises:
+            ValueError: If validation fails
+            Exception: If database operations fail
+        """
+        # Validate flashcard access (optimized query)
+        await self._validate_flashcard_access(command.user_id, command.flashcard_id)
+
+        # Get existing repetition record (optimized query)
+        existing_record = await self._get_or_create_repetition_record(
+            command.user_id, command.flashcard_id
+        )
+
+        # Rate limiting validation
+        self._validate_review_frequency(existing_record)
+
+        # Calculate new interval and due date
+        current_interval = (
+            existing_record.get("current_interval", 1) if existing_record else 1
+        )
+        new_interval, due_date = self._calculate_next_interval(
+            current_interval, sanitized_rating
+        )
+
+        # Prepare optimized upsert data
+        now = datetime.utcnow()
+        review_count = (
+            (existing_record.get("data_extra", {}).get("review_count", 0) + 1)
+            if existing_record
+            else 1
+        )
+
+        upsert_data = {
+            "user_id": str(command.user_id),
+            "flashcard_id": str(command.flashcard_id),
+            "due_date": due_date.isoformat() + "Z",  # Ensure UTC timezone
+            "current_interval": new_interval,
+            "last_reviewed_at": now.isoformat() + "Z",
+            "data_extra": {
+                "last_performance_rating": sanitized_rating,
+                "review_count": review_count,
+                "algorithm_version": "sm2_v1",  # Track algorithm version
+            },
+            "updated_at": now.isoformat() + "Z",
+        }
+
+        # Add ID and created_at for new records
+        if not existing_record:
+            upsert_data.update(
+                {"id": str(uuid.uuid4()), "created_at": now.isoformat() + "Z"}
+            )
+
+        # Optimized upsert with conflict resolution
+        response = await (
+            self.supabase.table("user_flashcard_spaced_repetition")
+            .upsert(
+                upsert_data, on_conflict="user_id,flashcard_id"
+            )  # Specify conflict columns
+            .execute()
+        )
+
+        if not response.data:
+            raise Exception("Failed to upsert spaced repetition record")
+
+        return response.data[0]
+
+    def _build_review_response(
+        self, record: Dict[str, Any]
+    ) -> SpacedRepetitionReviewResponse:
+        """
+        Convert an upserted repetition record into the review response.
+
+        Args:
+            record: Spaced repetition row returned by PostgREST
+
+        Returns:
+            SpacedRepetitionReviewResponse with naive UTC timestamps
+        """
+        return SpacedRepetitionReviewResponse(
+            id=uuid.UUID(record["id"]),
+            user_id=uuid.UUID(record["user_id"]),
+            flashcard_id=uuid.UUID(record["flashcard_id"]),
+            due_date=datetime.fromisoformat(
+                record["due_date"].replace("Z", "+00:00")
+            ).replace(tzinfo=None),
+            current_interval=record["current_interval"],
+            last_reviewed_at=datetime.fromisoformat(
+                record["last_reviewed_at"].replace("Z", "+00:00")
+            ).replace(tzinfo=None),
+            data_extra=record.get("data_extra"),
+            created_at=datetime.fromisoformat(
+                record["created_at"].replace("Z", "+00:00")
+            ).replace(tzinfo=None),
+            updated_at=datetime.fromisoformat(
+                record["updated_at"].replace("Z", "+00:00")
+            ).replace(tzinfo=None),
+        )
+
     async def review_flashcard(
         self, command: ReviewFlashcardCommand
     ) -> SpacedRepetitionReviewResponse:
@@ -256,97 +420,26 @@ class SpacedRepetitionService:
 
             logger.info(
                 f"Processing flashcard review | user_id={command.user_id} | "
-                f"flashcard_id={command.flashcard_id} | rating={sanitized_rating}"
-            )
-
-            # Validate flashcard access (optimized query)
-            flashcard_data = await self._validate_flashcard_access(
-                command.user_id, command.flashcard_id
-            )
-
-            # Get existing repetition record (optimized query)
-            existing_record = await self._get_or_create_repetition_record(
-                command.user_id, command.flashcard_id
-            )
-
-            # Rate limiting validation
-            self._validate_review_frequency(existing_record)
-
-            # Calculate new interval and due date
-            current_interval = (
-                existing_record.get("current_interval", 1) if existing_record else 1
-            )
-            new_interval, due_date = self._calculate_next_interval(
-                current_interval, sanitized_rating
-            )
-
-            # Prepare optimized upsert data
-            now = datetime.utcnow()
-            review_count = (
-                (existing_record.get("data_extra", {}).get("review_count", 0) + 1)
-                if existing_record
-                else 1
+                f"flashcard_id={command.flashcard_id} | rating={sanitized_rating} | "
+                f"rpc={self.use_review_rpc}"
             )
 
-            upsert_data = {
-                "user_id": str(command.user_id),
-                "flashcard_id": str(command.flashcard_id),
-                "due_date": due_date.isoformat() + "Z",  # Ensure UTC timezone
-                "current_interval": new_interval,
-                "last_reviewed_at": now.isoformat() + "Z",
-                "data_extra": {
-                    "last_performance_rating": sanitized_rating,
-                    "review_count": review_count,
-                    "algorithm_version": "sm2_v1",  # Track algorithm version
-                },
-                "updated_at": now.isoformat() + "Z",
-            }
-
-            # Add ID and created_at for new records
-            if not existing_record:
-                upsert_data.update(
-                    {"id": str(uuid.uuid4()), "created_at": now.isoformat() + "Z"}
+            if self.use_review_rpc:
+                updated_record = await self._submit_review_rpc(
+                    command, sanitized_rating
+                )
+            else:
+                updated_record = await self._submit_review_legacy(
+                    command, sanitized_rating
                 )
 
-            # Optimized upsert with conflict resolution
-            response = (
-                self.supabase.table("user_flashcard_spaced_repetition")
-                .upsert(
-                    upsert_data, on_conflict="user_id,flashcard_id"
-                )  # Specify conflict columns
-                .execute()
-            )
-
-            if not response.data:
-                raise Exception("Failed to upsert spaced repetition record")
-
-            updated_record = response.data[0]
-
-            # Create response with proper timezone handling
-            result = SpacedRepetitionReviewResponse(
-                id=uuid.UUID(updated_record["id"]),
-                user_id=uuid.UUID(updated_record["user_id"]),
-                flashcard_id=uuid.UUID(updated_record["flashcard_id"]),
-                due_date=datetime.fromisoformat(
-                    updated_record["due_date"].replace("Z", "+00:00")
-                ).replace(tzinfo=None),
-                current_interval=updated_record["current_interval"],
-                last_reviewed_at=datetime.fromisoformat(
-                    updated_record["last_reviewed_at"].replace("Z", "+00:00")
-                ).replace(tzinfo=None),
-                data_extra=updated_record.get("data_extra"),
-                created_at=datetime.fromisoformat(
-                    updated_record["created_at"].replace("Z", "+00:00")
-                ).replace(tzinfo=None),
-                updated_at=datetime.fromisoformat(
-                    updated_record["updated_at"].replace("Z", "+00:00")
-                ).replace(tzinfo=None),
-            )
+            result = self._build_review_response(updated_record)
 
             logger.info(
                 f"Successfully processed flashcard review | user_id={command.user_id} | "
-                f"flashcard_id={command.flashcard_id} | new_interval={new_interval} | "
-                f"due_date={due_date.isoformat()} | review_count={review_count}"
+                f"flashcard_id={command.flashcard_id} | new_interval={result.current_interval} | "
+                f"due_date={result.due_date.isoformat()} | "
+                f"review_count={(result.data_extra or {}).get('review_count')}"
             )
 
             return result
@@ -358,18 +451,45 @@ class SpacedRepetitionService:
             logger.error(f"Error processing flashcard review: {str(e)}")
             raise
 
+    def _parse_timestamp(self, value: Optional[str]) -> Optional[datetime]:
+        """
+        Parse an ISO timestamp returned by PostgREST into a naive UTC datetime.
+
+        Args:
+            value: ISO formatted timestamp string (may end with 'Z')
+
+        Returns:
+            Naive UTC datetime, or None if value is empty
+
+        Raises:
+            ValueError: If the value is not a valid ISO timestamp
+        """
+        if not value:
+            return None
+
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo:
+            parsed = parsed.replace(tzinfo=None)
+        return parsed
+
     async def get_due_flashcards(
         self, user_id: uuid.UUID, limit: int = 20
     ) -> List[FlashcardWithRepetition]:
         """
         Get flashcards that are due for review with spaced repetition data.
 
+        Filtering (due_date <= now, active status), ordering by due_date and the
+        limit are all applied by the database, so only the requested rows are
+        transferred. The query starts from user_flashcard_spaced_repetition and
+        embeds the flashcard with an inner join, which lets PostgREST use the
+        (user_id, due_date) index for both the filter and the sort.
+
         Args:
             user_id: UUID of the authenticated user
             limit: Maximum number of cards to return (1-100)
 
         Returns:
-            List of FlashcardWithRepetition objects
+            List of FlashcardWithRepetition objects sorted by due date
 
         Raises:
             ValueError: If input validation fails
@@ -384,109 +504,69 @@ class SpacedRepetitionService:
 
             logger.info(f"Getting due flashcards for user {user_id} with limit {limit}")
 
-            # Query with JOIN to get flashcards with spaced repetition data
-            # Using Supabase's query builder with foreign key relationships
-            query = (
-                self.supabase.table("flashcards")
+            current_time = datetime.utcnow()
+
+            # Inner embed drops repetition rows whose flashcard is not active
+            response = await (
+                self.supabase.table("user_flashcard_spaced_repetition")
                 .select(
-                    """
-                    *,
-                    user_flashcard_spaced_repetition:user_flashcard_spaced_repetition(
-                        due_date,
-                        current_interval,
-                        last_reviewed_at
-                    )
-                """
+                    "due_date, current_interval, last_reviewed_at, flashcards!inner(*)"
                 )
                 .eq("user_id", str(user_id))
-                .eq("status", "active")
+                .eq("flashcards.status", "active")
+                .lte("due_date", current_time.isoformat())
+                .order("due_date")
+                .limit(limit)
+                .execute()
             )
 
-            # Execute query
-            response = query.execute()
-
             if not response.data:
-                logger.info(f"No flashcards found for user {user_id}")
+                logger.info(f"No due flashcards found for user {user_id}")
                 return []
 
-            # Filter flashcards that are due and have spaced repetition data
             due_flashcards = []
-            current_time = datetime.utcnow()
-
-            for flashcard_data in response.data:
-                # Check if flashcard has spaced repetition data
-                sr_data = flashcard_data.get("user_flashcard_spaced_repetition")
-                if not sr_data or not sr_data:
+            for sr_record in response.data:
+                flashcard_data = sr_record.get("flashcards")
+                if not flashcard_data:
                     continue
 
-                # Get the first (and should be only) spaced repetition record
-                sr_record = (
-                    sr_data[0] if isinstance(sr_data, list) and sr_data else sr_data
-                )
-                if not sr_record:
+                try:
+                    due_date = self._parse_timestamp(sr_record.get("due_date"))
+                except (ValueError, AttributeError):
+                    logger.warning(
+                        f"Invalid due_date format for flashcard {flashcard_data.get('id')}"
+                    )
                     continue
 
-                # Check if card is due
-                due_date_str = sr_record.get("due_date")
-                if not due_date_str:
+                if not due_date:
                     continue
 
-                # Parse due date
                 try:
-                    due_date = datetime.fromisoformat(
-                        due_date_str.replace("Z", "+00:00")
+                    last_reviewed_at = self._parse_timestamp(
+                        sr_record.get("last_reviewed_at")
                     )
-                    if due_date.tzinfo:
-                        due_date = due_date.replace(tzinfo=None)
                 except (ValueError, AttributeError):
                     logger.warning(
-                        f"Invalid due_date format for flashcard {flashcard_data.get('id')}"
+                        f"Invalid last_reviewed_at format for flashcard {flashcard_data.get('id')}"
                     )
-                    continue
-
-                # Only include cards that are due
-                if due_date <= current_time:
-                    # Parse last_reviewed_at if present
                     last_reviewed_at = None
-                    if sr_record.get("last_reviewed_at"):
-                        try:
-                            last_reviewed_at = datetime.fromisoformat(
-                                sr_record["last_reviewed_at"].replace("Z", "+00:00")
-                            )
-                            if last_reviewed_at.tzinfo:
-                                last_reviewed_at = last_reviewed_at.replace(tzinfo=None)
-                        except (ValueError, AttributeError):
-                            logger.warning(
-                                f"Invalid last_reviewed_at format for flashcard {flashcard_data.get('id')}"
-                            )
-
-                    # Create RepetitionData object
-                    repetition_data = RepetitionData(
-                        due_date=due_date,
-                        current_interval=sr_record.get("current_interval", 1),
-                        last_reviewed_at=last_reviewed_at,
-                    )
 
-                    # Remove the joined data from flashcard_data before creating FlashcardBase
-                    clean_flashcard_data = {
-                        k: v
-                        for k, v in flashcard_data.items()
-                        if k != "user_flashcard_spaced_repetition"
-                    }
+                repetition_data = RepetitionData(
+                    due_date=due_date,
+                    current_interval=sr_record.get("current_interval", 1),
+                    last_reviewed_at=last_reviewed_at,
+                )
 
-                    # Create FlashcardWithRepetition object
-                    flashcard_with_repetition = FlashcardWithRepetition(
-                        **clean_flashcard_data, repetition_data=repetition_data
+                due_flashcards.append(
+                    FlashcardWithRepetition(
+                        **flashcard_data, repetition_data=repetition_data
                     )
+                )
 
-                    due_flashcards.append(flashcard_with_repetition)
-
-            # Sort by due_date (earliest first) and limit results
-            due_flashcards.sort(key=lambda card: card.repetition_data.due_date)
-            limited_cards = due_flashcards[:limit]
-
-            logger.info(f"Found {len(limited_cards)} due flashcards for user {user_id}")
-            return limited_cards
+            logger.info(
+                f"Found {len(due_flashcards)} due flashcards for user {user_id}"
+            )
+            return due_flashcards
 
         except ValueError as e:
             logger.warning(
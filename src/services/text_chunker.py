@@ -0,0 +1,92 @@
+import math
+import re
+from typing import List, Tuple
+
+# Rough average for English/Polish prose with SentencePiece/BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text from its length."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most ``max_tokens`` estimated tokens.
+
+    Paragraphs are packed greedily into chunks. A paragraph that does not fit
+    in one chunk is split on sentence boundaries, and a sentence that is still
+    too long is split on whitespace, so chunks only break mid-word when a
+    single word exceeds the budget.
+
+    Args:
+        text: Source text
+        max_tokens: Token budget of one chunk
+
+    Returns:
+        Non-empty chunks in source order (a single chunk for short texts)
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    # (piece, separator used when joined to the previous piece)
+    pieces: List[Tuple[str, str]] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append((paragraph, "\n\n"))
+            continue
+        separator = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            for part in _split_long_piece(sentence, max_chars):
+                pieces.append((part, separator))
+                separator = " "
+
+    return _pack(pieces, max_chars)
+
+
+def _split_long_piece(piece: str, max_chars: int) -> List[str]:
+    """Split a sentence longer than the budget on whitespace."""
+    if len(piece) <= max_chars:
+        return [piece]
+
+    parts: List[str] = []
+    current = ""
+    for word in piece.split():
+        while len(word) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            parts.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _pack(pieces: List[Tuple[str, str]], max_chars: int) -> List[str]:
+    """Greedily join consecutive pieces into chunks within the budget."""
+    chunks: List[str] = []
+    current = ""
+    for piece, separator in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """
+    In-process LRU cache of access tokens already resolved by the auth server.
+
+    Entries are keyed by the SHA-256 hash of the token (raw tokens are never
+    stored) and expire after ``max_ttl`` seconds or at the token's ``exp``,
+    whichever comes first, so a cached user never outlives its token.
+    """
+
+    def __init__(self, max_size: int = 1024, max_ttl: int = 300):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _token_key(access_token: str) -> str:
+        """Hash the access token so raw tokens are never used as cache keys."""
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _token_expiry(access_token: str) -> Optional[float]:
+        """Read the ``exp`` claim (epoch seconds) without verifying the token."""
+        try:
+            payload = jwt.decode(access_token, options={"verify_signature": False})
+            exp = payload.get("exp")
+            return float(exp) if exp is not None else None
+        except jwt.InvalidTokenError:
+            return None
+
+    def get(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached user for a token, if present and not expired.
+
+        Args:
+            access_token: Access token to look up
+
+        Returns:
+            Cached user data or None on a miss
+        """
+        key = self._token_key(access_token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def set(self, access_token: str, user: Dict[str, Any]) -> None:
+        """
+        Cache the user resolved for a token.
+
+        Tokens without a readable ``exp`` or that are already expired are not
+        cached.
+
+        Args:
+            access_token: Access token that was verified
+            user: User data resolved for the token
+        """
+        token_exp = self._token_expiry(access_token)
+        if token_exp is None:
+            return
+
+        expires_at = min(time.time() + self.max_ttl, token_exp)
+        if expires_at <= time.time():
+            return
+
+        key = self._token_key(access_token)
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Drop a token from the cache (e.g. on logout).
+
+        Args:
+            access_token: Access token to forget
+        """
+        key = self._token_key(access_token)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+# Create global cache instance
+verified_token_cache = VerifiedTokenCache(
+    max_size=settings.auth_token_cache_max_size,
+    max_ttl=settings.auth_token_cache_max_ttl,
+)
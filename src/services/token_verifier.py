@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+from jwt import PyJWKClient
+
+from src.core.config import settings
+from src.db.supabase_client import supabase
+from src.services.token_cache import VerifiedTokenCache, verified_token_cache
+
+logger = logging.getLogger(__name__)
+
+# Algorithms accepted for keys from the JWKS; the shared secret is HS256 only
+JWKS_ALGORITHMS = frozenset({"RS256", "ES256"})
+
+
+class TokenVerifier:
+    """
+    Local verification of Supabase access tokens.
+
+    Tokens signed with the legacy shared secret (HS256) are verified with the
+    project JWT secret. Tokens signed with asymmetric keys are verified against
+    the project's JWKS, which is fetched once and cached; an unknown key id
+    triggers a refetch (rate limited) so key rotation is picked up without
+    contacting the auth server on every request. The accepted algorithm is
+    fixed by the key, never taken from the token header.
+
+    Without a configured secret, HS256 tokens are resolved by the auth server
+    (``auth.get_user``) and cached until they expire, so they are not
+    rejected and refreshed on every request.
+    """
+
+    def __init__(
+        self,
+        supabase_url: str,
+        jwt_secret: Optional[str] = None,
+        audience: str = "authenticated",
+        jwks_cache_ttl: int = 600,
+        jwks_min_refresh_interval: int = 30,
+        leeway: int = 10,
+        auth_client: Optional[Any] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
+    ):
+        base_url = supabase_url.rstrip("/")
+        self.issuer = f"{base_url}/auth/v1"
+        self.jwks_url = f"{self.issuer}/.well-known/jwks.json"
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.jwks_cache_ttl = jwks_cache_ttl
+        self.jwks_min_refresh_interval = jwks_min_refresh_interval
+        self.leeway = leeway
+        self.auth_client = auth_client
+        self.token_cache = token_cache
+
+        self._jwk_client = PyJWKClient(self.jwks_url, cache_jwk_set=False)
+        # key id -> (public key, algorithm of the JWK)
+        self._signing_keys: Dict[str, Tuple[Any, str]] = {}
+        self._keys_fetched_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    async def _refresh_signing_keys(self, force: bool = False) -> None:
+        """
+        Fetch the JWKS and rebuild the key cache.
+
+        Args:
+            force: Refetch even if the cache is still fresh (unknown key id)
+        """
+        async with self._refresh_lock:
+            age = time.monotonic() - self._keys_fetched_at
+            if self._signing_keys and age < self.jwks_min_refresh_interval:
+                return
+            if not force and self._signing_keys and age < self.jwks_cache_ttl:
+                return
+
+            jwk_set = await asyncio.to_thread(self._jwk_client.get_jwk_set, True)
+            self._signing_keys = {
+                jwk.key_id: (jwk.key, jwk.algorithm_name)
+                for jwk in jwk_set.keys
+                if jwk.key_id and jwk.algorithm_name in JWKS_ALGORITHMS
+            }
+            self._keys_fetched_at = time.monotonic()
+            logger.info(f"Loaded {len(self._signing_keys)} JWKS signing keys")
+
+    async def _get_signing_key(self, key_id: Optional[str]) -> Tuple[Any, str]:
+        """
+        Return the cached public key and its algorithm for a key id,
+        refetching JWKS if needed.
+
+        Raises:
+            jwt.InvalidTokenError: If no matching key exists
+        """
+        if not key_id:
+            raise jwt.InvalidTokenError("Token header has no key id")
+
+        if time.monotonic() - self._keys_fetched_at >= self.jwks_cache_ttl:
+            await self._refresh_signing_keys()
+
+        if key_id not in self._signing_keys:
+            await self._refresh_signing_keys(force=True)
+
+        signing_key = self._signing_keys.get(key_id)
+        if signing_key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {key_id}")
+        return signing_key
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify an access token and return its claims.
+
+        Args:
+            token: Supabase access token (JWT)
+
+        Returns:
+            Verified token claims
+
+        Raises:
+            jwt.ExpiredSignatureError: If the token has expired
+            jwt.InvalidTokenError: If the token is malformed or the signature,
+                audience or issuer are invalid
+        """
+        header = jwt.get_unverified_header(token)
+
+        # The header only selects the key; the allowed algorithm comes from it
+        if header.get("alg") == "HS256":
+            if not self.jwt_secret:
+                return await self._verify_with_auth_server(token)
+            key, algorithm = self.jwt_secret, "HS256"
+        else:
+            key, algorithm = await self._get_signing_key(header.get("kid"))
+
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"require": ["exp", "sub"]},
+        )
+
+    async def _verify_with_auth_server(self, token: str) -> Dict[str, Any]:
+        """
+        Verify an HS256 token with the auth server when no secret is configured.
+
+        Only ``sub`` and ``email`` come from the auth server's answer; the
+        unverified payload is read just to reject expired tokens up front.
+
+        Raises:
+            jwt.ExpiredSignatureError: If the token has expired
+            jwt.InvalidTokenError: If the auth server does not accept the token
+        """
+        if self.auth_client is None:
+            raise jwt.InvalidTokenError(
+                "HS256 token received but SUPABASE_JWT_SECRET is not configured"
+            )
+
+        payload = jwt.decode(
+            token,
+            options={"verify_signature": False, "verify_exp": True, "require": ["exp"]},
+            leeway=self.leeway,
+        )
+
+        user = self.token_cache.get(token) if self.token_cache else None
+        if user is None:
+            try:
+                user_response = await asyncio.to_thread(
+                    self.auth_client.auth.get_user, token
+                )
+            except Exception as e:
+                raise jwt.InvalidTokenError(f"Auth server rejected token: {str(e)}")
+            if not user_response or not user_response.user:
+                raise jwt.InvalidTokenError("Auth server returned no user for token")
+
+            user = {"id": user_response.user.id, "email": user_response.user.email}
+            if self.token_cache:
+                self.token_cache.set(token, user)
+
+        return {"sub": user["id"], "email": user["email"], "exp": payload["exp"]}
+
+
+# Create global verifier instance
+token_verifier = TokenVerifier(
+    supabase_url=settings.supabase_url,
+    jwt_secret=settings.supabase_jwt_secret,
+    audience=settings.supabase_jwt_audience,
+    jwks_cache_ttl=settings.supabase_jwks_cache_ttl,
+    auth_client=supabase,
+    token_cache=verified_token_cache,
+)
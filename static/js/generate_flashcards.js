@@ -15,7 +15,7 @@ class GenerateFlashcardsController {
         
         // Configuration
         this.minLength = 1000;
-        this.maxLength = 10000;
+        this.maxLength = 100000;
         this.debounceTimeout = null;
         this.debounceDelay = 500; // ms
         
@@ -328,18 +328,8 @@ class GenerateFlashcardsController {
         this.showLoading();
         
         try {
-            const response = await this.makeAuthenticatedRequest('/api/v1/ai/generate-flashcards', {
-                method: 'POST',
-                body: JSON.stringify({
-                    text_content: textContent
-                })
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-            }
-            
-            const data = await response.json();
+            // Cards are shown as they stream in; data holds the stored result
+            const data = await this.streamGeneratedFlashcards(textContent);
             
             // Update state
             this.suggestions = data.suggested_flashcards || [];
@@ -389,6 +379,98 @@ class GenerateFlashcardsController {
         }
     }
     
+    /**
+     * Request a streamed generation and render cards as they arrive
+     */
+    async streamGeneratedFlashcards(textContent) {
+        const response = await this.makeAuthenticatedRequest('/api/v1/ai/generate-flashcards/stream', {
+            method: 'POST',
+            body: JSON.stringify({
+                text_content: textContent
+            })
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        
+        let result = null;
+        
+        // Browsers without streamed response bodies get all events at once
+        if (!response.body || !response.body.getReader) {
+            const lines = (await response.text()).split('\n');
+            lines.forEach(line => {
+                result = this.handleStreamEvent(line) || result;
+            });
+        } else {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                
+                // Keep the trailing partial line for the next chunk
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.forEach(line => {
+                    result = this.handleStreamEvent(line) || result;
+                });
+                
+                if (done) break;
+            }
+            
+            result = this.handleStreamEvent(buffer) || result;
+        }
+        
+        if (!result) {
+            throw new Error('Generation stream ended unexpectedly');
+        }
+        
+        return result;
+    }
+    
+    /**
+     * Handle one NDJSON stream event; returns the result of a complete event
+     */
+    handleStreamEvent(line) {
+        if (!line || !line.trim()) return null;
+        
+        const event = JSON.parse(line);
+        
+        if (event.type === 'card') {
+            this.renderStreamedCard(event.flashcard, event.index);
+        } else if (event.type === 'error') {
+            throw new Error(`HTTP ${event.status}: ${event.detail}`);
+        } else if (event.type === 'complete') {
+            return event.result;
+        }
+        
+        return null;
+    }
+    
+    /**
+     * Render a streamed card preview (actions are enabled once it is saved)
+     */
+    renderStreamedCard(flashcard, index) {
+        if (!this.flashcardSuggestionsList || !this.suggestionsSection) return;
+        
+        // Replace the skeleton cards with the first real card
+        if (index === 0) {
+            this.flashcardSuggestionsList.innerHTML = '';
+            this.suggestionsSection.classList.remove('hidden');
+        }
+        
+        const element = this.createSuggestionElement({ ...flashcard, id: `pending-${index}` }, index);
+        element.querySelectorAll('button').forEach(button => {
+            button.disabled = true;
+            button.classList.add('opacity-50', 'cursor-not-allowed');
+        });
+        element.classList.add('animate-fadeIn');
+        this.flashcardSuggestionsList.appendChild(element);
+    }
+    
     /**
      * Make authenticated API request with retry logic
      */
@@ -0,0 +1,19 @@
+-- supabase/migrations/20261017090000_due_flashcards_index.sql
+--
+-- migration name: due_flashcards_index
+-- description:   adds a composite (user_id, due_date) index on user_flashcard_spaced_repetition.
+--                the due-cards query filters by user_id and due_date <= now(), orders by
+--                due_date and applies a limit, so this index serves the filter, the sort
+--                and the limit in a single range scan.
+-- affected_tables: user_flashcard_spaced_repetition
+-- special_considerations: the single-column user_id index is a prefix of the new index
+--                         and is dropped to avoid maintaining a redundant index on writes.
+
+-- ---- 1. indexes ----
+
+-- composite index for fetching a user's due repetition records in due_date order.
+create index if not exists idx_user_flashcard_spaced_repetition_user_id_due_date
+on user_flashcard_spaced_repetition(user_id, due_date);
+
+-- the (user_id, due_date) index covers every lookup that used the user_id-only index.
+drop index if exists idx_user_flashcard_spaced_repetition_user_id;
@@ -0,0 +1,21 @@
+-- supabase/migrations/20261017090100_flashcards_keyset_index.sql
+--
+-- migration name: flashcards_keyset_index
+-- description:   adds a composite (user_id, status, created_at desc, id desc) index on flashcards.
+--                the flashcard list filters by user_id and status and pages in
+--                (created_at desc, id desc) order using a keyset cursor
+--                (created_at, id) < (:cursor_created_at, :cursor_id), so each page is a
+--                single index range scan regardless of how deep the cursor is.
+-- affected_tables: flashcards
+-- special_considerations: the single-column user_id index is a prefix of the new index
+--                         and is dropped to avoid maintaining a redundant index on writes.
+
+-- ---- 1. indexes ----
+
+-- composite index for listing a user's flashcards of a given status, newest first.
+-- id is included as a tie-breaker so the order is total and cursors are stable.
+create index if not exists idx_flashcards_user_id_status_created_at_id
+on flashcards(user_id, status, created_at desc, id desc);
+
+-- the new index covers every lookup that used the user_id-only index.
+drop index if exists idx_flashcards_user_id;
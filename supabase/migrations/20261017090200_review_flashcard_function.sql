@@ -0,0 +1,133 @@
+-- supabase/migrations/20261017090200_review_flashcard_function.sql
+--
+-- migration name: review_flashcard_function
+-- description:   adds sm2_next_interval(), the sql port of the interval update in
+--                SpacedRepetitionService._calculate_next_interval, and review_flashcard(),
+--                which validates the flashcard, reads the current repetition record,
+--                applies the update and upserts it in a single rpc call.
+-- affected_tables: flashcards (read), user_flashcard_spaced_repetition
+-- special_considerations: the python implementation stays the reference; any change to
+--                         the interval rules must be made in both places and is checked
+--                         by tests/integration/test_sm2_parity.py.
+--                         review_flashcard runs as security invoker, so rls still limits
+--                         every read and write to the calling user's rows.
+--                         validation failures raise p0001 with the same messages the
+--                         python service uses, so api error mapping is unchanged.
+
+-- ---- 1. interval calculation ----
+
+-- next interval in days for a 1-5 performance rating, capped at 365 days.
+-- multiplication is done in double precision and truncated to match python's int(x * f).
+create or replace function sm2_next_interval(current_interval integer, performance_rating integer)
+returns integer
+language sql
+immutable
+strict
+as $$
+  select least(
+    365,
+    case
+      when performance_rating <= 1 then 1
+      when performance_rating = 2 then greatest(1, trunc(current_interval * 0.6::double precision)::integer)
+      when performance_rating = 3 then greatest(1, trunc(current_interval * 1.3::double precision)::integer)
+      when performance_rating = 4 then greatest(1, trunc(current_interval * 2.0::double precision)::integer)
+      else greatest(1, trunc(current_interval * 2.5::double precision)::integer)
+    end
+  );
+$$;
+
+-- ---- 2. review submission ----
+
+-- validates and records a review, returning the updated repetition record.
+create or replace function review_flashcard(
+  p_user_id uuid,
+  p_flashcard_id uuid,
+  p_performance_rating integer
+)
+returns user_flashcard_spaced_repetition
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_rating integer := greatest(1, least(5, p_performance_rating));
+  v_flashcard_created_at timestamptz;
+  v_existing user_flashcard_spaced_repetition;
+  v_review_count integer;
+  v_new_interval integer;
+  v_result user_flashcard_spaced_repetition;
+begin
+  -- flashcard must exist, belong to the user and be active
+  select created_at
+  into v_flashcard_created_at
+  from flashcards
+  where id = p_flashcard_id
+    and user_id = p_user_id
+    and status = 'active';
+
+  if not found then
+    raise exception 'Flashcard not found, doesn''t belong to user, or is not active';
+  end if;
+
+  if now() - v_flashcard_created_at > interval '3650 days' then
+    raise exception 'Flashcard is too old for review';
+  end if;
+
+  -- lock the current record so concurrent reviews do not lose review_count updates
+  select *
+  into v_existing
+  from user_flashcard_spaced_repetition
+  where user_id = p_user_id
+    and flashcard_id = p_flashcard_id
+  for update;
+
+  if found then
+    v_review_count := coalesce((v_existing.data_extra ->> 'review_count')::integer, 0);
+
+    -- rate limiting: maximum 50 reviews per flashcard per day
+    if v_review_count > 50 and now() - v_existing.created_at < interval '24 hours' then
+      raise exception 'Too many reviews for this flashcard today. Please try again later.';
+    end if;
+
+    v_new_interval := sm2_next_interval(v_existing.current_interval, v_rating);
+    v_review_count := v_review_count + 1;
+  else
+    v_new_interval := sm2_next_interval(1, v_rating);
+    v_review_count := 1;
+  end if;
+
+  insert into user_flashcard_spaced_repetition (
+    user_id,
+    flashcard_id,
+    due_date,
+    current_interval,
+    last_reviewed_at,
+    data_extra
+  )
+  values (
+    p_user_id,
+    p_flashcard_id,
+    now() + make_interval(days => v_new_interval),
+    v_new_interval,
+    now(),
+    jsonb_build_object(
+      'last_performance_rating', v_rating,
+      'review_count', v_review_count,
+      'algorithm_version', 'sm2_v1'
+    )
+  )
+  on conflict (user_id, flashcard_id) do update
+  set due_date = excluded.due_date,
+      current_interval = excluded.current_interval,
+      last_reviewed_at = excluded.last_reviewed_at,
+      data_extra = excluded.data_extra
+  returning * into v_result;
+
+  return v_result;
+end;
+$$;
+
+-- ---- 3. permissions ----
+
+grant execute on function sm2_next_interval(integer, integer) to authenticated;
+grant execute on function review_flashcard(uuid, uuid, integer) to authenticated;
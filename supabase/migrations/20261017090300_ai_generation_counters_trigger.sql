@@ -0,0 +1,70 @@
+-- supabase/migrations/20261017090300_ai_generation_counters_trigger.sql
+--
+-- migration name: ai_generation_counters_trigger
+-- description:   maintains ai_generation_events.accepted_cards_count and rejected_cards_count
+--                in the database when ai_suggestion flashcards change status. the api used to
+--                read the event, add 1 in python and write it back, which cost two extra round
+--                trips per patch and lost updates when suggestions were reviewed concurrently.
+-- affected_tables: flashcards (trigger), ai_generation_events
+-- special_considerations: the trigger is statement level with transition tables, so a bulk
+--                         status update adjusts each event once with the summed deltas.
+--                         increments are applied as counter = counter + delta inside the
+--                         update, which postgres serialises on the row lock.
+--                         runs as security invoker: rls limits updates to the user's own events.
+
+-- ---- 1. trigger function ----
+
+-- applies accepted/rejected deltas for every ai_suggestion flashcard whose status changed.
+create or replace function trigger_update_ai_generation_counters()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public
+as $$
+begin
+  with status_changes as (
+    select
+      new_rows.user_id,
+      new_rows.source_text_id,
+      sum(
+        case
+          when new_rows.status = 'active' then 1
+          when old_rows.status = 'active' then -1
+          else 0
+        end
+      ) as accepted_delta,
+      sum(
+        case
+          when new_rows.status = 'rejected' then 1
+          when old_rows.status = 'rejected' then -1
+          else 0
+        end
+      ) as rejected_delta
+    from new_rows
+    join old_rows on old_rows.id = new_rows.id
+    where new_rows.source = 'ai_suggestion'
+      and new_rows.source_text_id is not null
+      and new_rows.status is distinct from old_rows.status
+    group by new_rows.user_id, new_rows.source_text_id
+  )
+  update ai_generation_events as events
+  set accepted_cards_count = greatest(0, events.accepted_cards_count + status_changes.accepted_delta),
+      rejected_cards_count = greatest(0, events.rejected_cards_count + status_changes.rejected_delta)
+  from status_changes
+  where events.source_text_id = status_changes.source_text_id
+    and events.user_id = status_changes.user_id
+    and (status_changes.accepted_delta <> 0 or status_changes.rejected_delta <> 0);
+
+  return null;
+end;
+$$;
+
+-- ---- 2. trigger ----
+
+-- transition tables cannot be combined with "update of status", so the function filters
+-- unchanged rows itself.
+create trigger update_ai_generation_counters
+after update on flashcards
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function trigger_update_ai_generation_counters();
@@ -0,0 +1,37 @@
+-- supabase/migrations/20261017090400_bulk_update_flashcard_status.sql
+--
+-- migration name: bulk_update_flashcard_status
+-- description:   adds bulk_update_flashcard_status(), which applies a list of per-flashcard
+--                status changes in a single update statement. used by
+--                post /api/v1/flashcards/bulk-status to accept or reject a whole ai
+--                generation at once instead of one patch call per card.
+-- affected_tables: flashcards, ai_generation_events (via update_ai_generation_counters)
+-- special_considerations: each change carries the status the api validated the transition
+--                         from; rows whose status changed in the meantime are skipped and
+--                         reported back as conflicts by the caller.
+--                         because all rows change in one statement, the statement-level
+--                         counters trigger adjusts each generation event once.
+--                         runs as security invoker, so rls limits updates to the user's rows.
+
+-- ---- 1. function ----
+
+-- p_changes: [{"id": uuid, "from_status": text, "to_status": text}, ...]
+-- returns the rows that were updated.
+create or replace function bulk_update_flashcard_status(p_user_id uuid, p_changes jsonb)
+returns setof flashcards
+language sql
+security invoker
+set search_path = public
+as $$
+  update flashcards
+  set status = changes.to_status::flashcard_status_enum
+  from jsonb_to_recordset(p_changes) as changes(id uuid, from_status text, to_status text)
+  where flashcards.id = changes.id
+    and flashcards.user_id = p_user_id
+    and flashcards.status = changes.from_status::flashcard_status_enum
+  returning flashcards.*;
+$$;
+
+-- ---- 2. permissions ----
+
+grant execute on function bulk_update_flashcard_status(uuid, jsonb) to authenticated;
@@ -0,0 +1,98 @@
+-- supabase/migrations/20261017090500_persist_ai_generation_function.sql
+--
+-- migration name: persist_ai_generation_function
+-- description:   adds persist_ai_generation(), which stores the result of an ai generation
+--                (source text, suggested flashcards, their spaced repetition records and the
+--                ai generation event) in one call. the api used to issue four separate
+--                inserts, so a failure midway left orphan source texts or flashcards.
+-- affected_tables: source_texts, flashcards, user_flashcard_spaced_repetition, ai_generation_events
+-- special_considerations: the function body runs in the transaction of the rpc request, so
+--                         either every row is written or none is.
+--                         runs as security invoker: rls insert policies still require
+--                         p_user_id to be the calling user.
+
+-- ---- 1. function ----
+
+-- p_suggestions: [{"front_content": text, "back_content": text}, ...]
+-- returns {"source_text_id": uuid, "ai_generation_event_id": uuid, "flashcards": [flashcard rows]}
+create or replace function persist_ai_generation(
+  p_user_id uuid,
+  p_text_content text,
+  p_suggestions jsonb,
+  p_llm_model_used text,
+  p_cost numeric default null
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_source_text_id uuid;
+  v_event_id uuid;
+  v_flashcards jsonb;
+begin
+  if p_suggestions is null or jsonb_array_length(p_suggestions) = 0 then
+    raise exception 'No flashcards to create';
+  end if;
+
+  insert into source_texts (user_id, text_content)
+  values (p_user_id, p_text_content)
+  returning id into v_source_text_id;
+
+  -- ids are generated up front so the returned flashcards keep the suggestion order
+  with suggestions as (
+    select
+      gen_random_uuid() as id,
+      suggestion ->> 'front_content' as front_content,
+      suggestion ->> 'back_content' as back_content,
+      position
+    from jsonb_array_elements(p_suggestions) with ordinality as items(suggestion, position)
+  ),
+  inserted_flashcards as (
+    insert into flashcards (id, user_id, source_text_id, front_content, back_content, source, status)
+    select id, p_user_id, v_source_text_id, front_content, back_content, 'ai_suggestion', 'active'
+    from suggestions
+    returning *
+  ),
+  inserted_repetitions as (
+    insert into user_flashcard_spaced_repetition (user_id, flashcard_id, due_date, current_interval)
+    select p_user_id, id, now(), 1
+    from inserted_flashcards
+  )
+  select jsonb_agg(to_jsonb(inserted_flashcards) order by suggestions.position)
+  into v_flashcards
+  from inserted_flashcards
+  join suggestions on suggestions.id = inserted_flashcards.id;
+
+  insert into ai_generation_events (
+    user_id,
+    source_text_id,
+    llm_model_used,
+    generated_cards_count,
+    accepted_cards_count,
+    rejected_cards_count,
+    cost
+  )
+  values (
+    p_user_id,
+    v_source_text_id,
+    p_llm_model_used,
+    jsonb_array_length(p_suggestions),
+    0,
+    0,
+    p_cost
+  )
+  returning id into v_event_id;
+
+  return jsonb_build_object(
+    'source_text_id', v_source_text_id,
+    'ai_generation_event_id', v_event_id,
+    'flashcards', v_flashcards
+  );
+end;
+$$;
+
+-- ---- 2. permissions ----
+
+grant execute on function persist_ai_generation(uuid, text, jsonb, text, numeric) to authenticated;
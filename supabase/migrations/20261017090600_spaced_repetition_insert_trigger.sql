@@ -0,0 +1,149 @@
+-- supabase/migrations/20261017090600_spaced_repetition_insert_trigger.sql
+--
+-- migration name: spaced_repetition_insert_trigger
+-- description:   creates the user_flashcard_spaced_repetition row (due now, interval 1) for
+--                every new flashcard in an after insert trigger, so the api no longer needs a
+--                second insert per created flashcard. also adds
+--                backfill_spaced_repetition_records() for flashcards created before this
+--                migration that never got a repetition row.
+-- affected_tables: flashcards (trigger), user_flashcard_spaced_repetition
+-- special_considerations: the trigger is statement level, so a bulk flashcard insert creates
+--                         all repetition rows with one insert. conflicts are ignored, which
+--                         keeps the legacy api path (explicit insert) working.
+--                         persist_ai_generation() is redefined without its repetition insert.
+--                         the backfill is granted to service_role only and works in batches
+--                         (see scripts/backfill_spaced_repetition.py).
+
+-- ---- 1. trigger ----
+
+-- creates a repetition record, due immediately, for every inserted flashcard.
+create or replace function trigger_create_spaced_repetition_records()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public
+as $$
+begin
+  insert into user_flashcard_spaced_repetition (user_id, flashcard_id, due_date, current_interval)
+  select new_rows.user_id, new_rows.id, now(), 1
+  from new_rows
+  on conflict (user_id, flashcard_id) do nothing;
+
+  return null;
+end;
+$$;
+
+create trigger create_spaced_repetition_records
+after insert on flashcards
+referencing new table as new_rows
+for each statement
+execute function trigger_create_spaced_repetition_records();
+
+-- ---- 2. persist_ai_generation without the explicit repetition insert ----
+
+create or replace function persist_ai_generation(
+  p_user_id uuid,
+  p_text_content text,
+  p_suggestions jsonb,
+  p_llm_model_used text,
+  p_cost numeric default null
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_source_text_id uuid;
+  v_event_id uuid;
+  v_flashcards jsonb;
+begin
+  if p_suggestions is null or jsonb_array_length(p_suggestions) = 0 then
+    raise exception 'No flashcards to create';
+  end if;
+
+  insert into source_texts (user_id, text_content)
+  values (p_user_id, p_text_content)
+  returning id into v_source_text_id;
+
+  -- ids are generated up front so the returned flashcards keep the suggestion order;
+  -- repetition records are created by the create_spaced_repetition_records trigger
+  with suggestions as (
+    select
+      gen_random_uuid() as id,
+      suggestion ->> 'front_content' as front_content,
+      suggestion ->> 'back_content' as back_content,
+      position
+    from jsonb_array_elements(p_suggestions) with ordinality as items(suggestion, position)
+  ),
+  inserted_flashcards as (
+    insert into flashcards (id, user_id, source_text_id, front_content, back_content, source, status)
+    select id, p_user_id, v_source_text_id, front_content, back_content, 'ai_suggestion', 'active'
+    from suggestions
+    returning *
+  )
+  select jsonb_agg(to_jsonb(inserted_flashcards) order by suggestions.position)
+  into v_flashcards
+  from inserted_flashcards
+  join suggestions on suggestions.id = inserted_flashcards.id;
+
+  insert into ai_generation_events (
+    user_id,
+    source_text_id,
+    llm_model_used,
+    generated_cards_count,
+    accepted_cards_count,
+    rejected_cards_count,
+    cost
+  )
+  values (
+    p_user_id,
+    v_source_text_id,
+    p_llm_model_used,
+    jsonb_array_length(p_suggestions),
+    0,
+    0,
+    p_cost
+  )
+  returning id into v_event_id;
+
+  return jsonb_build_object(
+    'source_text_id', v_source_text_id,
+    'ai_generation_event_id', v_event_id,
+    'flashcards', v_flashcards
+  );
+end;
+$$;
+
+-- ---- 3. backfill ----
+
+-- creates missing repetition records for up to p_batch_size flashcards and returns how many
+-- were created; call repeatedly until it returns 0.
+create or replace function backfill_spaced_repetition_records(p_batch_size integer default 1000)
+returns integer
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_created integer;
+begin
+  insert into user_flashcard_spaced_repetition (user_id, flashcard_id, due_date, current_interval)
+  select flashcards.user_id, flashcards.id, now(), 1
+  from flashcards
+  where not exists (
+    select 1
+    from user_flashcard_spaced_repetition
+    where user_flashcard_spaced_repetition.flashcard_id = flashcards.id
+      and user_flashcard_spaced_repetition.user_id = flashcards.user_id
+  )
+  limit p_batch_size
+  on conflict (user_id, flashcard_id) do nothing;
+
+  get diagnostics v_created = row_count;
+  return v_created;
+end;
+$$;
+
+revoke execute on function backfill_spaced_repetition_records(integer) from public, anon, authenticated;
+grant execute on function backfill_spaced_repetition_records(integer) to service_role;
@@ -0,0 +1,255 @@
+-- supabase/migrations/20261017090700_user_stats.sql
+--
+-- migration name: user_stats
+-- description:   adds user_stats, one row per user with the dashboard totals (active
+--                flashcards, ai generated and accepted cards), kept current by statement
+--                level triggers on flashcards and ai_generation_events. the dashboard reads
+--                it through get_dashboard_stats(), one rpc call instead of two exact counts
+--                and a download of every ai generation event.
+--                reconcile_user_stats() recomputes rows from the source tables.
+-- affected_tables: user_stats (new), flashcards (triggers), ai_generation_events (triggers)
+-- special_considerations: the number of due cards depends on the current time, so it is not
+--                         stored; get_dashboard_stats() counts it with the
+--                         (user_id, due_date) index in the same call.
+--                         trigger functions are security definer because users can only
+--                         read their own user_stats row. delete triggers only update existing
+--                         rows, so cascading user deletion never re-inserts a row.
+--                         reconcile_user_stats() is granted to service_role only
+--                         (see scripts/reconcile_user_stats.py).
+
+-- ---- 1. table ----
+
+create table if not exists user_stats (
+    user_id uuid primary key references auth.users(id) on delete cascade,
+    active_flashcards integer not null default 0,
+    total_generated integer not null default 0,
+    total_accepted integer not null default 0,
+    updated_at timestamptz not null default now()
+);
+
+alter table user_stats enable row level security;
+
+-- policy for select: authenticated user can only see their own stats.
+create policy "allow authenticated user to see their own user_stats"
+on user_stats for select
+to authenticated
+using (auth.uid() = user_id);
+
+-- ---- 2. flashcards triggers ----
+
+-- adjusts active_flashcards by the number of rows entering/leaving the 'active' status.
+create or replace function trigger_user_stats_flashcards()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op = 'INSERT' then
+    insert into user_stats (user_id, active_flashcards)
+    select user_id, count(*)
+    from new_rows
+    where status = 'active'
+    group by user_id
+    on conflict (user_id) do update
+    set active_flashcards = user_stats.active_flashcards + excluded.active_flashcards,
+        updated_at = now();
+  elsif tg_op = 'UPDATE' then
+    insert into user_stats (user_id, active_flashcards)
+    select user_id, sum(delta)
+    from (
+      select user_id, 1 as delta from new_rows where status = 'active'
+      union all
+      select user_id, -1 as delta from old_rows where status = 'active'
+    ) as changes
+    group by user_id
+    having sum(delta) <> 0
+    on conflict (user_id) do update
+    set active_flashcards = greatest(0, user_stats.active_flashcards + excluded.active_flashcards),
+        updated_at = now();
+  else
+    update user_stats
+    set active_flashcards = greatest(0, user_stats.active_flashcards - removed.active_flashcards),
+        updated_at = now()
+    from (
+      select user_id, count(*) as active_flashcards
+      from old_rows
+      where status = 'active'
+      group by user_id
+    ) as removed
+    where user_stats.user_id = removed.user_id;
+  end if;
+
+  return null;
+end;
+$$;
+
+create trigger user_stats_flashcards_insert
+after insert on flashcards
+referencing new table as new_rows
+for each statement
+execute function trigger_user_stats_flashcards();
+
+create trigger user_stats_flashcards_update
+after update on flashcards
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function trigger_user_stats_flashcards();
+
+create trigger user_stats_flashcards_delete
+after delete on flashcards
+referencing old table as old_rows
+for each statement
+execute function trigger_user_stats_flashcards();
+
+-- ---- 3. ai_generation_events triggers ----
+
+-- adjusts total_generated / total_accepted by the change in the event counters.
+create or replace function trigger_user_stats_ai_generation_events()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op = 'INSERT' then
+    insert into user_stats (user_id, total_generated, total_accepted)
+    select user_id, sum(generated_cards_count), sum(accepted_cards_count)
+    from new_rows
+    group by user_id
+    on conflict (user_id) do update
+    set total_generated = user_stats.total_generated + excluded.total_generated,
+        total_accepted = user_stats.total_accepted + excluded.total_accepted,
+        updated_at = now();
+  elsif tg_op = 'UPDATE' then
+    insert into user_stats (user_id, total_generated, total_accepted)
+    select user_id, sum(generated_delta), sum(accepted_delta)
+    from (
+      select user_id, generated_cards_count as generated_delta, accepted_cards_count as accepted_delta
+      from new_rows
+      union all
+      select user_id, -generated_cards_count, -accepted_cards_count
+      from old_rows
+    ) as changes
+    group by user_id
+    having sum(generated_delta) <> 0 or sum(accepted_delta) <> 0
+    on conflict (user_id) do update
+    set total_generated = greatest(0, user_stats.total_generated + excluded.total_generated),
+        total_accepted = greatest(0, user_stats.total_accepted + excluded.total_accepted),
+        updated_at = now();
+  else
+    update user_stats
+    set total_generated = greatest(0, user_stats.total_generated - removed.total_generated),
+        total_accepted = greatest(0, user_stats.total_accepted - removed.total_accepted),
+        updated_at = now()
+    from (
+      select user_id, sum(generated_cards_count) as total_generated, sum(accepted_cards_count) as total_accepted
+      from old_rows
+      group by user_id
+    ) as removed
+    where user_stats.user_id = removed.user_id;
+  end if;
+
+  return null;
+end;
+$$;
+
+create trigger user_stats_ai_generation_events_insert
+after insert on ai_generation_events
+referencing new table as new_rows
+for each statement
+execute function trigger_user_stats_ai_generation_events();
+
+create trigger user_stats_ai_generation_events_update
+after update on ai_generation_events
+referencing old table as old_rows new table as new_rows
+for each statement
+execute function trigger_user_stats_ai_generation_events();
+
+create trigger user_stats_ai_generation_events_delete
+after delete on ai_generation_events
+referencing old table as old_rows
+for each statement
+execute function trigger_user_stats_ai_generation_events();
+
+-- ---- 4. reconciliation ----
+
+-- recomputes user_stats from the source tables for one user (or every user when null) and
+-- returns the number of rows written.
+create or replace function reconcile_user_stats(p_user_id uuid default null)
+returns integer
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_reconciled integer;
+begin
+  insert into user_stats (user_id, active_flashcards, total_generated, total_accepted, updated_at)
+  select
+    users.id,
+    (
+      select count(*)
+      from flashcards
+      where flashcards.user_id = users.id
+        and flashcards.status = 'active'
+    ),
+    coalesce(events.total_generated, 0),
+    coalesce(events.total_accepted, 0),
+    now()
+  from auth.users as users
+  left join lateral (
+    select
+      sum(generated_cards_count) as total_generated,
+      sum(accepted_cards_count) as total_accepted
+    from ai_generation_events
+    where ai_generation_events.user_id = users.id
+  ) as events on true
+  where p_user_id is null or users.id = p_user_id
+  on conflict (user_id) do update
+  set active_flashcards = excluded.active_flashcards,
+      total_generated = excluded.total_generated,
+      total_accepted = excluded.total_accepted,
+      updated_at = excluded.updated_at;
+
+  get diagnostics v_reconciled = row_count;
+  return v_reconciled;
+end;
+$$;
+
+revoke execute on function reconcile_user_stats(uuid) from public, anon, authenticated;
+grant execute on function reconcile_user_stats(uuid) to service_role;
+
+-- initial population for existing users
+select reconcile_user_stats();
+
+-- ---- 5. dashboard read ----
+
+-- returns the dashboard totals for a user in one call; users without a row get zeros.
+create or replace function get_dashboard_stats(p_user_id uuid)
+returns table (
+  total_flashcards integer,
+  due_cards_today integer,
+  total_generated integer,
+  total_accepted integer
+)
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+  select
+    coalesce(stats.active_flashcards, 0),
+    (
+      select count(*)::integer
+      from user_flashcard_spaced_repetition
+      where user_flashcard_spaced_repetition.user_id = p_user_id
+        and user_flashcard_spaced_repetition.due_date <= now()
+    ),
+    coalesce(stats.total_generated, 0),
+    coalesce(stats.total_accepted, 0)
+  from (select p_user_id as user_id) as requested
+  left join user_stats as stats on stats.user_id = requested.user_id;
+$$;
+
+grant execute on function get_dashboard_stats(uuid) to authenticated;
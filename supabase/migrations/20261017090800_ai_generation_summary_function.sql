@@ -0,0 +1,78 @@
+-- supabase/migrations/20261017090800_ai_generation_summary_function.sql
+--
+-- migration name: ai_generation_summary_function
+-- description:   adds ai_generation_summary(), which aggregates a user's ai generation
+--                events in the database: overall totals plus per-model and per-month
+--                breakdowns, optionally limited to a created_at range. replaces downloading
+--                every event and summing the counters in python.
+-- affected_tables: ai_generation_events (read only)
+-- special_considerations: all three groupings come from a single scan using grouping sets.
+--                         the range is half open: p_from <= created_at < p_to; null bounds are
+--                         ignored. months are reported as 'yyyy-mm' in utc.
+--                         runs as security invoker, so rls limits it to the user's events.
+
+-- ---- 1. function ----
+
+-- returns {"totals": {...}, "by_model": [{"model": text, ...}], "by_month": [{"month": text, ...}]}
+-- where every entry carries events, generated, accepted, rejected and cost.
+create or replace function ai_generation_summary(
+  p_user_id uuid,
+  p_from timestamptz default null,
+  p_to timestamptz default null
+)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+  with grouped as (
+    select
+      grouping(llm_model_used) as model_grouped,
+      grouping(date_trunc('month', created_at at time zone 'utc')) as month_grouped,
+      llm_model_used as model,
+      to_char(date_trunc('month', created_at at time zone 'utc'), 'YYYY-MM') as month,
+      jsonb_build_object(
+        'events', count(*),
+        'generated', coalesce(sum(generated_cards_count), 0),
+        'accepted', coalesce(sum(accepted_cards_count), 0),
+        'rejected', coalesce(sum(rejected_cards_count), 0),
+        'cost', coalesce(sum(cost), 0)
+      ) as stats
+    from ai_generation_events
+    where user_id = p_user_id
+      and (p_from is null or created_at >= p_from)
+      and (p_to is null or created_at < p_to)
+    group by grouping sets (
+      (),
+      (llm_model_used),
+      (date_trunc('month', created_at at time zone 'utc'))
+    )
+  )
+  select jsonb_build_object(
+    'totals', coalesce(
+      (select stats from grouped where model_grouped = 1 and month_grouped = 1),
+      jsonb_build_object('events', 0, 'generated', 0, 'accepted', 0, 'rejected', 0, 'cost', 0)
+    ),
+    'by_model', coalesce(
+      (
+        select jsonb_agg(jsonb_build_object('model', model) || stats order by model nulls last)
+        from grouped
+        where model_grouped = 0
+      ),
+      '[]'::jsonb
+    ),
+    'by_month', coalesce(
+      (
+        select jsonb_agg(jsonb_build_object('month', month) || stats order by month)
+        from grouped
+        where month_grouped = 0
+      ),
+      '[]'::jsonb
+    )
+  );
+$$;
+
+-- ---- 2. permissions ----
+
+grant execute on function ai_generation_summary(uuid, timestamptz, timestamptz) to authenticated;
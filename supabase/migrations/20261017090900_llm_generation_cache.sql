@@ -0,0 +1,188 @@
+-- supabase/migrations/20261017090900_llm_generation_cache.sql
+--
+-- migration name: llm_generation_cache
+-- description:   adds llm_generation_cache, the persistent tier of the api's llm generation
+--                cache. rows are keyed by a sha-256 of the normalized source text, model,
+--                prompt version and sampling parameters and hold the parsed llm response.
+--                also adds ai_generation_events.cache_hit and lets persist_ai_generation()
+--                record it.
+-- affected_tables: llm_generation_cache (new), ai_generation_events
+-- special_considerations: the cache is content addressed and shared between users, so the
+--                         table has rls enabled without policies. it is read and written
+--                         only through the security definer functions below; a hit needs
+--                         the exact key, i.e. the caller already has the same text.
+--                         expired rows are ignored on read and removed by
+--                         purge_llm_generation_cache() (service_role only).
+--                         persist_ai_generation() gains a p_cache_hit parameter; the old
+--                         signature is dropped so the rpc call stays unambiguous.
+
+-- ---- 1. table ----
+
+create table if not exists llm_generation_cache (
+    cache_key text primary key,
+    llm_model_used text not null,
+    prompt_version text not null,
+    response jsonb not null,
+    created_at timestamptz not null default now(),
+    expires_at timestamptz not null
+);
+
+create index if not exists idx_llm_generation_cache_expires_at
+on llm_generation_cache (expires_at);
+
+alter table llm_generation_cache enable row level security;
+
+-- ---- 2. access functions ----
+
+-- returns the cached response for a key, or null when missing or expired.
+create or replace function get_llm_generation_cache(p_cache_key text)
+returns jsonb
+language sql
+stable
+security definer
+set search_path = public
+as $$
+  select response
+  from llm_generation_cache
+  where cache_key = p_cache_key
+    and expires_at > now();
+$$;
+
+-- stores (or replaces) the response for a key for p_ttl_seconds.
+create or replace function put_llm_generation_cache(
+  p_cache_key text,
+  p_llm_model_used text,
+  p_prompt_version text,
+  p_response jsonb,
+  p_ttl_seconds integer
+)
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  insert into llm_generation_cache (cache_key, llm_model_used, prompt_version, response, created_at, expires_at)
+  values (
+    p_cache_key,
+    p_llm_model_used,
+    p_prompt_version,
+    p_response,
+    now(),
+    now() + make_interval(secs => p_ttl_seconds)
+  )
+  on conflict (cache_key) do update
+  set llm_model_used = excluded.llm_model_used,
+      prompt_version = excluded.prompt_version,
+      response = excluded.response,
+      created_at = excluded.created_at,
+      expires_at = excluded.expires_at;
+$$;
+
+-- deletes expired rows and returns how many were removed.
+create or replace function purge_llm_generation_cache()
+returns integer
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_purged integer;
+begin
+  delete from llm_generation_cache where expires_at <= now();
+  get diagnostics v_purged = row_count;
+  return v_purged;
+end;
+$$;
+
+revoke execute on function get_llm_generation_cache(text) from public, anon;
+revoke execute on function put_llm_generation_cache(text, text, text, jsonb, integer) from public, anon;
+grant execute on function get_llm_generation_cache(text) to authenticated;
+grant execute on function put_llm_generation_cache(text, text, text, jsonb, integer) to authenticated;
+revoke execute on function purge_llm_generation_cache() from public, anon, authenticated;
+grant execute on function purge_llm_generation_cache() to service_role;
+
+-- ---- 3. cache hits on generation events ----
+
+alter table ai_generation_events
+add column if not exists cache_hit boolean not null default false;
+
+drop function if exists persist_ai_generation(uuid, text, jsonb, text, numeric);
+
+create or replace function persist_ai_generation(
+  p_user_id uuid,
+  p_text_content text,
+  p_suggestions jsonb,
+  p_llm_model_used text,
+  p_cost numeric default null,
+  p_cache_hit boolean default false
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+  v_source_text_id uuid;
+  v_event_id uuid;
+  v_flashcards jsonb;
+begin
+  if p_suggestions is null or jsonb_array_length(p_suggestions) = 0 then
+    raise exception 'No flashcards to create';
+  end if;
+
+  insert into source_texts (user_id, text_content)
+  values (p_user_id, p_text_content)
+  returning id into v_source_text_id;
+
+  -- ids are generated up front so the returned flashcards keep the suggestion order;
+  -- repetition records are created by the create_spaced_repetition_records trigger
+  with suggestions as (
+    select
+      gen_random_uuid() as id,
+      suggestion ->> 'front_content' as front_content,
+      suggestion ->> 'back_content' as back_content,
+      position
+    from jsonb_array_elements(p_suggestions) with ordinality as items(suggestion, position)
+  ),
+  inserted_flashcards as (
+    insert into flashcards (id, user_id, source_text_id, front_content, back_content, source, status)
+    select id, p_user_id, v_source_text_id, front_content, back_content, 'ai_suggestion', 'active'
+    from suggestions
+    returning *
+  )
+  select jsonb_agg(to_jsonb(inserted_flashcards) order by suggestions.position)
+  into v_flashcards
+  from inserted_flashcards
+  join suggestions on suggestions.id = inserted_flashcards.id;
+
+  insert into ai_generation_events (
+    user_id,
+    source_text_id,
+    llm_model_used,
+    generated_cards_count,
+    accepted_cards_count,
+    rejected_cards_count,
+    cost,
+    cache_hit
+  )
+  values (
+    p_user_id,
+    v_source_text_id,
+    p_llm_model_used,
+    jsonb_array_length(p_suggestions),
+    0,
+    0,
+    p_cost,
+    p_cache_hit
+  )
+  returning id into v_event_id;
+
+  return jsonb_build_object(
+    'source_text_id', v_source_text_id,
+    'ai_generation_event_id', v_event_id,
+    'flashcards', v_flashcards
+  );
+end;
+$$;
+
+grant execute on function persist_ai_generation(uuid, text, jsonb, text, numeric, boolean) to authenticated;
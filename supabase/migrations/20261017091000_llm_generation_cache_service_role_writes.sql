@@ -0,0 +1,15 @@
+-- supabase/migrations/20261017091000_llm_generation_cache_service_role_writes.sql
+--
+-- migration name: llm_generation_cache_service_role_writes
+-- description:   restricts put_llm_generation_cache() to the service_role. the cache is
+--                shared between users and the function is security definer, so granting
+--                it to authenticated let any user store an arbitrary response under any
+--                key and serve it to everyone submitting that text.
+-- affected_tables: llm_generation_cache (write access only)
+-- special_considerations: the api writes cache rows with a service_role client
+--                         (SUPABASE_SERVICE_KEY); without it only the in-process tier is
+--                         filled. reads through get_llm_generation_cache() stay granted
+--                         to authenticated.
+
+revoke execute on function put_llm_generation_cache(text, text, text, jsonb, integer) from authenticated;
+grant execute on function put_llm_generation_cache(text, text, text, jsonb, integer) to service_role;
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from src.services.spaced_repetition_service import SpacedRepetitionService
+
+# Runs against a database with the migrations applied (e.g. `supabase start`)
+psycopg = pytest.importorskip("psycopg")
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="DATABASE_URL is required for SQL parity tests"
+)
+
+RATINGS = range(1, 6)
+INTERVALS = list(range(1, 400))
+
+
+class TestSm2NextIntervalParity:
+    """Check sm2_next_interval() against SpacedRepetitionService._calculate_next_interval."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = SpacedRepetitionService(supabase_client=None)
+
+    def _sql_intervals(self) -> dict:
+        """Compute every (interval, rating) pair with the database function."""
+        with psycopg.connect(DATABASE_URL) as conn:
+            rows = conn.execute(
+                "select i, r, sm2_next_interval(i, r) "
+                "from unnest(%s::integer[]) as i, unnest(%s::integer[]) as r",
+                (INTERVALS, list(RATINGS)),
+            ).fetchall()
+        return {(i, r): interval for i, r, interval in rows}
+
+    def test_intervals_match_reference(self):
+        """Test that SQL and Python agree on every interval and rating."""
+        sql_intervals = self._sql_intervals()
+
+        mismatches = []
+        for interval in INTERVALS:
+            for rating in RATINGS:
+                expected, _ = self.service._calculate_next_interval(interval, rating)
+                if sql_intervals[(interval, rating)] != expected:
+                    mismatches.append((interval, rating))
+
+        assert mismatches == []
+
+    def test_interval_capped_at_one_year(self):
+        """Test that both implementations cap the interval at 365 days."""
+        with psycopg.connect(DATABASE_URL) as conn:
+            (sql_interval,) = conn.execute(
+                "select sm2_next_interval(300, 5)"
+            ).fetchone()
+
+        assert sql_interval == 365
+        assert self.service._calculate_next_interval(300, 5)[0] == 365
@@ -1,10 +1,12 @@
 import uuid
-from datetime import datetime
-from unittest.mock import MagicMock, Mock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
+from postgrest.exceptions import APIError
 
 from src.api.v1.schemas.ai_schemas import PaginatedAiGenerationStatsResponse
+from src.api.v1.schemas.flashcard_schemas import CountStrategyEnum
 from src.db.schemas import AiGenerationEvent
 from src.services.ai_generation_service import (
     AiGenerationService,
@@ -53,26 +55,17 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        # Mock count response
-        mock_count_response = Mock()
-        mock_count_response.count = 2
-
         # Mock data response
         mock_data_response = Mock()
+        mock_data_response.count = 2
         mock_data_response.data = self.sample_events
 
-        # Setup method chaining for count query
+        # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
 
-        # First call: count query
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-
-        # Second call: data query
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -94,20 +87,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 2, 5
 
-        mock_count_response = Mock()
-        mock_count_response.count = 12  # Total of 12 events
-
         mock_data_response = Mock()
+        mock_data_response.count = 12  # Total of 12 events
         mock_data_response.data = []  # Empty page 2 result
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -120,26 +108,50 @@ class TestAiGenerationServiceGetUserGenerationStats:
         assert result.pages == 3  # ceil(12/5) = 3
         assert len(result.items) == 0
 
+    @pytest.mark.asyncio
+    async def test_get_user_generation_stats_page_past_end(self):
+        """Test that a page past the last row is empty and still counted."""
+        # Arrange
+        page, size = 5, 5
+
+        mock_table = Mock()
+        self.mock_supabase.table.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            side_effect=APIError(
+                {"code": "PGRST103", "message": "Requested range not satisfiable"}
+            )
+        )
+        mock_count_response = Mock()
+        mock_count_response.count = 12
+        mock_table.select.return_value.eq.return_value.execute = AsyncMock(
+            return_value=mock_count_response
+        )
+
+        # Act
+        result = await self.service.get_user_generation_stats(self.user_id, page, size)
+
+        # Assert
+        assert result.items == []
+        assert result.has_more is False
+        assert result.total == 12
+        assert result.pages == 3
+        mock_table.select.assert_called_with("id", count="exact", head=True)
+
     @pytest.mark.asyncio
     async def test_get_user_generation_stats_empty_result(self):
         """Test handling empty AI generation stats result."""
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = 0
-
         mock_data_response = Mock()
+        mock_data_response.count = 0
         mock_data_response.data = []
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -158,20 +170,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = None  # Supabase sometimes returns None
-
         mock_data_response = Mock()
+        mock_data_response.count = None  # Supabase sometimes returns None
         mock_data_response.data = []
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -187,25 +194,20 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 3, 10
         expected_offset = (page - 1) * size  # 20
-        expected_end = expected_offset + size - 1  # 29
-
-        mock_count_response = Mock()
-        mock_count_response.count = 50
+        expected_end = expected_offset + size  # 30 (one extra row for has_more)
 
         mock_data_response = Mock()
+        mock_data_response.count = 50
         mock_data_response.data = []
 
         # Setup method chaining with verification
         mock_table = Mock()
         mock_range = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
         mock_table.select.return_value.eq.return_value.order.return_value.range.return_value = (
             mock_range
         )
-        mock_range.execute.return_value = mock_data_response
+        mock_range.execute = AsyncMock(return_value=mock_data_response)
 
         # Act
         await self.service.get_user_generation_stats(self.user_id, page, size)
@@ -215,16 +217,42 @@ class TestAiGenerationServiceGetUserGenerationStats:
             expected_offset, expected_end
         )
 
+    @pytest.mark.asyncio
+    async def test_get_user_generation_stats_without_count(self):
+        """Test that count=none skips the total and reports has_more."""
+        # Arrange
+        page, size = 1, 1
+
+        mock_data_response = Mock()
+        mock_data_response.count = None
+        mock_data_response.data = self.sample_events
+
+        mock_table = Mock()
+        self.mock_supabase.table.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
+        )
+
+        # Act
+        result = await self.service.get_user_generation_stats(
+            self.user_id, page, size, count=CountStrategyEnum.NONE
+        )
+
+        # Assert
+        assert result.total is None
+        assert result.pages is None
+        assert result.has_more is True
+        assert len(result.items) == 1
+        mock_table.select.assert_called_once_with("*", count=None)
+
     @pytest.mark.asyncio
     async def test_get_user_generation_stats_user_id_conversion(self):
         """Test that user_id is properly converted to string for Supabase."""
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = 0
-
         mock_data_response = Mock()
+        mock_data_response.count = 0
         mock_data_response.data = []
 
         # Setup method chaining with verification
@@ -232,9 +260,8 @@ class TestAiGenerationServiceGetUserGenerationStats:
         mock_eq = Mock()
         self.mock_supabase.table.return_value = mock_table
         mock_table.select.return_value.eq.return_value = mock_eq
-        mock_eq.execute.return_value = mock_count_response
-        mock_eq.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_eq.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -251,20 +278,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = 1
-
         mock_data_response = Mock()
+        mock_data_response.count = 1
         mock_data_response.data = [self.sample_events[0]]
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -282,11 +304,11 @@ class TestAiGenerationServiceGetUserGenerationStats:
 
     @pytest.mark.asyncio
     async def test_get_user_generation_stats_count_query_error(self):
-        """Test handling count query database error."""
+        """Test handling database error when building the query."""
         # Arrange
         page, size = 1, 20
 
-        # Mock database error on count query
+        # Mock database error
         self.mock_supabase.table.side_effect = Exception("Database connection error")
 
         # Act & Assert
@@ -303,21 +325,14 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        # Mock successful count but failed data query
-        mock_count_response = Mock()
-        mock_count_response.count = 5
+        # Mock failed data query (count is part of the same request)
 
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
 
-        # Count query succeeds
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-
         # Data query fails
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.side_effect = Exception(
-            "Query timeout"
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            side_effect=Exception("Query timeout")
         )
 
         # Act & Assert
@@ -348,20 +363,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
             "updated_at": "2024-01-01T00:00:00.000Z",
         }
 
-        mock_count_response = Mock()
-        mock_count_response.count = 1
-
         mock_data_response = Mock()
+        mock_data_response.count = 1
         mock_data_response.data = [invalid_event]
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act & Assert
@@ -377,20 +387,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = 0
-
         mock_data_response = Mock()
+        mock_data_response.count = 0
         mock_data_response.data = []
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -405,20 +410,15 @@ class TestAiGenerationServiceGetUserGenerationStats:
         # Arrange
         page, size = 1, 20
 
-        mock_count_response = Mock()
-        mock_count_response.count = 0
-
         mock_data_response = Mock()
+        mock_data_response.count = 0
         mock_data_response.data = []
 
         # Setup method chaining
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
-        mock_table.select.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
-        )
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            mock_data_response
+        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=mock_data_response
         )
 
         # Act
@@ -434,6 +434,114 @@ class TestAiGenerationServiceGetUserGenerationStats:
         )
 
 
+class TestAiGenerationServiceGetUserGenerationSummary:
+    """Test suite for AiGenerationService.get_user_generation_summary method."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = AiGenerationService(self.mock_supabase)
+        self.user_id = uuid.uuid4()
+
+    @pytest.mark.asyncio
+    async def test_summary_aggregated_by_rpc(self):
+        """Test that totals and breakdowns come from one ai_generation_summary call."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = {
+            "totals": {
+                "events": 3,
+                "generated": 25,
+                "accepted": 18,
+                "rejected": 4,
+                "cost": 0.0045,
+            },
+            "by_model": [
+                {"model": "gpt-4", "events": 2, "generated": 20, "accepted": 15},
+                {"model": None, "events": 1, "generated": 5, "accepted": 3},
+            ],
+            "by_month": [
+                {"month": "2024-01", "events": 3, "generated": 25, "accepted": 18}
+            ],
+        }
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+        date_from = datetime(2024, 1, 1)
+
+        # Act
+        result = await self.service.get_user_generation_summary(
+            self.user_id, date_from=date_from
+        )
+
+        # Assert
+        self.mock_supabase.rpc.assert_called_once_with(
+            "ai_generation_summary",
+            {
+                "p_user_id": str(self.user_id),
+                "p_from": "2024-01-01T00:00:00+00:00",
+                "p_to": None,
+            },
+        )
+        self.mock_supabase.table.assert_not_called()
+        assert result.totals.generated == 25
+        assert result.totals.accepted == 18
+        assert [m.model for m in result.by_model] == ["gpt-4", None]
+        assert result.by_month[0].month == "2024-01"
+        assert result.date_from == date_from.replace(tzinfo=timezone.utc)
+        assert result.date_to is None
+
+    @pytest.mark.asyncio
+    async def test_summary_invalid_range(self):
+        """Test that an empty or inverted date range is rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await self.service.get_user_generation_summary(
+                self.user_id,
+                date_from=datetime(2024, 2, 1),
+                date_to=datetime(2024, 1, 1),
+            )
+
+        self.mock_supabase.rpc.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_summary_mixed_naive_and_aware_bounds(self):
+        """Test that a naive and an offset bound are compared and sent as UTC."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = {"totals": {}}
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        result = await self.service.get_user_generation_summary(
+            self.user_id,
+            date_from=datetime(2026, 1, 1),
+            date_to=datetime(2026, 2, 1, 2, tzinfo=timezone(timedelta(hours=2))),
+        )
+
+        # Assert
+        rpc_params = self.mock_supabase.rpc.call_args[0][1]
+        assert rpc_params["p_from"] == "2026-01-01T00:00:00+00:00"
+        assert rpc_params["p_to"] == "2026-02-01T00:00:00+00:00"
+        assert result.date_to == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_summary_database_error(self):
+        """Test that RPC failures raise AiGenerationServiceError."""
+        # Arrange
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=Exception("Connection failed")
+        )
+
+        # Act & Assert
+        with pytest.raises(AiGenerationServiceError) as exc_info:
+            await self.service.get_user_generation_summary(self.user_id)
+
+        assert exc_info.value.operation == "get_user_generation_summary"
+
+
 class TestAiGenerationServiceInitialization:
     """Test suite for AiGenerationService initialization."""
 
@@ -0,0 +1,719 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.dtos import (
+    AIGenerateFlashcardsRequest,
+    LLMFlashcardSuggestion,
+    LLMGenerateResponse,
+)
+from src.services.ai_service import AIService, AIServiceError
+from src.services.flashcard_dedup import FlashcardDedupIndex
+from src.services.llm_cache import LLMGenerationCache
+from src.services.llm_client import LLMServiceError
+from src.services.single_flight import SingleFlight
+
+
+class TestAIServicePersistGeneration:
+    """Test suite for persisting AI generations with a single RPC call."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = AIService(
+            self.mock_supabase,
+            use_persist_rpc=True,
+            dedup_index=FlashcardDedupIndex(enabled=False),
+        )
+        self.user_id = uuid.uuid4()
+        self.request = AIGenerateFlashcardsRequest(text_content="x" * 1000)
+        self.llm_response = LLMGenerateResponse(
+            flashcards=[
+                LLMFlashcardSuggestion(front_content="Q1", back_content="A1"),
+                LLMFlashcardSuggestion(front_content="Q2", back_content="A2"),
+            ],
+            model_used="test-model",
+            cost=0.002,
+        )
+
+    def _flashcard_row(self, source_text_id: str, front: str) -> dict:
+        """Build a flashcard row as returned inside the RPC result."""
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": str(self.user_id),
+            "source_text_id": source_text_id,
+            "front_content": front,
+            "back_content": "Answer",
+            "source": "ai_suggestion",
+            "status": "active",
+            "created_at": "2024-01-01T00:00:00.123456+00:00",
+            "updated_at": "2024-01-01T00:00:00.123456+00:00",
+        }
+
+    @pytest.mark.asyncio
+    async def test_generation_persisted_in_one_call(self):
+        """Test that all rows are written by one persist_ai_generation call."""
+        # Arrange
+        source_text_id = str(uuid.uuid4())
+        event_id = str(uuid.uuid4())
+        mock_response = Mock()
+        mock_response.data = {
+            "source_text_id": source_text_id,
+            "ai_generation_event_id": event_id,
+            "flashcards": [
+                self._flashcard_row(source_text_id, "Q1"),
+                self._flashcard_row(source_text_id, "Q2"),
+            ],
+        }
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        with patch.object(
+            self.service,
+            "_generate_with_llm",
+            AsyncMock(return_value=self.llm_response),
+        ):
+            result = await self.service.generate_flashcards_from_text(
+                self.request, self.user_id
+            )
+
+        # Assert
+        assert str(result.source_text_id) == source_text_id
+        assert str(result.ai_generation_event_id) == event_id
+        assert [card.front_content for card in result.suggested_flashcards] == [
+            "Q1",
+            "Q2",
+        ]
+        self.mock_supabase.table.assert_not_called()
+        rpc_name, rpc_params = self.mock_supabase.rpc.call_args[0]
+        assert rpc_name == "persist_ai_generation"
+        assert rpc_params["p_user_id"] == str(self.user_id)
+        assert rpc_params["p_suggestions"] == [
+            {"front_content": "Q1", "back_content": "A1"},
+            {"front_content": "Q2", "back_content": "A2"},
+        ]
+        assert rpc_params["p_llm_model_used"] == "test-model"
+        assert rpc_params["p_cost"] == 0.002
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_when_llm_fails(self):
+        """Test that no database call is made if the LLM call fails."""
+        # Act & Assert
+        with patch.object(
+            self.service,
+            "_generate_with_llm",
+            AsyncMock(side_effect=Exception("LLM timeout")),
+        ):
+            with pytest.raises(AIServiceError):
+                await self.service.generate_flashcards_from_text(
+                    self.request, self.user_id
+                )
+
+        self.mock_supabase.rpc.assert_not_called()
+        self.mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_database_error_raises_service_error(self):
+        """Test that RPC failures are reported as AIServiceError."""
+        # Arrange
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=Exception("connection reset")
+        )
+
+        # Act & Assert
+        with pytest.raises(AIServiceError) as exc_info:
+            await self.service._persist_generation(
+                text_content=self.request.text_content,
+                llm_response=self.llm_response,
+                user_id=self.user_id,
+            )
+
+        assert exc_info.value.operation == "persist_generation"
+        assert "connection reset" in exc_info.value.details
+
+
+class TestAIServiceGenerationCache:
+    """Test suite for reusing cached LLM generations."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.llm_cache = LLMGenerationCache(persistent=False)
+        self.service = AIService(
+            self.mock_supabase,
+            llm_cache=self.llm_cache,
+            dedup_index=FlashcardDedupIndex(enabled=False),
+        )
+        self.llm_client = Mock()
+        self.llm_client.router.preferred_model.return_value = "test-model"
+        self.llm_client.PROMPT_VERSION = "v1"
+        self.llm_client.sampling_params = {"temperature": 0.7}
+        self.llm_client.generate_flashcards = AsyncMock(
+            return_value=LLMGenerateResponse(
+                flashcards=[
+                    LLMFlashcardSuggestion(front_content="Q", back_content="A")
+                ],
+                model_used="test-model",
+                cost=0.002,
+            )
+        )
+        self.text = "x" * 1000
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_served_from_cache(self):
+        """Test that a second generation of the same text skips the LLM."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            first = await self.service._generate_with_llm(self.text)
+            second = await self.service._generate_with_llm(self.text + "\n")
+
+        self.llm_client.generate_flashcards.assert_awaited_once()
+        assert first.cache_hit is False
+        assert first.cost == 0.002
+        assert second.cache_hit is True
+        assert second.cost == 0.0
+        assert second.flashcards == first.flashcards
+
+    @pytest.mark.asyncio
+    async def test_force_regenerate_bypasses_cache(self):
+        """Test that force_regenerate always calls the LLM."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            await self.service._generate_with_llm(self.text)
+            result = await self.service._generate_with_llm(
+                self.text, force_regenerate=True
+            )
+
+        assert self.llm_client.generate_flashcards.await_count == 2
+        assert result.cache_hit is False
+
+    @pytest.mark.asyncio
+    async def test_rerouted_answer_not_cached(self):
+        """Test that output of a model other than the key's model is not cached."""
+        self.llm_client.generate_flashcards.return_value = (
+            self.llm_client.generate_flashcards.return_value.model_copy(
+                update={"model_used": "fallback-model"}
+            )
+        )
+
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            await self.service._generate_with_llm(self.text)
+            result = await self.service._generate_with_llm(self.text)
+
+        assert self.llm_client.generate_flashcards.await_count == 2
+        assert result.cache_hit is False
+        assert self.llm_cache.get_metrics()["size"] == 0
+
+
+class TestAIServiceStreamGeneration:
+    """Test suite for streamed AI flashcard generation."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = AIService(
+            self.mock_supabase,
+            llm_cache=LLMGenerationCache(persistent=False),
+            dedup_index=FlashcardDedupIndex(enabled=False),
+        )
+        self.user_id = uuid.uuid4()
+        self.request = AIGenerateFlashcardsRequest(text_content="x" * 1000)
+        self.suggestions = [
+            LLMFlashcardSuggestion(front_content="Q1", back_content="A1"),
+            LLMFlashcardSuggestion(front_content="Q2", back_content="A2"),
+        ]
+
+        suggestions = self.suggestions
+
+        class FakeStream:
+            response = None
+
+            def __aiter__(self):
+                return self._iterate()
+
+            async def _iterate(self):
+                for suggestion in suggestions:
+                    yield suggestion
+                self.response = LLMGenerateResponse(
+                    flashcards=suggestions, model_used="test-model", cost=0.002
+                )
+
+        self.llm_client = Mock()
+        self.llm_client.router.preferred_model.return_value = "test-model"
+        self.llm_client.PROMPT_VERSION = "v1"
+        self.llm_client.sampling_params = {"temperature": 0.7}
+        self.llm_client.stream_flashcards = Mock(
+            side_effect=lambda text, user_id=None: FakeStream()
+        )
+
+        source_text_id = str(uuid.uuid4())
+        persist_response = Mock()
+        persist_response.data = {
+            "source_text_id": source_text_id,
+            "ai_generation_event_id": str(uuid.uuid4()),
+            "flashcards": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": str(self.user_id),
+                    "source_text_id": source_text_id,
+                    "front_content": suggestion.front_content,
+                    "back_content": suggestion.back_content,
+                    "source": "ai_suggestion",
+                    "status": "active",
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                    "updated_at": "2024-01-01T00:00:00+00:00",
+                }
+                for suggestion in self.suggestions
+            ],
+        }
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=persist_response
+        )
+
+    async def _collect(self, request):
+        """Run the stream and return all events."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            return [
+                event
+                async for event in self.service.stream_flashcards_from_text(
+                    request, self.user_id
+                )
+            ]
+
+    @pytest.mark.asyncio
+    async def test_cards_streamed_before_single_persist(self):
+        """Test that card events precede one persist call and the complete event."""
+        events = await self._collect(self.request)
+
+        assert [event["type"] for event in events] == ["card", "card", "complete"]
+        assert events[0]["flashcard"] == {"front_content": "Q1", "back_content": "A1"}
+        assert events[1]["index"] == 1
+        self.mock_supabase.rpc.assert_called_once()
+        assert self.mock_supabase.rpc.call_args[0][0] == "persist_ai_generation"
+        result = events[-1]["result"]
+        assert len(result["suggested_flashcards"]) == 2
+        assert result["cache_hit"] is False
+
+    @pytest.mark.asyncio
+    async def test_stream_persists_per_table_without_rpc(self):
+        """Test that streaming honours use_persist_rpc=False."""
+        self.service.use_persist_rpc = False
+        self.service.use_repetition_trigger = True
+        generation = self.mock_supabase.rpc.return_value.execute.return_value.data
+        self.service._create_source_text = AsyncMock(
+            return_value={"id": generation["source_text_id"]}
+        )
+        self.service._create_flashcard_records = AsyncMock(
+            return_value=generation["flashcards"]
+        )
+        self.service._create_ai_generation_event = AsyncMock(
+            return_value={"id": generation["ai_generation_event_id"]}
+        )
+
+        events = await self._collect(self.request)
+
+        self.mock_supabase.rpc.assert_not_called()
+        self.service._create_flashcard_records.assert_awaited_once()
+        assert (
+            self.service._create_ai_generation_event.await_args.kwargs[
+                "generated_count"
+            ]
+            == 2
+        )
+        result = events[-1]["result"]
+        assert result["source_text_id"] == generation["source_text_id"]
+        assert len(result["suggested_flashcards"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_generation_replayed(self):
+        """Test that a repeated text is replayed from the cache with zero cost."""
+        await self._collect(self.request)
+        events = await self._collect(self.request)
+
+        self.llm_client.stream_flashcards.assert_called_once()
+        assert events[-1]["result"]["cache_hit"] is True
+        rpc_params = self.mock_supabase.rpc.call_args[0][1]
+        assert rpc_params["p_cost"] == 0.0
+        assert rpc_params["p_cache_hit"] is True
+
+
+class TestAIServiceChunkedGeneration:
+    """Test suite for fan-out generation over long texts."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = AIService(
+            self.mock_supabase,
+            llm_cache=LLMGenerationCache(persistent=False),
+            chunk_max_tokens=300,
+            chunk_concurrency=2,
+            dedup_index=FlashcardDedupIndex(enabled=False),
+        )
+        self.llm_client = Mock()
+        self.llm_client.router.preferred_model.return_value = "test-model"
+        self.llm_client.PROMPT_VERSION = "v1"
+        self.llm_client.sampling_params = {"temperature": 0.7}
+        self.paragraphs = [f"Chapter part {i}. " + "x" * 1000 for i in range(4)]
+        self.text = "\n\n".join(self.paragraphs)
+
+    def _chunk_response(self, fronts):
+        """Build a chunk generation with the given questions."""
+        return LLMGenerateResponse(
+            flashcards=[
+                LLMFlashcardSuggestion(front_content=front, back_content="A")
+                for front in fronts
+            ],
+            model_used="test-model",
+            cost=0.001,
+        )
+
+    async def _generate(self):
+        """Run _generate_with_llm with the mocked client."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            return await self.service._generate_with_llm(self.text)
+
+    @pytest.mark.asyncio
+    async def test_chunks_generated_concurrently_under_limit(self):
+        """Test that chunks run in parallel, bounded by the semaphore."""
+        # Arrange
+        running = 0
+        peak = 0
+
+        async def generate(chunk, user_id=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return self._chunk_response([chunk[:14]])
+
+        self.llm_client.generate_flashcards = AsyncMock(side_effect=generate)
+
+        # Act
+        result = await self._generate()
+
+        # Assert
+        assert self.llm_client.generate_flashcards.await_count == 4
+        assert peak == 2
+        assert [card.front_content for card in result.flashcards] == [
+            f"Chapter part {i}" for i in range(4)
+        ]
+        assert result.cost == pytest.approx(0.004)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_questions_merged(self):
+        """Test that questions repeated across chunks are kept once."""
+        self.llm_client.generate_flashcards = AsyncMock(
+            side_effect=[
+                self._chunk_response(["What is X?", "What is Y?"]),
+                self._chunk_response(["what is  x?", "What is Z?"]),
+                self._chunk_response(["What is Y?"]),
+                self._chunk_response(["What is W?"]),
+            ]
+        )
+
+        result = await self._generate()
+
+        assert [card.front_content for card in result.flashcards] == [
+            "What is X?",
+            "What is Y?",
+            "What is Z?",
+            "What is W?",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunks_skipped(self):
+        """Test that one failing chunk does not fail the generation or get cached."""
+        self.llm_client.generate_flashcards = AsyncMock(
+            side_effect=[
+                self._chunk_response(["Q1"]),
+                LLMServiceError(operation="timeout", details="Request timeout"),
+                self._chunk_response(["Q3"]),
+                self._chunk_response(["Q4"]),
+            ]
+        )
+
+        result = await self._generate()
+
+        assert [card.front_content for card in result.flashcards] == [
+            "Q1",
+            "Q3",
+            "Q4",
+        ]
+        assert result.failed_chunks == 1
+
+        # The partial result was not cached: the next request calls the LLM again
+        self.llm_client.generate_flashcards = AsyncMock(
+            return_value=self._chunk_response(["Q"])
+        )
+        retried = await self._generate()
+
+        assert self.llm_client.generate_flashcards.await_count == 4
+        assert retried.cache_hit is False
+        assert retried.failed_chunks == 0
+
+    @pytest.mark.asyncio
+    async def test_all_chunks_failing_raises(self):
+        """Test that the LLM error surfaces when every chunk fails."""
+        self.llm_client.generate_flashcards = AsyncMock(
+            side_effect=LLMServiceError(operation="timeout", details="Request timeout")
+        )
+
+        with pytest.raises(LLMServiceError):
+            await self._generate()
+
+
+class TestAIServiceRequestCoalescing:
+    """Test suite for coalescing identical in-flight generation requests."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = AIService(
+            self.mock_supabase,
+            use_persist_rpc=True,
+            llm_cache=LLMGenerationCache(enabled=False),
+            single_flight=SingleFlight(),
+            dedup_index=FlashcardDedupIndex(enabled=False),
+        )
+        self.user_id = uuid.uuid4()
+        self.request = AIGenerateFlashcardsRequest(text_content="x" * 1000)
+
+        async def generate(text, user_id=None):
+            await asyncio.sleep(0.01)
+            return LLMGenerateResponse(
+                flashcards=[
+                    LLMFlashcardSuggestion(front_content="Q1", back_content="A1")
+                ],
+                model_used="test-model",
+                cost=0.002,
+            )
+
+        self.llm_client = Mock()
+        self.llm_client.router.preferred_model.return_value = "test-model"
+        self.llm_client.PROMPT_VERSION = "v1"
+        self.llm_client.sampling_params = {"temperature": 0.7}
+        self.llm_client.generate_flashcards = AsyncMock(side_effect=generate)
+
+        source_text_id = str(uuid.uuid4())
+        persist_response = Mock()
+        persist_response.data = {
+            "source_text_id": source_text_id,
+            "ai_generation_event_id": str(uuid.uuid4()),
+            "flashcards": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": str(self.user_id),
+                    "source_text_id": source_text_id,
+                    "front_content": "Q1",
+                    "back_content": "A1",
+                    "source": "ai_suggestion",
+                    "status": "active",
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                    "updated_at": "2024-01-01T00:00:00+00:00",
+                }
+            ],
+        }
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=persist_response
+        )
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_generation(self):
+        """Test that concurrent duplicates trigger one LLM call and one insert."""
+        # Arrange
+        duplicate = AIGenerateFlashcardsRequest(text_content="x" * 1000 + "\n")
+
+        # Act
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            first, second = await asyncio.gather(
+                self.service.generate_flashcards_from_text(self.request, self.user_id),
+                self.service.generate_flashcards_from_text(duplicate, self.user_id),
+            )
+
+        # Assert
+        self.llm_client.generate_flashcards.assert_awaited_once()
+        self.mock_supabase.rpc.assert_called_once()
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_other_users_not_coalesced(self):
+        """Test that the same text from another user is generated separately."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            await asyncio.gather(
+                self.service.generate_flashcards_from_text(self.request, self.user_id),
+                self.service.generate_flashcards_from_text(self.request, uuid.uuid4()),
+            )
+
+        assert self.llm_client.generate_flashcards.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_joins_in_flight_generation(self):
+        """Test that a streamed duplicate replays the in-flight result."""
+        with patch(
+            "src.services.ai_service.get_llm_client",
+            AsyncMock(return_value=self.llm_client),
+        ):
+            leader = asyncio.ensure_future(
+                self.service.generate_flashcards_from_text(self.request, self.user_id)
+            )
+            await asyncio.sleep(0)
+            events = [
+                event
+                async for event in self.service.stream_flashcards_from_text(
+                    self.request, self.user_id
+                )
+            ]
+            result = await leader
+
+        self.llm_client.generate_flashcards.assert_awaited_once()
+        assert [event["type"] for event in events] == ["card", "complete"]
+        assert events[-1]["result"] == result.model_dump(mode="json")
+
+
+class TestAIServiceNearDuplicates:
+    """Test suite for dropping suggestions that duplicate the user's deck."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.dedup_index = FlashcardDedupIndex()
+        self.service = AIService(
+            self.mock_supabase,
+            use_persist_rpc=True,
+            llm_cache=LLMGenerationCache(enabled=False),
+            single_flight=SingleFlight(),
+            dedup_index=self.dedup_index,
+        )
+        self.user_id = uuid.uuid4()
+        self.request = AIGenerateFlashcardsRequest(text_content="x" * 1000)
+
+        existing = Mock()
+        existing.data = [
+            {"id": str(uuid.uuid4()), "front_content": "What is the capital of France?"}
+        ]
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            return_value=existing
+        )
+
+    def _persist_result(self, fronts):
+        """Build a persist_ai_generation result storing the given fronts."""
+        response = Mock()
+        response.data = {
+            "source_text_id": str(uuid.uuid4()),
+            "ai_generation_event_id": str(uuid.uuid4()),
+            "flashcards": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": str(self.user_id),
+                    "front_content": front,
+                    "back_content": "A",
+                    "source": "ai_suggestion",
+                    "status": "active",
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                    "updated_at": "2024-01-01T00:00:00+00:00",
+                }
+                for front in fronts
+            ],
+        }
+        return response
+
+    def _llm_response(self, fronts):
+        return LLMGenerateResponse(
+            flashcards=[
+                LLMFlashcardSuggestion(front_content=front, back_content="A")
+                for front in fronts
+            ],
+            model_used="test-model",
+        )
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_dropped_before_persisting(self):
+        """Test that suggestions matching the deck or the batch are not stored."""
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=self._persist_result(["How do plants make energy?"])
+        )
+        llm_response = self._llm_response(
+            [
+                "What is the capital city of France?",
+                "How do plants make energy?",
+                "How do plants make energy ?",
+            ]
+        )
+
+        with patch.object(
+            self.service, "_generate_with_llm", AsyncMock(return_value=llm_response)
+        ):
+            result = await self.service.generate_flashcards_from_text(
+                self.request, self.user_id
+            )
+
+        rpc_params = self.mock_supabase.rpc.call_args[0][1]
+        assert [s["front_content"] for s in rpc_params["p_suggestions"]] == [
+            "How do plants make energy?"
+        ]
+        assert result.duplicates_dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_stored_cards_added_to_index(self):
+        """Test that persisted cards are matched by the next generation."""
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=self._persist_result(["How do plants make energy?"])
+        )
+        llm_response = self._llm_response(["How do plants make energy?"])
+
+        with patch.object(
+            self.service, "_generate_with_llm", AsyncMock(return_value=llm_response)
+        ):
+            await self.service.generate_flashcards_from_text(self.request, self.user_id)
+            with pytest.raises(AIServiceError) as exc_info:
+                await self.service.generate_flashcards_from_text(
+                    self.request, self.user_id
+                )
+
+        assert exc_info.value.operation == "deduplicate_flashcards"
+        assert self.dedup_index.get_metrics()["builds"] == 1
+
+    @pytest.mark.asyncio
+    async def test_index_failure_keeps_all_suggestions(self):
+        """Test that generation still succeeds when the index cannot be built."""
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute = AsyncMock(
+            side_effect=Exception("connection reset")
+        )
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=self._persist_result(["What is the capital of France?"])
+        )
+        llm_response = self._llm_response(["What is the capital of France?"])
+
+        with patch.object(
+            self.service, "_generate_with_llm", AsyncMock(return_value=llm_response)
+        ):
+            result = await self.service.generate_flashcards_from_text(
+                self.request, self.user_id
+            )
+
+        assert result.duplicates_dropped == 0
@@ -0,0 +1,31 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.middleware.auth_middleware import AuthMiddleware
+
+
+class TestAuthMiddleware:
+    """Test suite for token handling in the auth middleware."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.middleware = AuthMiddleware()
+        self.request = Mock()
+        self.request.url.path = "/flashcards"
+        self.request.cookies = {"access_token": "token"}
+
+    @pytest.mark.asyncio
+    async def test_handler_error_not_retried(self):
+        """Test that an error raised by the route handler runs it only once."""
+        call_next = AsyncMock(side_effect=RuntimeError("handler failed"))
+
+        with patch(
+            "src.middleware.auth_middleware.token_verifier.verify",
+            AsyncMock(return_value={"sub": "user-1"}),
+        ):
+            with pytest.raises(RuntimeError):
+                await self.middleware(self.request, call_next)
+
+        call_next.assert_awaited_once()
+        assert self.request.state.user == {"id": "user-1", "email": None}
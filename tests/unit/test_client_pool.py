@@ -0,0 +1,81 @@
+import pytest
+
+from src.db.client_pool import SupabaseClientPool
+
+
+class TestSupabaseClientPool:
+    """Test suite for SupabaseClientPool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.pool = SupabaseClientPool(
+            supabase_url="https://test.supabase.co",
+            supabase_key="anon-key",
+            http2=False,
+            max_cached_clients=2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_same_token_reuses_client(self):
+        """Test that repeated tokens are served from the cache."""
+        first = self.pool.get_client("token-a")
+        second = self.pool.get_client("token-a")
+
+        assert first is second
+        metrics = self.pool.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+
+        await self.pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_clients_share_http_pool(self):
+        """Test that every client is built on the same async httpx client."""
+        client_a = self.pool.get_client("token-a")
+        client_b = self.pool.get_client("token-b")
+
+        assert client_a.session is client_b.session
+        assert client_a.headers["Authorization"] == "Bearer token-a"
+        assert client_b.headers["Authorization"] == "Bearer token-b"
+        assert client_a.headers["apikey"] == "anon-key"
+        assert str(client_a.base_url) == "https://test.supabase.co/rest/v1"
+
+        await self.pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_client_is_evicted(self):
+        """Test that the cache is bounded and evicts the oldest token."""
+        client_a = self.pool.get_client("token-a")
+        self.pool.get_client("token-b")
+        self.pool.get_client("token-a")
+        self.pool.get_client("token-c")
+
+        assert self.pool.get_client("token-a") is client_a
+        metrics = self.pool.get_metrics()
+        assert metrics["evictions"] == 1
+        assert metrics["cached_clients"] == 2
+
+        await self.pool.aclose()
+
+    def test_service_client_requires_service_key(self):
+        """Test that no service client is handed out without a service key."""
+        assert self.pool.get_service_client() is None
+
+    @pytest.mark.asyncio
+    async def test_service_client_uses_service_key(self):
+        """Test that the service client sends the service key for both headers."""
+        pool = SupabaseClientPool(
+            supabase_url="https://test.supabase.co",
+            supabase_key="anon-key",
+            service_key="service-key",
+            http2=False,
+        )
+
+        client = pool.get_service_client()
+
+        assert pool.get_service_client() is client
+        assert client.headers["apikey"] == "service-key"
+        assert client.headers["Authorization"] == "Bearer service-key"
+        assert pool.get_metrics()["cached_clients"] == 0
+
+        await pool.aclose()
@@ -0,0 +1,181 @@
+import asyncio
+import time
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.dtos import AIGenerationSummary, DashboardStats
+from src.services.dashboard_cache import (
+    DashboardStatsCache,
+    InMemoryDashboardStatsBackend,
+)
+
+
+def make_stats(total_flashcards: int) -> DashboardStats:
+    """Build DashboardStats with the given flashcard total."""
+    return DashboardStats(
+        total_flashcards=total_flashcards,
+        due_cards_today=1,
+        ai_stats=AIGenerationSummary(total_generated=4, total_accepted=2),
+    )
+
+
+class TestDashboardStatsCache:
+    """Test suite for the stale-while-revalidate dashboard stats cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = DashboardStatsCache(
+            backend=InMemoryDashboardStatsBackend(max_size=10),
+            ttl=30,
+            stale_ttl=300,
+        )
+        self.user_id = uuid.uuid4()
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        """Test that the loader runs once and the second read is a hit."""
+        loader = AsyncMock(return_value=make_stats(5))
+
+        first = await self.cache.get_or_load(self.user_id, loader)
+        second = await self.cache.get_or_load(self.user_id, loader)
+
+        assert first == second
+        assert second.total_flashcards == 5
+        loader.assert_awaited_once()
+        metrics = self.cache.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["hits"] == 1
+        assert metrics["hit_ratio"] == 0.5
+        assert metrics["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """Test that a stale entry is returned and refreshed in the background."""
+        await self.cache.get_or_load(
+            self.user_id, AsyncMock(return_value=make_stats(5))
+        )
+        refresh_loader = AsyncMock(return_value=make_stats(6))
+
+        with patch(
+            "src.services.dashboard_cache.time.time", return_value=time.time() + 60
+        ):
+            stale = await self.cache.get_or_load(self.user_id, refresh_loader)
+            assert stale.total_flashcards == 5
+            await asyncio.gather(*self.cache._refresh_tasks)
+
+            fresh = await self.cache.get_or_load(self.user_id, refresh_loader)
+
+        assert fresh.total_flashcards == 6
+        refresh_loader.assert_awaited_once()
+        assert self.cache.stale_hits == 1
+        assert self.cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_reloaded_synchronously(self):
+        """Test that entries older than stale_ttl are treated as misses."""
+        await self.cache.get_or_load(
+            self.user_id, AsyncMock(return_value=make_stats(5))
+        )
+
+        with patch(
+            "src.services.dashboard_cache.time.time", return_value=time.time() + 600
+        ):
+            result = await self.cache.get_or_load(
+                self.user_id, AsyncMock(return_value=make_stats(7))
+            )
+
+        assert result.total_flashcards == 7
+        assert self.cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        """Test that invalidation makes the next read hit the loader."""
+        loader = AsyncMock(side_effect=[make_stats(5), make_stats(6)])
+
+        await self.cache.get_or_load(self.user_id, loader)
+        await self.cache.invalidate(self.user_id)
+        result = await self.cache.get_or_load(self.user_id, loader)
+
+        assert result.total_flashcards == 6
+        assert loader.await_count == 2
+        assert self.cache.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_load_skips_store(self):
+        """Test that a load overtaken by a write is returned but not cached."""
+
+        async def slow_loader():
+            await self.cache.invalidate(self.user_id)
+            return make_stats(5)
+
+        result = await self.cache.get_or_load(self.user_id, slow_loader)
+
+        assert result.total_flashcards == 5
+        assert await self.cache.backend.get(str(self.user_id)) is None
+
+    @pytest.mark.asyncio
+    async def test_load_started_before_invalidate_does_not_overwrite(self):
+        """Test that a stale load finishing after a newer one is not stored."""
+        release_stale = asyncio.Event()
+
+        async def stale_loader():
+            await release_stale.wait()
+            return make_stats(5)
+
+        stale_load = asyncio.create_task(
+            self.cache.get_or_load(self.user_id, stale_loader)
+        )
+        await asyncio.sleep(0)
+        await self.cache.invalidate(self.user_id)
+        fresh = await self.cache.get_or_load(
+            self.user_id, AsyncMock(return_value=make_stats(6))
+        )
+        release_stale.set()
+        await stale_load
+
+        _, payload = await self.cache.backend.get(str(self.user_id))
+        assert fresh.total_flashcards == 6
+        assert payload["total_flashcards"] == 6
+        assert self.cache._loading == {}
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_not_cached(self):
+        """Test that loader failures propagate and leave nothing cached."""
+        with pytest.raises(RuntimeError):
+            await self.cache.get_or_load(
+                self.user_id, AsyncMock(side_effect=RuntimeError("db down"))
+            )
+
+        assert await self.cache.backend.get(str(self.user_id)) is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_loads(self):
+        """Test that a disabled cache calls the loader every time."""
+        cache = DashboardStatsCache(enabled=False)
+        loader = AsyncMock(return_value=make_stats(5))
+
+        await cache.get_or_load(self.user_id, loader)
+        await cache.get_or_load(self.user_id, loader)
+
+        assert loader.await_count == 2
+        assert cache.get_metrics()["misses"] == 0
+
+
+class TestInMemoryDashboardStatsBackend:
+    """Test suite for the in-memory cache backend."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at max_size."""
+        backend = InMemoryDashboardStatsBackend(max_size=2)
+
+        await backend.set("a", (1.0, {}), ttl=60)
+        await backend.set("b", (1.0, {}), ttl=60)
+        await backend.get("a")
+        await backend.set("c", (1.0, {}), ttl=60)
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert backend.size() == 2
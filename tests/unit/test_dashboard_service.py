@@ -0,0 +1,132 @@
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.dashboard_cache import DashboardStatsCache
+from src.services.dashboard_service import DashboardService, DashboardServiceError
+
+
+class TestDashboardServiceStatsTable:
+    """Test suite for reading dashboard stats from the user_stats table."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = DashboardService(self.mock_supabase, use_stats_table=True)
+        self.user_id = uuid.uuid4()
+
+    @pytest.mark.asyncio
+    async def test_stats_read_with_one_call(self):
+        """Test that all totals come from a single get_dashboard_stats call."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = [
+            {
+                "total_flashcards": 42,
+                "due_cards_today": 7,
+                "total_generated": 30,
+                "total_accepted": 12,
+            }
+        ]
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        stats = await self.service.get_dashboard_stats(self.user_id)
+
+        # Assert
+        self.mock_supabase.rpc.assert_called_once_with(
+            "get_dashboard_stats", {"p_user_id": str(self.user_id)}
+        )
+        self.mock_supabase.table.assert_not_called()
+        assert stats.total_flashcards == 42
+        assert stats.due_cards_today == 7
+        assert stats.ai_stats.total_generated == 30
+        assert stats.ai_stats.total_accepted == 12
+
+    @pytest.mark.asyncio
+    async def test_stats_default_to_zero_without_row(self):
+        """Test that an empty RPC result yields zeroed stats."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = []
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        stats = await self.service.get_dashboard_stats(self.user_id)
+
+        # Assert
+        assert stats.total_flashcards == 0
+        assert stats.due_cards_today == 0
+        assert stats.ai_stats.total_generated == 0
+        assert stats.ai_stats.total_accepted == 0
+
+    @pytest.mark.asyncio
+    async def test_rpc_failure_raises_service_error(self):
+        """Test that a failing RPC call is wrapped in DashboardServiceError."""
+        # Arrange
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=Exception("connection lost")
+        )
+
+        # Act & Assert
+        with pytest.raises(DashboardServiceError) as exc_info:
+            await self.service.get_dashboard_stats(self.user_id)
+
+        assert exc_info.value.operation == "get_dashboard_stats"
+
+    @pytest.mark.asyncio
+    async def test_legacy_path_aggregates_source_tables(self):
+        """Test that disabling the stats table falls back to per-table queries."""
+        # Arrange
+        service = DashboardService(self.mock_supabase, use_stats_table=False)
+        count_response = Mock()
+        count_response.count = 3
+        mock_query = Mock()
+        mock_query.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.lte.return_value = mock_query
+        mock_query.execute = AsyncMock(return_value=count_response)
+        self.mock_supabase.table.return_value = mock_query
+        summary_response = Mock()
+        summary_response.data = {"totals": {"generated": 9, "accepted": 3}}
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=summary_response
+        )
+
+        # Act
+        stats = await service.get_dashboard_stats(self.user_id)
+
+        # Assert
+        self.mock_supabase.rpc.assert_called_once_with(
+            "ai_generation_summary", {"p_user_id": str(self.user_id)}
+        )
+        assert stats.total_flashcards == 3
+        assert stats.due_cards_today == 3
+        assert stats.ai_stats.total_generated == 9
+        assert stats.ai_stats.total_accepted == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_stats_skip_database(self):
+        """Test that a cached service answers repeat reads without an RPC call."""
+        # Arrange
+        service = DashboardService(
+            self.mock_supabase, use_stats_table=True, cache=DashboardStatsCache()
+        )
+        mock_response = Mock()
+        mock_response.data = [{"total_flashcards": 42, "due_cards_today": 7}]
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        first = await service.get_dashboard_stats(self.user_id)
+        second = await service.get_dashboard_stats(self.user_id)
+
+        # Assert
+        assert first == second
+        self.mock_supabase.rpc.assert_called_once()
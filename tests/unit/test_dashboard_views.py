@@ -0,0 +1,36 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.v1.routers.dashboard_views import require_auth
+
+
+class TestDashboardRequireAuth:
+    """Test suite for the dashboard authentication dependency."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.request = Mock()
+        self.request.url.path = "/dashboard"
+
+    @pytest.mark.asyncio
+    async def test_verified_user_returned(self):
+        """Test that the user verified by the middleware is passed through."""
+        user = {"id": "user-1", "email": "user@example.com"}
+
+        assert await require_auth(self.request, user) == user
+
+    @pytest.mark.asyncio
+    async def test_unverified_cookie_redirects_to_login(self):
+        """Test that an auth cookie the middleware rejected is not trusted."""
+        with patch(
+            "src.services.auth_service.AuthService.get_auth_data",
+            return_value={"user_id": "victim-id", "email": "victim@example.com"},
+        ) as get_auth_data:
+            with pytest.raises(HTTPException) as exc_info:
+                await require_auth(self.request, None)
+
+        assert exc_info.value.status_code == 302
+        assert exc_info.value.headers["Location"].startswith("/login")
+        get_auth_data.assert_not_called()
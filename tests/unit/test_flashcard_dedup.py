@@ -0,0 +1,203 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.flashcard_dedup import (
+    FlashcardDedupIndex,
+    MinHasher,
+    NearDuplicateIndex,
+    normalize_front,
+    shingles,
+)
+
+
+def make_supabase(rows):
+    """Build a Supabase client mock whose flashcards query returns the rows."""
+    supabase = Mock()
+    response = Mock()
+    response.data = rows
+    execute = AsyncMock(return_value=response)
+    supabase.table.return_value.select.return_value.eq.return_value.order.return_value.range.return_value.execute = (
+        execute
+    )
+    return supabase, execute
+
+
+class TestNearDuplicateIndex:
+    """Test suite for the per-user LSH index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = NearDuplicateIndex(MinHasher())
+        self.index.add("france", "What is the capital of France?")
+        self.index.add("tcp", "How does TCP ensure reliable delivery?")
+
+    def test_normalization(self):
+        """Test that case, punctuation and spacing are ignored."""
+        assert normalize_front("  What's  the CAPITAL?! ") == "what s the capital"
+        assert shingles("abc") == {"abc"}
+
+    def test_exact_and_near_duplicates_found(self):
+        """Test that reworded fronts above the threshold match."""
+        assert self.index.find("what is the capital of france", 0.7)[0] == "france"
+        assert self.index.find("What is the capital city of France?", 0.7)[0] == (
+            "france"
+        )
+
+    def test_different_question_not_matched(self):
+        """Test that a similar but different question is kept."""
+        assert self.index.find("What is the capital of Germany?", 0.7) is None
+        assert self.index.find("Define photosynthesis.", 0.7) is None
+
+    def test_remove(self):
+        """Test that removed cards no longer match."""
+        self.index.remove("france")
+        self.index.remove("unknown")
+
+        assert self.index.find("What is the capital of France?", 0.7) is None
+        assert len(self.index) == 1
+
+    def test_add_replaces_previous_front(self):
+        """Test that re-adding a card indexes only its new front."""
+        self.index.add("france", "Define photosynthesis.")
+
+        assert self.index.find("What is the capital of France?", 0.7) is None
+        assert self.index.find("Define photosynthesis", 0.7)[0] == "france"
+
+
+class TestFlashcardDedupIndex:
+    """Test suite for the cached per-user indexes."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.dedup = FlashcardDedupIndex(max_users=2, ttl=600)
+        self.user_id = uuid.uuid4()
+        self.supabase, self.execute = make_supabase(
+            [{"id": "1", "front_content": "What is the capital of France?"}]
+        )
+
+    @staticmethod
+    def suggestions(*fronts):
+        return [SimpleNamespace(front_content=front) for front in fronts]
+
+    @pytest.mark.asyncio
+    async def test_index_built_lazily_once(self):
+        """Test that the index is loaded on first use and then reused."""
+        await self.dedup.get_index(self.user_id, self.supabase)
+        await self.dedup.get_index(self.user_id, self.supabase)
+
+        self.execute.assert_awaited_once()
+        metrics = self.dedup.get_metrics()
+        assert metrics["builds"] == 1
+        assert metrics["hits"] == 1
+        assert metrics["indexed_cards"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_builds_coalesced(self):
+        """Test that simultaneous lookups share one build."""
+        await asyncio.gather(
+            self.dedup.get_index(self.user_id, self.supabase),
+            self.dedup.get_index(self.user_id, self.supabase),
+        )
+
+        self.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_index_rebuilt(self):
+        """Test that an index older than the TTL is loaded again."""
+        self.dedup.ttl = 0
+
+        await self.dedup.get_index(self.user_id, self.supabase)
+        await self.dedup.get_index(self.user_id, self.supabase)
+
+        assert self.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_user_evicted(self):
+        """Test that the cache keeps at most max_users indexes."""
+        for _ in range(3):
+            await self.dedup.get_index(uuid.uuid4(), self.supabase)
+
+        metrics = self.dedup.get_metrics()
+        assert metrics["cached_users"] == 2
+        assert metrics["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_filter_drops_deck_and_batch_duplicates(self):
+        """Test that duplicates of the deck and of earlier suggestions are dropped."""
+        kept, dropped = await self.dedup.filter_duplicates(
+            self.user_id,
+            self.suggestions(
+                "What is the capital of France ?",
+                "What is the capital of Germany?",
+                "what is the capital of germany",
+            ),
+            self.supabase,
+        )
+
+        assert [s.front_content for s in kept] == ["What is the capital of Germany?"]
+        assert dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_incremental_add_and_remove(self):
+        """Test that created and deleted cards update a cached index."""
+        await self.dedup.get_index(self.user_id, self.supabase)
+
+        self.dedup.add(
+            self.user_id, [{"id": "2", "front_content": "Define photosynthesis."}]
+        )
+        self.dedup.remove(self.user_id, "1")
+
+        kept, dropped = await self.dedup.filter_duplicates(
+            self.user_id,
+            self.suggestions("Define photosynthesis", "What is the capital of France?"),
+            self.supabase,
+        )
+        assert [s.front_content for s in kept] == ["What is the capital of France?"]
+        self.execute.assert_awaited_once()
+
+    def test_updates_ignored_when_not_cached(self):
+        """Test that updates for users without an index are no-ops."""
+        self.dedup.add(self.user_id, [{"id": "2", "front_content": "Q"}])
+        self.dedup.remove(self.user_id, "2")
+
+        assert self.dedup.get_metrics()["cached_users"] == 0
+
+    @pytest.mark.asyncio
+    async def test_change_during_build_not_cached(self):
+        """Test that an index built while cards changed is not kept."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+        response = Mock()
+        response.data = []
+
+        async def slow_execute():
+            started.set()
+            await release.wait()
+            return response
+
+        self.execute.side_effect = slow_execute
+        build = asyncio.create_task(self.dedup.get_index(self.user_id, self.supabase))
+        await started.wait()
+        self.dedup.add(self.user_id, [{"id": "2", "front_content": "Q"}])
+        release.set()
+        await build
+
+        assert self.dedup.get_metrics()["cached_users"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_keeps_everything(self):
+        """Test that a disabled index neither loads cards nor drops suggestions."""
+        dedup = FlashcardDedupIndex(enabled=False)
+        suggestions = self.suggestions("What is the capital of France?")
+
+        kept, dropped = await dedup.filter_duplicates(
+            self.user_id, suggestions, self.supabase
+        )
+
+        assert kept == suggestions
+        assert dropped == 0
+        self.execute.assert_not_awaited()
@@ -1,10 +1,14 @@
 import uuid
 from datetime import datetime
-from unittest.mock import MagicMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
+from postgrest.exceptions import APIError
 
 from src.api.v1.schemas.flashcard_schemas import (
+    CountStrategyEnum,
+    FlashcardBulkStatusItem,
+    FlashcardManualCreateRequest,
     FlashcardSourceEnum,
     FlashcardStatusEnum,
     ListFlashcardsQueryParams,
@@ -45,7 +49,8 @@ class TestFlashcardServiceGetFlashcardsForUser:
             },
         ]
 
-    def test_get_flashcards_default_params(self):
+    @pytest.mark.asyncio
+    async def test_get_flashcards_default_params(self):
         """Test getting flashcards with default parameters."""
         # Arrange
         params = ListFlashcardsQueryParams()
@@ -60,12 +65,6 @@ class TestFlashcardServiceGetFlashcardsForUser:
         mock_order = Mock()
         mock_execute = Mock()
 
-        # Count query chain
-        mock_count_select = Mock()
-        mock_count_eq_user = Mock()
-        mock_count_eq_status = Mock()
-        mock_count_execute = Mock()
-
         # Setup method chaining for main query
         self.mock_supabase.table.return_value = mock_table
         mock_table.select.return_value = mock_select
@@ -74,18 +73,13 @@ class TestFlashcardServiceGetFlashcardsForUser:
         mock_eq_status.limit.return_value = mock_limit
         mock_limit.offset.return_value = mock_offset
         mock_offset.order.return_value = mock_order
-        mock_order.execute.return_value = mock_execute
+        mock_order.order.return_value = mock_order
+        mock_order.execute = AsyncMock(return_value=mock_execute)
         mock_execute.data = self.sample_flashcards
-
-        # Setup method chaining for count query
-        mock_table.select.side_effect = [mock_select, mock_count_select]
-        mock_count_select.eq.return_value = mock_count_eq_user
-        mock_count_eq_user.eq.return_value = mock_count_eq_status
-        mock_count_eq_status.execute.return_value = mock_count_execute
-        mock_count_execute.count = 2
+        mock_execute.count = 2
 
         # Act
-        result = self.service.get_flashcards_for_user(self.user_id, params)
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
 
         # Assert
         assert result.total == 2
@@ -95,8 +89,10 @@ class TestFlashcardServiceGetFlashcardsForUser:
         assert len(result.items) == 2
         assert result.items[0].front_content == "Question 1"
         assert result.items[1].front_content == "Question 2"
+        mock_table.select.assert_called_once_with("*", count="exact")
 
-    def test_get_flashcards_with_filters(self):
+    @pytest.mark.asyncio
+    async def test_get_flashcards_with_filters(self):
         """Test getting flashcards with status and source filters."""
         # Arrange
         params = ListFlashcardsQueryParams(
@@ -109,19 +105,15 @@ class TestFlashcardServiceGetFlashcardsForUser:
         # Mock similar to above but simplified for this test
         mock_response = Mock()
         mock_response.data = []
-        mock_count_response = Mock()
-        mock_count_response.count = 0
+        mock_response.count = 0
 
         # Setup mocking chain (simplified)
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.execute.return_value = (
-            mock_response
-        )
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
         )
 
         # Act
-        result = self.service.get_flashcards_for_user(self.user_id, params)
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
 
         # Assert
         assert result.total == 0
@@ -130,26 +122,23 @@ class TestFlashcardServiceGetFlashcardsForUser:
         assert result.pages == 1
         assert len(result.items) == 0
 
-    def test_get_flashcards_pagination(self):
+    @pytest.mark.asyncio
+    async def test_get_flashcards_pagination(self):
         """Test flashcards pagination calculation."""
         # Arrange
         params = ListFlashcardsQueryParams(page=2, size=5)
 
         mock_response = Mock()
         mock_response.data = []
-        mock_count_response = Mock()
-        mock_count_response.count = 12  # Total of 12 items
+        mock_response.count = 12  # Total of 12 items
 
         # Setup mocking
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.execute.return_value = (
-            mock_response
-        )
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
         )
 
         # Act
-        result = self.service.get_flashcards_for_user(self.user_id, params)
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
 
         # Assert
         assert result.total == 12
@@ -157,33 +146,63 @@ class TestFlashcardServiceGetFlashcardsForUser:
         assert result.size == 5
         assert result.pages == 3  # ceil(12/5) = 3
 
-    def test_get_flashcards_empty_result(self):
+    @pytest.mark.asyncio
+    async def test_get_flashcards_empty_result(self):
         """Test handling empty flashcards result."""
         # Arrange
         params = ListFlashcardsQueryParams()
 
         mock_response = Mock()
         mock_response.data = None  # Supabase returns None for empty results
-        mock_count_response = Mock()
-        mock_count_response.count = 0
+        mock_response.count = 0
 
         # Setup mocking
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.execute.return_value = (
-            mock_response
-        )
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_count_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
         )
 
         # Act
-        result = self.service.get_flashcards_for_user(self.user_id, params)
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
 
         # Assert
         assert result.total == 0
         assert len(result.items) == 0
         assert result.pages == 1
 
-    def test_get_flashcards_database_error(self):
+    @pytest.mark.asyncio
+    async def test_get_flashcards_page_past_end(self):
+        """Test that a page past the last row is empty and still counted."""
+        # Arrange
+        params = ListFlashcardsQueryParams(
+            status=FlashcardStatusEnum.ACTIVE, page=9, size=5
+        )
+
+        mock_filtered = (
+            self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        )
+        mock_filtered.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            side_effect=APIError(
+                {"code": "PGRST103", "message": "Requested range not satisfiable"}
+            )
+        )
+        mock_count_response = Mock()
+        mock_count_response.count = 7
+        mock_filtered.execute = AsyncMock(return_value=mock_count_response)
+
+        # Act
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
+
+        # Assert
+        assert result.items == []
+        assert result.has_more is False
+        assert result.total == 7
+        assert result.pages == 2
+        self.mock_supabase.table.return_value.select.assert_called_with(
+            "id", count="exact", head=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_database_error(self):
         """Test handling database errors."""
         # Arrange
         params = ListFlashcardsQueryParams()
@@ -193,10 +212,137 @@ class TestFlashcardServiceGetFlashcardsForUser:
 
         # Act & Assert
         with pytest.raises(Exception) as exc_info:
-            self.service.get_flashcards_for_user(self.user_id, params)
+            await self.service.get_flashcards_for_user(self.user_id, params)
 
         assert "Database connection error" in str(exc_info.value)
 
+    def _list_chain(self) -> Mock:
+        """Return the ordered main-query mock for the cursor (keyset) chain."""
+        return (
+            self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.or_.return_value.limit.return_value.order.return_value.order.return_value
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_next_cursor_when_more_rows(self):
+        """Test that an extra row yields a next_cursor and is not returned."""
+        # Arrange
+        params = ListFlashcardsQueryParams(size=1)
+
+        mock_response = Mock()
+        mock_response.data = self.sample_flashcards
+        mock_response.count = 2
+
+        select_eq = self.mock_supabase.table.return_value.select.return_value.eq
+        select_eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
+
+        # Assert
+        assert len(result.items) == 1
+        assert result.next_cursor is not None
+        created_at, flashcard_id = self.service._decode_cursor(result.next_cursor)
+        assert created_at == self.sample_flashcards[0]["created_at"]
+        assert flashcard_id == self.sample_flashcards[0]["id"]
+        select_eq.return_value.eq.return_value.limit.assert_called_once_with(2)
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_with_cursor_uses_keyset_filter(self):
+        """Test that a cursor replaces the offset with a keyset filter."""
+        # Arrange
+        cursor = self.service._encode_cursor(
+            "2024-01-02T00:00:00+00:00", self.sample_flashcards[1]["id"]
+        )
+        params = ListFlashcardsQueryParams(size=5, after=cursor)
+
+        mock_response = Mock()
+        mock_response.data = self.sample_flashcards
+        mock_response.count = 2
+
+        self._list_chain().execute = AsyncMock(return_value=mock_response)
+
+        # Act
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
+
+        # Assert
+        assert len(result.items) == 2
+        assert result.next_cursor is None
+        status_query = (
+            self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        )
+        or_filter = status_query.or_.call_args[0][0]
+        assert 'created_at.lt."2024-01-02T00:00:00+00:00"' in or_filter
+        assert f"id.lt.{self.sample_flashcards[1]['id']}" in or_filter
+        status_query.offset.assert_not_called()
+        status_query.or_.return_value.limit.assert_called_once_with(6)
+        status_query.or_.return_value.limit.return_value.order.assert_called_once_with(
+            "created_at", desc=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_without_count(self):
+        """Test that count=none skips the total and reports has_more."""
+        # Arrange
+        params = ListFlashcardsQueryParams(size=1, count=CountStrategyEnum.NONE)
+
+        mock_response = Mock()
+        mock_response.data = self.sample_flashcards
+        mock_response.count = None
+
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
+
+        # Assert
+        assert result.total is None
+        assert result.pages is None
+        assert result.has_more is True
+        assert len(result.items) == 1
+        self.mock_supabase.table.return_value.select.assert_called_once_with(
+            "*", count=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_planned_count(self):
+        """Test that the requested count strategy is passed to PostgREST."""
+        # Arrange
+        params = ListFlashcardsQueryParams(count=CountStrategyEnum.PLANNED)
+
+        mock_response = Mock()
+        mock_response.data = self.sample_flashcards
+        mock_response.count = 40
+
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.offset.return_value.order.return_value.order.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        result = await self.service.get_flashcards_for_user(self.user_id, params)
+
+        # Assert
+        assert result.total == 40
+        assert result.pages == 2
+        self.mock_supabase.table.return_value.select.assert_called_once_with(
+            "*", count="planned"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_flashcards_invalid_cursor(self):
+        """Test that a malformed cursor raises ValueError before querying."""
+        # Arrange
+        params = ListFlashcardsQueryParams(after="not-a-cursor")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await self.service.get_flashcards_for_user(self.user_id, params)
+
+        self.mock_supabase.table.assert_not_called()
+
 
 class TestFlashcardServiceUpdateFlashcard:
     """Test suite for FlashcardService.update_flashcard method."""
@@ -219,7 +365,8 @@ class TestFlashcardServiceUpdateFlashcard:
             "updated_at": "2024-01-01T00:00:00.000Z",
         }
 
-    def test_update_flashcard_content_success(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_content_success(self):
         """Test successful content update of a flashcard."""
         # Arrange
         updates = {
@@ -244,24 +391,27 @@ class TestFlashcardServiceUpdateFlashcard:
         self.mock_supabase.table.return_value = mock_table
 
         # First call for getting current flashcard
-        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Second call for updating flashcard
-        mock_table.update.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_update_response
+        mock_table.update.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_update_response)
         )
 
         # Act
-        result = self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+        result = await self.service.update_flashcard(
+            self.flashcard_id, self.user_id, updates
+        )
 
         # Assert
         assert result is not None
         assert result["front_content"] == "Updated question"
         assert result["back_content"] == "Updated answer"
 
-    def test_update_flashcard_ai_status_to_active(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_ai_status_to_active(self):
         """Test updating AI suggestion flashcard status from pending_review to active."""
         # Arrange
         ai_flashcard = self.sample_flashcard.copy()
@@ -284,54 +434,29 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_update_response = Mock()
         mock_update_response.data = [updated_flashcard]
 
-        # Mock AI generation event update
-        mock_ai_event = {
-            "id": str(uuid.uuid4()),
-            "accepted_cards_count": 0,
-            "rejected_cards_count": 0,
-        }
-        mock_ai_event_response = Mock()
-        mock_ai_event_response.data = [mock_ai_event]
-
-        mock_ai_update_response = Mock()
-        mock_ai_update_response.data = [{"accepted_cards_count": 1}]
-
         # Setup method chaining
-        mock_table = Mock()
-        self.mock_supabase.table.return_value = mock_table
-
-        # Mock call sequence
-        call_count = 0
-
-        def mock_table_calls(table_name):
-            nonlocal call_count
-            call_count += 1
-            if call_count <= 2:  # First two calls for flashcard operations
-                mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-                    mock_get_response
-                )
-                mock_table.update.return_value.eq.return_value.eq.return_value.execute.return_value = (
-                    mock_update_response
-                )
-            else:  # Subsequent calls for AI event operations
-                mock_table.select.return_value.eq.return_value.limit.return_value.execute.return_value = (
-                    mock_ai_event_response
-                )
-                mock_table.update.return_value.eq.return_value.execute.return_value = (
-                    mock_ai_update_response
-                )
-            return mock_table
-
-        self.mock_supabase.table.side_effect = mock_table_calls
+        mock_table = self.mock_supabase.table.return_value
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
+        )
+        mock_table.update.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_update_response)
+        )
 
         # Act
-        result = self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+        result = await self.service.update_flashcard(
+            self.flashcard_id, self.user_id, updates
+        )
 
         # Assert
         assert result is not None
         assert result["status"] == "active"
+        # Counters are updated by a database trigger, not by extra queries
+        table_names = [call[0][0] for call in self.mock_supabase.table.call_args_list]
+        assert table_names == ["flashcards", "flashcards"]
 
-    def test_update_flashcard_invalid_status_transition(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_invalid_status_transition(self):
         """Test invalid status transition raises ValueError."""
         # Arrange
         updates = {"status": "rejected"}  # Manual flashcards can't have rejected status
@@ -340,17 +465,20 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_get_response.data = [self.sample_flashcard]
 
         # Setup method chaining
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+            await self.service.update_flashcard(
+                self.flashcard_id, self.user_id, updates
+            )
 
         assert "Invalid status transition" in str(exc_info.value)
 
-    def test_update_flashcard_content_too_long(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_content_too_long(self):
         """Test content length validation."""
         # Arrange
         updates = {"front_content": "x" * 501}  # Exceeds 500 char limit
@@ -358,17 +486,20 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_get_response = Mock()
         mock_get_response.data = [self.sample_flashcard]
 
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+            await self.service.update_flashcard(
+                self.flashcard_id, self.user_id, updates
+            )
 
         assert "exceeds maximum length" in str(exc_info.value)
 
-    def test_update_flashcard_malicious_content(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_malicious_content(self):
         """Test protection against malicious content."""
         # Arrange
         updates = {"front_content": "What is <script>alert('xss')</script>?"}
@@ -376,28 +507,34 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_get_response = Mock()
         mock_get_response.data = [self.sample_flashcard]
 
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+            await self.service.update_flashcard(
+                self.flashcard_id, self.user_id, updates
+            )
 
         assert "potentially unsafe content" in str(exc_info.value)
 
-    def test_update_flashcard_empty_updates(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_empty_updates(self):
         """Test that empty updates dictionary raises ValueError."""
         # Arrange
         updates = {}
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+            await self.service.update_flashcard(
+                self.flashcard_id, self.user_id, updates
+            )
 
         assert "At least one field must be provided" in str(exc_info.value)
 
-    def test_update_flashcard_not_found(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_not_found(self):
         """Test updating non-existent flashcard returns None."""
         # Arrange
         updates = {"front_content": "New content"}
@@ -405,17 +542,20 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_get_response = Mock()
         mock_get_response.data = []  # Empty result
 
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act
-        result = self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+        result = await self.service.update_flashcard(
+            self.flashcard_id, self.user_id, updates
+        )
 
         # Assert
         assert result is None
 
-    def test_update_flashcard_invalid_enum_status(self):
+    @pytest.mark.asyncio
+    async def test_update_flashcard_invalid_enum_status(self):
         """Test invalid enum status value raises ValueError."""
         # Arrange
         updates = {"status": "invalid_status"}
@@ -423,13 +563,15 @@ class TestFlashcardServiceUpdateFlashcard:
         mock_get_response = Mock()
         mock_get_response.data = [self.sample_flashcard]
 
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.update_flashcard(self.flashcard_id, self.user_id, updates)
+            await self.service.update_flashcard(
+                self.flashcard_id, self.user_id, updates
+            )
 
         assert "Invalid status" in str(exc_info.value)
         assert "invalid_status" in str(exc_info.value)
@@ -456,7 +598,8 @@ class TestFlashcardServiceDeleteFlashcard:
             "updated_at": "2024-01-01T00:00:00.000Z",
         }
 
-    def test_delete_flashcard_success(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_success(self):
         """Test successful deletion of a flashcard."""
         # Arrange
         # Mock current flashcard retrieval (ownership verification)
@@ -472,39 +615,45 @@ class TestFlashcardServiceDeleteFlashcard:
         self.mock_supabase.table.return_value = mock_table
 
         # First call for getting current flashcard (ownership verification)
-        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Second call for deleting flashcard
-        mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_delete_response
+        mock_table.delete.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_delete_response)
         )
 
         # Act
-        result = self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+        result = await self.service.delete_flashcard_by_id(
+            self.flashcard_id, self.user_id
+        )
 
         # Assert
         assert result is True
 
-    def test_delete_flashcard_not_found(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_not_found(self):
         """Test deleting non-existent flashcard returns False."""
         # Arrange
         mock_get_response = Mock()
         mock_get_response.data = []  # Empty result - flashcard not found
 
         # Setup method chaining
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act
-        result = self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+        result = await self.service.delete_flashcard_by_id(
+            self.flashcard_id, self.user_id
+        )
 
         # Assert
         assert result is False
 
-    def test_delete_flashcard_wrong_user(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_wrong_user(self):
         """Test that user can't delete another user's flashcard."""
         # Arrange
         other_user_flashcard = self.sample_flashcard.copy()
@@ -514,61 +663,72 @@ class TestFlashcardServiceDeleteFlashcard:
         mock_get_response.data = [other_user_flashcard]
 
         # Setup method chaining
-        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
 
         # Act
-        result = self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+        result = await self.service.delete_flashcard_by_id(
+            self.flashcard_id, self.user_id
+        )
 
         # Assert
         assert result is False
 
-    def test_delete_flashcard_invalid_user_id(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_invalid_user_id(self):
         """Test that invalid user ID raises ValueError."""
         # Arrange
         invalid_user_id = None
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.delete_flashcard_by_id(self.flashcard_id, invalid_user_id)
+            await self.service.delete_flashcard_by_id(
+                self.flashcard_id, invalid_user_id
+            )
 
         assert "User ID is required" in str(exc_info.value)
 
-    def test_delete_flashcard_invalid_flashcard_id(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_invalid_flashcard_id(self):
         """Test that invalid flashcard ID raises ValueError."""
         # Arrange
         invalid_flashcard_id = None
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.delete_flashcard_by_id(invalid_flashcard_id, self.user_id)
+            await self.service.delete_flashcard_by_id(
+                invalid_flashcard_id, self.user_id
+            )
 
         assert "Flashcard ID is required" in str(exc_info.value)
 
-    def test_delete_flashcard_nil_uuid(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_nil_uuid(self):
         """Test that nil UUID user ID raises ValueError."""
         # Arrange
         nil_uuid = uuid.UUID("00000000-0000-0000-0000-000000000000")
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            self.service.delete_flashcard_by_id(self.flashcard_id, nil_uuid)
+            await self.service.delete_flashcard_by_id(self.flashcard_id, nil_uuid)
 
         assert "Invalid user ID provided" in str(exc_info.value)
 
-    def test_delete_flashcard_database_error_during_verification(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_database_error_during_verification(self):
         """Test handling database error during ownership verification."""
         # Arrange
         self.mock_supabase.table.side_effect = Exception("Database connection error")
 
         # Act & Assert
         with pytest.raises(Exception) as exc_info:
-            self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+            await self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
 
         assert "Database connection error" in str(exc_info.value)
 
-    def test_delete_flashcard_deletion_operation_no_effect(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_deletion_operation_no_effect(self):
         """Test handling case where DELETE operation affects no records."""
         # Arrange
         # Mock successful ownership verification
@@ -583,20 +743,23 @@ class TestFlashcardServiceDeleteFlashcard:
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
 
-        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
-        mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_delete_response
+        mock_table.delete.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_delete_response)
         )
 
         # Act
-        result = self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+        result = await self.service.delete_flashcard_by_id(
+            self.flashcard_id, self.user_id
+        )
 
         # Assert
         assert result is False
 
-    def test_delete_flashcard_wrong_record_deleted_security_error(self):
+    @pytest.mark.asyncio
+    async def test_delete_flashcard_wrong_record_deleted_security_error(self):
         """Test security error when wrong flashcard ID is returned from DELETE."""
         # Arrange
         # Mock successful ownership verification
@@ -613,20 +776,21 @@ class TestFlashcardServiceDeleteFlashcard:
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
 
-        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
-        mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_delete_response
+        mock_table.delete.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_delete_response)
         )
 
         # Act & Assert
         with pytest.raises(Exception) as exc_info:
-            self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+            await self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
 
         assert "Critical security error during deletion" in str(exc_info.value)
 
-    def test_delete_ai_suggestion_flashcard_with_source_text(self):
+    @pytest.mark.asyncio
+    async def test_delete_ai_suggestion_flashcard_with_source_text(self):
         """Test deleting AI suggestion flashcard with source text ID."""
         # Arrange
         ai_flashcard = self.sample_flashcard.copy()
@@ -649,15 +813,206 @@ class TestFlashcardServiceDeleteFlashcard:
         mock_table = Mock()
         self.mock_supabase.table.return_value = mock_table
 
-        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = (
-            mock_get_response
+        mock_table.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute = AsyncMock(
+            return_value=mock_get_response
         )
-        mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            mock_delete_response
+        mock_table.delete.return_value.eq.return_value.eq.return_value.execute = (
+            AsyncMock(return_value=mock_delete_response)
         )
 
         # Act
-        result = self.service.delete_flashcard_by_id(self.flashcard_id, self.user_id)
+        result = await self.service.delete_flashcard_by_id(
+            self.flashcard_id, self.user_id
+        )
 
         # Assert
         assert result is True
+
+
+class TestFlashcardServiceBulkUpdateStatus:
+    """Test suite for FlashcardService.bulk_update_status method."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = FlashcardService(self.mock_supabase)
+        self.user_id = uuid.uuid4()
+        self.pending_ids = [uuid.uuid4(), uuid.uuid4()]
+        self.manual_id = uuid.uuid4()
+        self.current_rows = [
+            {
+                "id": str(flashcard_id),
+                "source": "ai_suggestion",
+                "status": "pending_review",
+            }
+            for flashcard_id in self.pending_ids
+        ] + [{"id": str(self.manual_id), "source": "manual", "status": "active"}]
+
+    def _mock_current(self, rows: list) -> None:
+        """Mock the single query that reads current statuses."""
+        mock_response = Mock()
+        mock_response.data = rows
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.in_.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+    def _mock_update(self, updated_ids: list) -> None:
+        """Mock the bulk update RPC returning the updated rows."""
+        mock_response = Mock()
+        mock_response.data = [{"id": str(flashcard_id)} for flashcard_id in updated_ids]
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_single_read_and_update(self):
+        """Test that all valid changes are sent in one RPC call."""
+        # Arrange
+        self._mock_current(self.current_rows[:2])
+        self._mock_update(self.pending_ids)
+        items = [
+            FlashcardBulkStatusItem(id=self.pending_ids[0], status="active"),
+            FlashcardBulkStatusItem(id=self.pending_ids[1], status="rejected"),
+        ]
+
+        # Act
+        result = await self.service.bulk_update_status(self.user_id, items)
+
+        # Assert
+        assert result.updated == 2
+        assert result.failed == 0
+        assert [r.status for r in result.results] == ["active", "rejected"]
+        self.mock_supabase.table.assert_called_once_with("flashcards")
+        self.mock_supabase.rpc.assert_called_once()
+        rpc_name, rpc_params = self.mock_supabase.rpc.call_args[0]
+        assert rpc_name == "bulk_update_flashcard_status"
+        assert rpc_params["p_user_id"] == str(self.user_id)
+        assert rpc_params["p_changes"] == [
+            {
+                "id": str(self.pending_ids[0]),
+                "from_status": "pending_review",
+                "to_status": "active",
+            },
+            {
+                "id": str(self.pending_ids[1]),
+                "from_status": "pending_review",
+                "to_status": "rejected",
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_reports_invalid_items(self):
+        """Test that missing, invalid and duplicate items fail individually."""
+        # Arrange
+        missing_id = uuid.uuid4()
+        self._mock_current(self.current_rows)
+        self._mock_update([self.pending_ids[0]])
+        items = [
+            FlashcardBulkStatusItem(id=self.pending_ids[0], status="active"),
+            FlashcardBulkStatusItem(id=self.manual_id, status="rejected"),
+            FlashcardBulkStatusItem(id=missing_id, status="active"),
+            FlashcardBulkStatusItem(id=self.pending_ids[0], status="rejected"),
+        ]
+
+        # Act
+        result = await self.service.bulk_update_status(self.user_id, items)
+
+        # Assert
+        assert result.updated == 1
+        assert result.failed == 3
+        assert result.results[0].success is True
+        assert "Invalid status transition" in result.results[1].error
+        assert result.results[1].status == "active"
+        assert result.results[2].error == "Flashcard not found"
+        assert result.results[3].error == "Duplicate flashcard id in request"
+        assert len(self.mock_supabase.rpc.call_args[0][1]["p_changes"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_concurrent_modification(self):
+        """Test that rows not updated by the RPC are reported as conflicts."""
+        # Arrange
+        self._mock_current(self.current_rows[:2])
+        self._mock_update([self.pending_ids[0]])
+        items = [
+            FlashcardBulkStatusItem(id=flashcard_id, status="active")
+            for flashcard_id in self.pending_ids
+        ]
+
+        # Act
+        result = await self.service.bulk_update_status(self.user_id, items)
+
+        # Assert
+        assert result.updated == 1
+        assert result.failed == 1
+        assert result.results[1].error == "Flashcard was modified concurrently"
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_without_changes_skips_rpc(self):
+        """Test that no update is issued when nothing changes."""
+        # Arrange
+        self._mock_current(self.current_rows[2:])
+        items = [FlashcardBulkStatusItem(id=self.manual_id, status="active")]
+
+        # Act
+        result = await self.service.bulk_update_status(self.user_id, items)
+
+        # Assert
+        assert result.updated == 0
+        assert result.failed == 0
+        self.mock_supabase.rpc.assert_not_called()
+
+
+class TestFlashcardServiceCreateManualFlashcard:
+    """Test suite for FlashcardService.create_manual_flashcard method."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.user_id = uuid.uuid4()
+        self.data = FlashcardManualCreateRequest(
+            front_content="Question", back_content="Answer"
+        )
+        self.created_flashcard = {
+            "id": str(uuid.uuid4()),
+            "user_id": str(self.user_id),
+            "front_content": "Question",
+            "back_content": "Answer",
+        }
+        mock_response = Mock()
+        mock_response.data = [self.created_flashcard]
+        self.mock_supabase.table.return_value.insert.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+        self.mock_supabase.table.return_value.upsert.return_value.execute = AsyncMock(
+            return_value=Mock(data=[])
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_relies_on_repetition_trigger(self):
+        """Test that only the flashcard is inserted when the trigger is used."""
+        # Arrange
+        service = FlashcardService(self.mock_supabase, use_repetition_trigger=True)
+
+        # Act
+        result = await service.create_manual_flashcard(self.user_id, self.data)
+
+        # Assert
+        assert result == self.created_flashcard
+        self.mock_supabase.table.assert_called_once_with("flashcards")
+
+    @pytest.mark.asyncio
+    async def test_create_inserts_repetition_without_trigger(self):
+        """Test that the legacy path inserts the repetition record, skipping duplicates."""
+        # Arrange
+        service = FlashcardService(self.mock_supabase, use_repetition_trigger=False)
+
+        # Act
+        await service.create_manual_flashcard(self.user_id, self.data)
+
+        # Assert
+        self.mock_supabase.table.assert_called_with("user_flashcard_spaced_repetition")
+        upsert_kwargs = self.mock_supabase.table.return_value.upsert.call_args[1]
+        assert upsert_kwargs == {
+            "on_conflict": "user_id,flashcard_id",
+            "ignore_duplicates": True,
+        }
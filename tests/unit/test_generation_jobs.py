@@ -0,0 +1,177 @@
+import asyncio
+import time
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
+
+import jwt
+import pytest
+
+from src.dtos import AIGenerateFlashcardsRequest, AIGenerationJobStatusEnum
+from src.services.ai_service import AIServiceError
+from src.services.generation_jobs import GenerationJobQueue, GenerationJobQueueError
+
+
+class TestGenerationJobQueue:
+    """Test suite for the background AI generation job queue."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_id = uuid.uuid4()
+        self.request = AIGenerateFlashcardsRequest(text_content="x" * 1000)
+        self.result = Mock()
+        self.result.suggested_flashcards = [Mock(), Mock()]
+        self.ai_service = Mock()
+        self.ai_service.generate_flashcards_from_text = AsyncMock(
+            return_value=self.result
+        )
+        self.queue = GenerationJobQueue(
+            concurrency=2,
+            max_queue_size=2,
+            result_ttl=60,
+            service_factory=lambda supabase: self.ai_service,
+        )
+        self.invalidate_patch = patch(
+            "src.services.generation_jobs.dashboard_stats_cache.invalidate",
+            AsyncMock(),
+        )
+        self.invalidate = self.invalidate_patch.start()
+
+    def teardown_method(self):
+        """Stop patches."""
+        self.invalidate_patch.stop()
+
+    async def _wait_finished(self, job):
+        """Poll until the job has finished."""
+        for _ in range(100):
+            if job.finished_at is not None:
+                return
+            await asyncio.sleep(0.001)
+        raise AssertionError("job did not finish")
+
+    @pytest.mark.asyncio
+    async def test_job_runs_in_background(self):
+        """Test that a submitted job is processed and its result stored."""
+        # Arrange
+        self.queue.start()
+
+        # Act
+        job = self.queue.submit(self.request, self.user_id, Mock())
+        assert job.status == AIGenerationJobStatusEnum.QUEUED
+        await self._wait_finished(job)
+
+        # Assert
+        assert job.status == AIGenerationJobStatusEnum.SUCCEEDED
+        assert job.result is self.result
+        assert job.supabase is None
+        self.ai_service.generate_flashcards_from_text.assert_awaited_once_with(
+            request=self.request, user_id=self.user_id
+        )
+        self.invalidate.assert_awaited_once_with(self.user_id)
+        await self.queue.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_exposes_safe_error(self):
+        """Test that failures are recorded without internal details."""
+        self.ai_service.generate_flashcards_from_text = AsyncMock(
+            side_effect=AIServiceError(
+                operation="generate_flashcards_from_text",
+                details="LLM service failed: API error: secret upstream detail",
+            )
+        )
+        self.queue.start()
+
+        job = self.queue.submit(self.request, self.user_id, Mock())
+        await self._wait_finished(job)
+
+        assert job.status == AIGenerationJobStatusEnum.FAILED
+        assert "temporarily unavailable" in job.error
+        assert "secret" not in job.error
+        assert self.queue.get_metrics()["failed"] == 1
+        await self.queue.aclose()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_bounded(self):
+        """Test that submissions beyond the queue size are refused."""
+        release = asyncio.Event()
+
+        async def blocked(**kwargs):
+            await release.wait()
+            return self.result
+
+        self.ai_service.generate_flashcards_from_text = AsyncMock(side_effect=blocked)
+        self.queue.start()
+
+        # Two jobs occupy the workers, two more fill the queue
+        jobs = [self.queue.submit(self.request, self.user_id, Mock()) for _ in range(2)]
+        await asyncio.sleep(0)
+        jobs += [
+            self.queue.submit(self.request, self.user_id, Mock()) for _ in range(2)
+        ]
+
+        with pytest.raises(GenerationJobQueueError):
+            self.queue.submit(self.request, self.user_id, Mock())
+
+        metrics = self.queue.get_metrics()
+        assert metrics["in_progress"] == 2
+        assert metrics["queued"] == 2
+        assert metrics["rejected"] == 1
+
+        release.set()
+        for job in jobs:
+            await self._wait_finished(job)
+        await self.queue.aclose()
+
+    @pytest.mark.asyncio
+    async def test_jobs_visible_only_to_owner(self):
+        """Test that another user cannot read a job."""
+        self.queue.start()
+
+        job = self.queue.submit(self.request, self.user_id, Mock())
+
+        assert self.queue.get(job.id, self.user_id) is job
+        assert self.queue.get(job.id, uuid.uuid4()) is None
+        await self.queue.aclose()
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        """Test that finished jobs are dropped after the result TTL."""
+        self.queue.start()
+        job = self.queue.submit(self.request, self.user_id, Mock())
+        await self._wait_finished(job)
+
+        with patch(
+            "src.services.generation_jobs.time.monotonic",
+            return_value=job.expires_at + 1,
+        ):
+            assert self.queue.get(job.id, self.user_id) is None
+        await self.queue.aclose()
+
+    @pytest.mark.asyncio
+    async def test_job_with_expiring_token_fails_before_generation(self):
+        """Test that a token expiring in the queue fails the job without an LLM call."""
+        # Arrange
+        self.queue.start()
+        fresh_token = jwt.encode({"exp": int(time.time()) + 3600}, "k", "HS256")
+        expiring_token = jwt.encode({"exp": int(time.time()) + 30}, "k", "HS256")
+
+        # Act
+        fresh_job = self.queue.submit(
+            self.request, self.user_id, Mock(), access_token=fresh_token
+        )
+        expiring_job = self.queue.submit(
+            self.request, self.user_id, Mock(), access_token=expiring_token
+        )
+        await self._wait_finished(fresh_job)
+        await self._wait_finished(expiring_job)
+
+        # Assert
+        assert fresh_job.status == AIGenerationJobStatusEnum.SUCCEEDED
+        assert expiring_job.status == AIGenerationJobStatusEnum.FAILED
+        assert "session expired" in expiring_job.error
+        self.ai_service.generate_flashcards_from_text.assert_awaited_once()
+        await self.queue.aclose()
+
+    def test_submit_requires_running_workers(self):
+        """Test that jobs are refused before the workers are started."""
+        with pytest.raises(GenerationJobQueueError):
+            self.queue.submit(self.request, self.user_id, Mock())
@@ -0,0 +1,141 @@
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.dtos import LLMFlashcardSuggestion, LLMGenerateResponse
+from src.services.llm_cache import LLMGenerationCache, make_cache_key
+
+
+def make_response(model: str = "test-model") -> LLMGenerateResponse:
+    """Build a parsed LLM response."""
+    return LLMGenerateResponse(
+        flashcards=[LLMFlashcardSuggestion(front_content="Q1", back_content="A1")],
+        model_used=model,
+        cost=0.002,
+    )
+
+
+class TestMakeCacheKey:
+    """Test suite for content-addressed cache keys."""
+
+    params = {"temperature": 0.7, "top_p": 0.9}
+
+    def test_whitespace_variants_share_key(self):
+        """Test that whitespace-only differences map to the same key."""
+        reordered_params = {"top_p": 0.9, "temperature": 0.7}
+
+        first = make_cache_key(
+            "Photosynthesis  is\n a process.", "m", "v1", self.params
+        )
+        second = make_cache_key(
+            "  Photosynthesis is a\tprocess.  ", "m", "v1", reordered_params
+        )
+
+        assert first == second
+
+    def test_generation_inputs_change_key(self):
+        """Test that model, prompt version and sampling params are part of the key."""
+        base = make_cache_key("text", "m", "v1", self.params)
+
+        assert make_cache_key("text", "other", "v1", self.params) != base
+        assert make_cache_key("text", "m", "v2", self.params) != base
+        assert make_cache_key("text", "m", "v1", {"temperature": 0.2}) != base
+        assert make_cache_key("Text", "m", "v1", self.params) != base
+
+
+class TestLLMGenerationCache:
+    """Test suite for the two-tier LLM generation cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = LLMGenerationCache(max_size=2, ttl=60)
+        self.mock_supabase = Mock()
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_table(self):
+        """Test that stored entries are served from memory."""
+        await self.cache.set("key", make_response(), "v1")
+
+        result = await self.cache.get("key", self.mock_supabase)
+
+        assert result.model_used == "test-model"
+        self.mock_supabase.rpc.assert_not_called()
+        assert self.cache.get_metrics()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_table_hit_populates_memory(self):
+        """Test that a table hit is validated and kept in memory."""
+        table_response = Mock()
+        table_response.data = make_response().model_dump(mode="json")
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=table_response
+        )
+
+        first = await self.cache.get("key", self.mock_supabase)
+        second = await self.cache.get("key", self.mock_supabase)
+
+        assert first == second
+        self.mock_supabase.rpc.assert_called_once_with(
+            "get_llm_generation_cache", {"p_cache_key": "key"}
+        )
+        metrics = self.cache.get_metrics()
+        assert metrics["table_hits"] == 1
+        assert metrics["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_writes_table_row(self):
+        """Test that set() stores the response with the configured TTL."""
+        self.mock_supabase.rpc.return_value.execute = AsyncMock()
+
+        await self.cache.set("key", make_response(), "v1", self.mock_supabase)
+
+        rpc_name, rpc_params = self.mock_supabase.rpc.call_args[0]
+        assert rpc_name == "put_llm_generation_cache"
+        assert rpc_params["p_cache_key"] == "key"
+        assert rpc_params["p_prompt_version"] == "v1"
+        assert rpc_params["p_ttl_seconds"] == 60
+        assert "cache_hit" not in rpc_params["p_response"]
+
+    @pytest.mark.asyncio
+    async def test_table_errors_are_misses(self):
+        """Test that table failures never propagate."""
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=Exception("permission denied")
+        )
+
+        assert await self.cache.get("key", self.mock_supabase) is None
+        await self.cache.set("key", make_response(), "v1", self.mock_supabase)
+
+        metrics = self.cache.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["table_errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses(self):
+        """Test that memory entries expire after the TTL."""
+        await self.cache.set("key", make_response(), "v1")
+
+        with patch("src.services.llm_cache.time.time", return_value=time.time() + 61):
+            assert await self.cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_bounded(self):
+        """Test that the least recently used entry is evicted."""
+        await self.cache.set("a", make_response(), "v1")
+        await self.cache.set("b", make_response(), "v1")
+        await self.cache.get("a")
+        await self.cache.set("c", make_response(), "v1")
+
+        assert await self.cache.get("b") is None
+        assert await self.cache.get("a") is not None
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache(self):
+        """Test that a disabled cache neither stores nor returns entries."""
+        cache = LLMGenerationCache(enabled=False)
+
+        await cache.set("key", make_response(), "v1", self.mock_supabase)
+
+        assert await cache.get("key", self.mock_supabase) is None
+        self.mock_supabase.rpc.assert_not_called()
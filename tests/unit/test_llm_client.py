@@ -0,0 +1,329 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import openai
+import pytest
+
+from src.core.config import LLMRoute, settings
+from src.services.llm_client import LLMClient, LLMServiceError, get_llm_client
+from src.services.llm_resilience import CircuitBreaker, RetryPolicy
+from src.services.llm_scheduler import LLMScheduler
+
+
+class TestLLMClientLifecycle:
+    """Test suite for the shared LLMClient connection lifecycle."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.settings = settings.model_copy(
+            update={
+                "OPENROUTER_API_KEY": "test-key",
+                "LLM_HTTP2": False,
+                "LLM_MAX_CONNECTIONS": 7,
+                "LLM_MAX_KEEPALIVE_CONNECTIONS": 3,
+            }
+        )
+        self.llm_client = LLMClient(self.settings)
+
+    @pytest.mark.asyncio
+    async def test_start_reuses_client(self):
+        """Test that repeated start() calls keep the same client and pool."""
+        self.llm_client.start()
+        client = self.llm_client.client
+        http_client = self.llm_client._http_client
+
+        self.llm_client.start()
+
+        assert self.llm_client.client is client
+        assert self.llm_client._http_client is http_client
+        assert client._client is http_client
+
+        await self.llm_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_from_settings(self):
+        """Test that connection limits come from settings."""
+        self.llm_client.start()
+
+        pool = self.llm_client._http_client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+
+        await self.llm_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_then_start_recreates_client(self):
+        """Test that a closed client is rebuilt on the next start()."""
+        self.llm_client.start()
+        first = self.llm_client.client
+
+        await self.llm_client.aclose()
+        assert self.llm_client.client is None
+
+        self.llm_client.start()
+        assert self.llm_client.client is not first
+        assert not self.llm_client._http_client.is_closed
+
+        await self.llm_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_generate_requires_started_client(self):
+        """Test that generating without a client raises LLMServiceError."""
+        with pytest.raises(LLMServiceError):
+            await self.llm_client.generate_flashcards("text")
+
+    @pytest.mark.asyncio
+    async def test_get_llm_client_returns_shared_instance(self, monkeypatch):
+        """Test that the dependency hands out the process-wide instance."""
+        from src.services import llm_client as llm_client_module
+
+        shared = LLMClient(self.settings)
+        monkeypatch.setattr(llm_client_module, "llm_client", shared)
+
+        first = await get_llm_client()
+        second = await get_llm_client()
+
+        assert first is shared
+        assert second is shared
+        assert shared.client is not None
+
+        await shared.aclose()
+
+
+def make_status_error(status_code: int) -> openai.APIStatusError:
+    """Build an OpenAI SDK status error."""
+    response = httpx.Response(
+        status_code,
+        request=httpx.Request("POST", "https://example.test/chat/completions"),
+    )
+    return openai.APIStatusError("provider error", response=response, body=None)
+
+
+def make_completion(fronts=("Q1",)):
+    """Build a chat completion with flashcards in the message content."""
+    content = json.dumps(
+        {"flashcards": [{"front_content": f, "back_content": "A"} for f in fronts]}
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None,
+    )
+
+
+class TestLLMClientResilience:
+    """Test suite for retries, circuit breaking and hedging in LLMClient."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.settings = settings.model_copy(
+            update={
+                "LLM_MODEL": "primary-model",
+                "LLM_FALLBACK_MODEL": "fallback-model",
+                "LLM_HEDGE_MIN_SAMPLES": 3,
+                "LLM_HEDGE_PERCENTILE": 0.5,
+            }
+        )
+        self.llm_client = LLMClient(self.settings, scheduler=LLMScheduler())
+        self.llm_client.retry_policy = RetryPolicy(
+            max_attempts=3, base_delay=0, max_delay=0
+        )
+        self.llm_client.circuit_breaker = CircuitBreaker(
+            failure_threshold=3, recovery_timeout=30
+        )
+        self.llm_client.client = Mock()
+        self.create = AsyncMock()
+        self.llm_client.client.chat.completions.create = self.create
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retried(self):
+        """Test that a 503 is retried and the next attempt's result is used."""
+        self.create.side_effect = [make_status_error(503), make_completion()]
+
+        result = await self.llm_client.generate_flashcards("text")
+
+        assert self.create.await_count == 2
+        assert result.flashcards[0].front_content == "Q1"
+        assert self.llm_client.get_metrics()["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test that persistent 429s surface as an api_error after all attempts."""
+        self.create.side_effect = make_status_error(429)
+
+        with pytest.raises(LLMServiceError) as exc_info:
+            await self.llm_client.generate_flashcards("text")
+
+        assert self.create.await_count == 3
+        assert exc_info.value.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self):
+        """Test that a 400 fails at once."""
+        self.create.side_effect = make_status_error(400)
+
+        with pytest.raises(LLMServiceError):
+            await self.llm_client.generate_flashcards("text")
+
+        self.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_timeout_bounds_all_attempts(self):
+        """Test that LLM_TIMEOUT caps the whole call instead of each attempt."""
+        self.llm_client.settings = self.settings.model_copy(
+            update={"LLM_TIMEOUT": 0.05}
+        )
+
+        async def create(model, **kwargs):
+            await asyncio.sleep(1)
+            return make_completion()
+
+        self.create.side_effect = create
+
+        with pytest.raises(LLMServiceError) as exc_info:
+            await asyncio.wait_for(self.llm_client.generate_flashcards("text"), 0.5)
+
+        assert exc_info.value.operation == "timeout"
+        self.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_not_counted_against_deadline(self):
+        """Test that calls queued longer than LLM_TIMEOUT still run and succeed."""
+        self.llm_client.settings = self.settings.model_copy(
+            update={"LLM_TIMEOUT": 0.15}
+        )
+        self.llm_client.scheduler = LLMScheduler(max_concurrency=1)
+
+        async def create(model, **kwargs):
+            await asyncio.sleep(0.1)
+            return make_completion()
+
+        self.create.side_effect = create
+
+        results = await asyncio.gather(
+            *(self.llm_client.generate_flashcards("text") for _ in range(4))
+        )
+
+        assert len(results) == 4
+        assert self.create.await_count == 4
+        assert self.llm_client.circuit_breaker.get_metrics()["state"] == "closed"
+        assert self.llm_client.router.stats("primary-model").errors == 0
+
+    @pytest.mark.asyncio
+    async def test_no_retry_when_backoff_exceeds_deadline(self):
+        """Test that a retry is skipped if its backoff outlasts the time left."""
+        self.llm_client.retry_policy.backoff = Mock(return_value=60.0)
+        self.create.side_effect = [make_status_error(503), make_completion()]
+
+        with pytest.raises(LLMServiceError) as exc_info:
+            await self.llm_client.generate_flashcards("text")
+
+        assert exc_info.value.status_code == 503
+        self.create.assert_awaited_once()
+        assert self.llm_client.get_metrics()["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that calls are refused without reaching the provider when open."""
+        self.create.side_effect = make_status_error(502)
+        with pytest.raises(LLMServiceError):
+            await self.llm_client.generate_flashcards("text")
+        self.create.reset_mock()
+
+        with pytest.raises(LLMServiceError) as exc_info:
+            await self.llm_client.generate_flashcards("text")
+
+        assert exc_info.value.operation == "circuit_open"
+        self.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_call_hedged_with_fallback_model(self):
+        """Test that a call slower than the latency percentile is hedged."""
+        for _ in range(3):
+            self.llm_client.router.stats("primary-model").latency.record(0.01)
+
+        async def create(model, **kwargs):
+            if model == "primary-model":
+                await asyncio.sleep(1)
+                return make_completion(["slow"])
+            return make_completion(["fast"])
+
+        self.create.side_effect = create
+
+        result = await self.llm_client.generate_flashcards("text")
+
+        assert result.model_used == "fallback-model"
+        assert result.flashcards[0].front_content == "fast"
+        metrics = self.llm_client.get_metrics()
+        assert metrics["hedged"] == 1
+        assert metrics["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        """Test that hedging waits for enough latency samples."""
+        self.create.return_value = make_completion()
+
+        result = await self.llm_client.generate_flashcards("text")
+
+        assert result.model_used == "primary-model"
+        assert self.llm_client.get_metrics()["hedged"] == 0
+        assert len(self.llm_client.router.stats("primary-model").latency) == 1
+
+
+class TestLLMClientRouting:
+    """Test suite for per-request model routing in LLMClient."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.settings = settings.model_copy(
+            update={
+                "LLM_ROUTES": [
+                    LLMRoute(model="small-model", max_chars=100),
+                    LLMRoute(model="large-model"),
+                ],
+                "LLM_MODEL_PRICES": {"small-model": (1.0, 2.0)},
+                "LLM_FALLBACK_MODEL": None,
+            }
+        )
+        self.llm_client = LLMClient(self.settings, scheduler=LLMScheduler())
+        self.llm_client.client = Mock()
+        self.create = AsyncMock(return_value=make_completion())
+        self.llm_client.client.chat.completions.create = self.create
+
+    @pytest.mark.asyncio
+    async def test_short_text_routed_to_small_model(self):
+        """Test that the model and its price depend on the text length."""
+        completion = make_completion()
+        completion.usage = SimpleNamespace(
+            prompt_tokens=1_000_000, completion_tokens=1_000_000
+        )
+        self.create.return_value = completion
+
+        result = await self.llm_client.generate_flashcards("short text")
+
+        assert self.create.await_args.kwargs["model"] == "small-model"
+        assert result.model_used == "small-model"
+        assert result.cost == 3.0
+
+    @pytest.mark.asyncio
+    async def test_long_text_routed_to_large_model(self):
+        """Test that a text beyond the small route's limit uses the next route."""
+        result = await self.llm_client.generate_flashcards("x" * 500)
+
+        assert result.model_used == "large-model"
+        assert result.cost is None
+
+    @pytest.mark.asyncio
+    async def test_failures_recorded_per_model(self):
+        """Test that provider errors count against the routed model."""
+        self.llm_client.retry_policy = RetryPolicy(max_attempts=2, max_delay=0)
+        self.create.side_effect = make_status_error(503)
+
+        with pytest.raises(LLMServiceError):
+            await self.llm_client.generate_flashcards("short text")
+
+        stats = self.llm_client.router.get_metrics()["models"]["small-model"]
+        assert stats["requests"] == 2
+        assert stats["errors"] == 2
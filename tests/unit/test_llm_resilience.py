@@ -0,0 +1,127 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import openai
+
+from src.services.llm_resilience import CircuitBreaker, LatencyTracker, RetryPolicy
+
+
+def make_status_error(status_code: int, headers: dict = None) -> openai.APIStatusError:
+    """Build an OpenAI SDK status error."""
+    response = httpx.Response(
+        status_code,
+        headers=headers,
+        request=httpx.Request("POST", "https://example.test/chat/completions"),
+    )
+    return openai.APIStatusError("provider error", response=response, body=None)
+
+
+class TestRetryPolicy:
+    """Test suite for the LLM retry policy."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0)
+
+    def test_transient_errors_are_retryable(self):
+        """Test that rate limits, 5xx, timeouts and connection errors are retried."""
+        request = httpx.Request("POST", "https://example.test")
+
+        assert self.policy.is_retryable(make_status_error(429))
+        assert self.policy.is_retryable(make_status_error(502))
+        assert self.policy.is_retryable(asyncio.TimeoutError())
+        assert self.policy.is_retryable(openai.APITimeoutError(request=request))
+        assert self.policy.is_retryable(openai.APIConnectionError(request=request))
+
+    def test_client_errors_are_not_retryable(self):
+        """Test that rejected requests are not retried."""
+        assert not self.policy.is_retryable(make_status_error(400))
+        assert not self.policy.is_retryable(make_status_error(401))
+        assert not self.policy.is_retryable(ValueError("bad"))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential ceiling."""
+        with patch("src.services.llm_resilience.random.uniform") as uniform:
+            uniform.side_effect = lambda low, high: high
+
+            delays = [self.policy.backoff(retry) for retry in range(1, 6)]
+
+        assert delays == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+    def test_retry_after_header_honoured(self):
+        """Test that Retry-After sets the delay, capped at max_delay."""
+        assert self.policy.backoff(1, make_status_error(429, {"retry-after": "2"})) == 2
+        assert (
+            self.policy.backoff(1, make_status_error(429, {"retry-after": "60"})) == 4
+        )
+
+
+class TestCircuitBreaker:
+    """Test suite for the LLM circuit breaker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the threshold of consecutive failures opens the circuit."""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        assert self.breaker.allow_request()
+
+        self.breaker.record_failure()
+
+        assert self.breaker.state == CircuitBreaker.OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.get_metrics()["rejected"] == 1
+
+    def test_half_open_allows_single_probe(self):
+        """Test that one probe is let through after the recovery timeout."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        with patch(
+            "src.services.llm_resilience.time.monotonic",
+            return_value=self.breaker._opened_at + 11,
+        ):
+            assert self.breaker.state == CircuitBreaker.HALF_OPEN
+            assert self.breaker.allow_request()
+            assert not self.breaker.allow_request()
+
+            self.breaker.record_success()
+
+        assert self.breaker.state == CircuitBreaker.CLOSED
+        assert self.breaker.allow_request()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe opens the circuit again."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        with patch(
+            "src.services.llm_resilience.time.monotonic",
+            return_value=self.breaker._opened_at + 11,
+        ):
+            assert self.breaker.allow_request()
+            self.breaker.record_failure()
+            assert self.breaker.state == CircuitBreaker.OPEN
+
+        assert self.breaker.get_metrics()["opened"] == 2
+
+
+class TestLatencyTracker:
+    """Test suite for latency percentiles."""
+
+    def test_percentile(self):
+        """Test percentile lookup over recorded samples."""
+        tracker = LatencyTracker(window=100)
+        assert tracker.percentile(0.95) is None
+
+        for value in range(1, 101):
+            tracker.record(value / 100)
+
+        assert tracker.percentile(0.5) == 0.51
+        assert tracker.percentile(0.95) == 0.96
+        assert len(tracker) == 100
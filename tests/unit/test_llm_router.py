@@ -0,0 +1,161 @@
+from types import SimpleNamespace
+
+from src.core.config import LLMRoute, settings
+from src.services.llm_router import Histogram, LLMRouter
+
+
+class TestHistogram:
+    """Test suite for the running bucket histogram."""
+
+    def test_observations_bucketed(self):
+        """Test that values land in the bucket of their upper bound."""
+        histogram = Histogram((1.0, 5.0))
+        for value in (0.5, 1.0, 3.0, 9.0):
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.to_dict()["buckets"] == {"le_1": 2, "le_5": 1, "le_inf": 1}
+        assert histogram.max == 9.0
+
+    def test_quantile(self):
+        """Test that quantiles report the bucket bound, capped at the maximum."""
+        histogram = Histogram((1.0, 5.0, 10.0))
+        for value in (0.2, 0.4, 0.6, 4.0):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 1.0
+        assert histogram.quantile(1.0) == 4.0
+        assert Histogram((1.0,)).quantile(0.5) is None
+
+
+class TestLLMRouter:
+    """Test suite for length- and health-aware model routing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.router = LLMRouter(
+            routes=[
+                LLMRoute(model="small", max_chars=1000, max_latency=2.0),
+                LLMRoute(model="large"),
+            ],
+            prices={"small": (0.05, 0.10), "large": (1.0, 2.0)},
+            min_samples=3,
+            probe_interval=60,
+        )
+
+    def test_routes_by_text_length(self):
+        """Test that short texts go to the first route and long ones past it."""
+        assert self.router.choose(500) == "small"
+        assert self.router.choose(5000) == "large"
+        assert self.router.get_metrics()["decisions"] == {"small": 1, "large": 1}
+
+    def test_text_longer_than_every_limit_uses_largest_route(self):
+        """Test that a text beyond all limits goes to the largest route."""
+        router = LLMRouter(
+            routes=[
+                LLMRoute(model="small", max_chars=100),
+                LLMRoute(model="medium", max_chars=1000),
+            ]
+        )
+
+        assert router.choose(5000) == "medium"
+
+    def test_failing_route_skipped(self):
+        """Test that a route with a high error rate is skipped."""
+        for _ in range(5):
+            self.router.record_failure("small")
+
+        assert self.router.choose(500) == "large"
+        assert self.router.rerouted == 1
+        # The length-based preference does not depend on health
+        assert self.router.preferred_model(500) == "small"
+
+    def test_slow_route_skipped(self):
+        """Test that a route slower than its max_latency is skipped."""
+        for _ in range(3):
+            self.router.record_success("small", 5.0, None)
+
+        assert self.router.choose(500) == "large"
+
+    def test_unhealthy_route_probed_after_interval(self):
+        """Test that an unhealthy route gets a call once the interval passed."""
+        for _ in range(5):
+            self.router.record_failure("small")
+        self.router.stats("small").last_attempt_at = -1000.0
+
+        assert self.router.choose(500) == "small"
+        # Only one probe per interval
+        assert self.router.choose(500) == "large"
+
+    def test_no_healthy_route_uses_lowest_expected_latency(self):
+        """Test the fallback when every eligible route is unhealthy."""
+        router = LLMRouter(
+            routes=[
+                LLMRoute(model="a", max_latency=1.0),
+                LLMRoute(model="b", max_latency=1.0),
+            ],
+            min_samples=1,
+            probe_interval=60,
+        )
+        router.record_success("a", 10.0, None)
+        router.record_success("b", 3.0, None)
+        router.stats("a").last_attempt_at = router.stats("b").last_attempt_at = 1e12
+
+        assert router.choose(100) == "b"
+
+    def test_route_without_successes_exceeds_max_latency(self):
+        """Test that failures alone do not satisfy a route's max_latency."""
+        router = LLMRouter(
+            routes=[LLMRoute(model="a", max_latency=5.0), LLMRoute(model="b")],
+            min_samples=2,
+            probe_interval=60,
+        )
+        router.record_failure("a")
+        router.record_failure("a")
+
+        assert router.choose(100) == "b"
+
+    def test_fallback_avoids_route_without_successes(self):
+        """Test that a route that never succeeded is the last resort."""
+        router = LLMRouter(
+            routes=[
+                LLMRoute(model="a", max_latency=1.0),
+                LLMRoute(model="b", max_latency=1.0),
+            ],
+            min_samples=1,
+            probe_interval=60,
+        )
+        router.record_failure("a")
+        router.record_success("b", 3.0, None)
+        router.stats("a").last_attempt_at = router.stats("b").last_attempt_at = 1e12
+
+        assert router.choose(100) == "b"
+
+    def test_cost_uses_model_prices(self):
+        """Test that costs come from the model's prices per million tokens."""
+        usage = SimpleNamespace(prompt_tokens=1_000_000, completion_tokens=500_000)
+
+        assert self.router.calculate_cost(usage, "small") == 0.05 + 0.05
+        assert self.router.calculate_cost(usage, "large") == 1.0 + 1.0
+        assert self.router.calculate_cost(usage, "unknown") is None
+        assert self.router.calculate_cost(None, "small") is None
+
+    def test_success_recorded_in_histograms(self):
+        """Test that latency, throughput and cost are recorded per model."""
+        usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=200)
+
+        self.router.record_success("small", 2.0, usage)
+
+        stats = self.router.get_metrics()["models"]["small"]
+        assert stats["requests"] == 1
+        assert stats["ewma_latency_s"] == 2.0
+        assert stats["tokens_per_second"]["avg"] == 100.0
+        assert stats["cost_usd"]["count"] == 1
+
+    def test_from_settings_defaults_to_llm_model(self):
+        """Test that an empty routing table routes everything to LLM_MODEL."""
+        router = LLMRouter.from_settings(
+            settings.model_copy(update={"LLM_ROUTES": [], "LLM_MODEL": "m"})
+        )
+
+        assert router.choose(10**6) == "m"
@@ -0,0 +1,136 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.services.llm_scheduler import LLMScheduler
+
+
+class TestLLMScheduler:
+    """Test suite for the fair LLM call scheduler."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.user_a = uuid.uuid4()
+        self.user_b = uuid.uuid4()
+        self.order = []
+
+    async def _call(self, scheduler, user_id, label, hold=None):
+        """Take a slot, record the grant order and optionally wait for an event."""
+        async with scheduler.slot(user_id):
+            self.order.append(label)
+            if hold is not None:
+                await hold.wait()
+            else:
+                await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_global_concurrency_cap(self):
+        """Test that no more than max_concurrency calls run at once."""
+        scheduler = LLMScheduler(max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def call(user_id):
+            nonlocal running, peak
+            async with scheduler.slot(user_id):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call(uuid.uuid4()) for _ in range(6)))
+
+        assert peak == 2
+        metrics = scheduler.get_metrics()
+        assert metrics["granted"] == 6
+        assert metrics["delayed"] == 4
+        assert metrics["active"] == 0
+        assert metrics["wait_ms_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_late_user_not_stuck_behind_backlog(self):
+        """Test that a new user is served before a heavy user's queued calls."""
+        # Arrange: user A holds the only slot and queues three more calls
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(
+            self._call(scheduler, self.user_a, "a0", hold=release)
+        )
+        await asyncio.sleep(0)
+        backlog = [
+            asyncio.create_task(self._call(scheduler, self.user_a, f"a{i}"))
+            for i in range(1, 4)
+        ]
+        await asyncio.sleep(0)
+
+        # Act: user B arrives after the backlog
+        late = asyncio.create_task(self._call(scheduler, self.user_b, "b0"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, late, *backlog)
+
+        # Assert
+        assert self.order == ["a0", "b0", "a1", "a2", "a3"]
+
+    @pytest.mark.asyncio
+    async def test_weights_split_slots(self):
+        """Test that a user with weight 2 gets two slots per slot of weight 1."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        scheduler.set_weight(self.user_a, 2.0)
+        release = asyncio.Event()
+        holder = asyncio.create_task(self._call(scheduler, None, "hold", hold=release))
+        await asyncio.sleep(0)
+        calls = []
+        for i in range(4):
+            calls.append(asyncio.create_task(self._call(scheduler, self.user_a, "a")))
+            calls.append(asyncio.create_task(self._call(scheduler, self.user_b, "b")))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *calls)
+
+        # While both users are backlogged, A gets twice as many slots
+        first_six = self.order[1:7]
+        assert first_six.count("a") == 4
+        assert first_six.count("b") == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        """Test that cancelling a queued call does not leak or steal slots."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(
+            self._call(scheduler, self.user_a, "a0", hold=release)
+        )
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(self._call(scheduler, self.user_b, "b0"))
+        waiting = asyncio.create_task(self._call(scheduler, self.user_a, "a1"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(holder, waiting)
+
+        assert self.order == ["a0", "a1"]
+        metrics = scheduler.get_metrics()
+        assert metrics["active"] == 0
+        assert metrics["queued"] == 0
+        assert metrics["cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_scheduler_passes_through(self):
+        """Test that a disabled scheduler neither limits nor counts calls."""
+        scheduler = LLMScheduler(max_concurrency=1, enabled=False)
+
+        await asyncio.gather(
+            *(self._call(scheduler, self.user_a, "a") for _ in range(3))
+        )
+
+        assert len(self.order) == 3
+        assert scheduler.get_metrics()["granted"] == 0
+
+    def test_weight_must_be_positive(self):
+        """Test that zero or negative weights are rejected."""
+        with pytest.raises(ValueError):
+            LLMScheduler().set_weight(self.user_a, 0)
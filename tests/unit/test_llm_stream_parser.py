@@ -0,0 +1,127 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.llm_client import LLMClient, LLMServiceError
+from src.services.llm_stream_parser import IncrementalFlashcardParser
+
+DOCUMENT = json.dumps(
+    {
+        "flashcards": [
+            {"front_content": "What is {x}?", "back_content": 'A "quoted" [value]'},
+            {"front_content": "Q2", "back_content": "Back\\slash"},
+        ]
+    }
+)
+
+
+class TestIncrementalFlashcardParser:
+    """Test suite for the incremental flashcard JSON parser."""
+
+    def test_cards_emitted_when_objects_close(self):
+        """Test that each card is returned by the chunk that closes it."""
+        parser = IncrementalFlashcardParser()
+        first_end = DOCUMENT.index("}, {") + 1
+
+        assert parser.feed(DOCUMENT[: first_end - 1]) == []
+        first = parser.feed(DOCUMENT[first_end - 1 : first_end])
+        rest = parser.feed(DOCUMENT[first_end:])
+
+        assert [card.front_content for card in first] == ["What is {x}?"]
+        assert first[0].back_content == 'A "quoted" [value]'
+        assert [card.back_content for card in rest] == ["Back\\slash"]
+
+    def test_single_character_chunks(self):
+        """Test that arbitrary chunk boundaries give the same result."""
+        parser = IncrementalFlashcardParser()
+
+        cards = []
+        for char in DOCUMENT:
+            cards.extend(parser.feed(char))
+
+        assert [card.front_content for card in cards] == ["What is {x}?", "Q2"]
+
+    def test_code_fences_ignored(self):
+        """Test that text around the JSON document is skipped."""
+        parser = IncrementalFlashcardParser()
+
+        cards = parser.feed("```json\n" + DOCUMENT + "\n```")
+
+        assert len(cards) == 2
+
+    def test_invalid_cards_skipped(self):
+        """Test that elements without both sides are skipped and counted."""
+        parser = IncrementalFlashcardParser()
+        document = json.dumps(
+            {
+                "flashcards": [
+                    {"front_content": "Only front"},
+                    {"front_content": "Q", "back_content": "A"},
+                ]
+            }
+        )
+
+        cards = parser.feed(document)
+
+        assert [card.front_content for card in cards] == ["Q"]
+        assert parser.skipped == 1
+
+
+def make_chunk(content=None, usage=None):
+    """Build a streamed chat completion chunk."""
+    choices = (
+        []
+        if content is None
+        else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+async def iterate(chunks):
+    """Async iterator over prepared chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestLLMFlashcardStream:
+    """Test suite for LLMClient.stream_flashcards."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.llm_client = LLMClient()
+        self.llm_client.client = Mock()
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_cards_and_builds_response(self):
+        """Test that cards stream out and the final response carries the cost."""
+        chunks = [make_chunk(DOCUMENT[i : i + 7]) for i in range(0, len(DOCUMENT), 7)]
+        chunks.append(
+            make_chunk(usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=500))
+        )
+        self.llm_client.client.chat.completions.create = AsyncMock(
+            return_value=iterate(chunks)
+        )
+
+        stream = self.llm_client.stream_flashcards("text")
+        cards = [card async for card in stream]
+
+        assert [card.front_content for card in cards] == ["What is {x}?", "Q2"]
+        assert stream.response.flashcards == cards
+        assert stream.response.cost == pytest.approx(0.0002)
+        call_kwargs = self.llm_client.client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["temperature"] == 0.7
+
+    @pytest.mark.asyncio
+    async def test_stream_without_cards_fails(self):
+        """Test that a stream with no valid card raises LLMServiceError."""
+        self.llm_client.client.chat.completions.create = AsyncMock(
+            return_value=iterate([make_chunk("not json")])
+        )
+
+        with pytest.raises(LLMServiceError) as exc_info:
+            [card async for card in self.llm_client.stream_flashcards("text")]
+
+        assert exc_info.value.operation == "validate_flashcards"
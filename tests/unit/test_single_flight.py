@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for coalescing concurrent calls."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.single_flight = SingleFlight()
+        self.calls = 0
+
+    async def _work(self, result="done", delay=0.01):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return result
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that callers with the same key await the same work."""
+        results = await asyncio.gather(
+            *(self.single_flight.do("key", self._work) for _ in range(5))
+        )
+
+        assert results == ["done"] * 5
+        assert self.calls == 1
+        metrics = self.single_flight.get_metrics()
+        assert metrics["leaders"] == 1
+        assert metrics["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that distinct keys are not coalesced."""
+        await asyncio.gather(
+            self.single_flight.do("a", self._work),
+            self.single_flight.do("b", self._work),
+        )
+
+        assert self.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_calls_are_not_reused(self):
+        """Test that a call after completion runs the work again."""
+        await self.single_flight.do("key", self._work)
+        await self.single_flight.do("key", self._work)
+
+        assert self.calls == 2
+        assert self.single_flight.get_metrics()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_with_joined_callers(self):
+        """Test that every caller receives the leader's exception."""
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            self.single_flight.do("key", fail),
+            self.single_flight.do("key", fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_work(self):
+        """Test that the work survives when the leading caller goes away."""
+        leader = asyncio.ensure_future(self.single_flight.do("key", self._work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(self.single_flight.do("key", self._work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await follower == "done"
+        assert self.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_claim_leader_resolves_followers(self):
+        """Test that a claimed call is completed by its leader."""
+        call, leader = self.single_flight.claim("key")
+        joined, follower_leads = self.single_flight.claim("key")
+
+        call.set_result("streamed")
+
+        assert leader is True
+        assert follower_leads is False
+        assert await joined == "streamed"
@@ -0,0 +1,268 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from src.api.v1.schemas.spaced_repetition_schemas import (
+    FlashcardWithRepetition,
+    ReviewFlashcardCommand,
+)
+from src.services.spaced_repetition_service import SpacedRepetitionService
+
+
+class TestSpacedRepetitionServiceGetDueFlashcards:
+    """Test suite for SpacedRepetitionService.get_due_flashcards method."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = SpacedRepetitionService(self.mock_supabase)
+        self.user_id = uuid.uuid4()
+
+    def _make_due_row(self, due_date: datetime, front: str = "Question") -> dict:
+        """Build a repetition row with an embedded flashcard as PostgREST returns it."""
+        return {
+            "due_date": due_date.isoformat() + "Z",
+            "current_interval": 3,
+            "last_reviewed_at": None,
+            "flashcards": {
+                "id": str(uuid.uuid4()),
+                "user_id": str(self.user_id),
+                "source_text_id": None,
+                "front_content": front,
+                "back_content": "Answer",
+                "source": "manual",
+                "status": "active",
+                "created_at": "2024-01-01T00:00:00.000Z",
+                "updated_at": "2024-01-01T00:00:00.000Z",
+            },
+        }
+
+    def _query_chain(self) -> Mock:
+        """Return the mock reached after the full due-cards builder chain."""
+        return (
+            self.mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.lte.return_value.order.return_value.limit.return_value
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_due_flashcards_filters_in_database(self):
+        """Test that filtering, ordering and limit are pushed into the query."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = []
+        self._query_chain().execute = AsyncMock(return_value=mock_response)
+
+        # Act
+        result = await self.service.get_due_flashcards(self.user_id, limit=5)
+
+        # Assert
+        assert result == []
+        self.mock_supabase.table.assert_called_once_with(
+            "user_flashcard_spaced_repetition"
+        )
+        select_arg = self.mock_supabase.table.return_value.select.call_args[0][0]
+        assert "flashcards!inner(*)" in select_arg
+
+        select_mock = self.mock_supabase.table.return_value.select.return_value
+        select_mock.eq.assert_called_once_with("user_id", str(self.user_id))
+        select_mock.eq.return_value.eq.assert_called_once_with(
+            "flashcards.status", "active"
+        )
+        lte_call = select_mock.eq.return_value.eq.return_value.lte.call_args
+        assert lte_call[0][0] == "due_date"
+        select_mock.eq.return_value.eq.return_value.lte.return_value.order.assert_called_once_with(
+            "due_date"
+        )
+        select_mock.eq.return_value.eq.return_value.lte.return_value.order.return_value.limit.assert_called_once_with(
+            5
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_due_flashcards_maps_rows(self):
+        """Test that embedded rows are converted and database order is preserved."""
+        # Arrange
+        now = datetime.utcnow()
+        rows = [
+            self._make_due_row(now - timedelta(days=2), front="Oldest"),
+            self._make_due_row(now - timedelta(hours=1), front="Newest"),
+        ]
+        mock_response = Mock()
+        mock_response.data = rows
+        self._query_chain().execute = AsyncMock(return_value=mock_response)
+
+        # Act
+        result = await self.service.get_due_flashcards(self.user_id, limit=20)
+
+        # Assert
+        assert len(result) == 2
+        assert all(isinstance(card, FlashcardWithRepetition) for card in result)
+        assert [card.front_content for card in result] == ["Oldest", "Newest"]
+        assert result[0].repetition_data.current_interval == 3
+        assert result[0].repetition_data.due_date.tzinfo is None
+        assert result[0].repetition_data.last_reviewed_at is None
+
+    @pytest.mark.asyncio
+    async def test_get_due_flashcards_skips_invalid_due_date(self):
+        """Test that rows with malformed due dates are skipped."""
+        # Arrange
+        valid_row = self._make_due_row(datetime.utcnow() - timedelta(days=1))
+        invalid_row = self._make_due_row(datetime.utcnow())
+        invalid_row["due_date"] = "not-a-date"
+
+        mock_response = Mock()
+        mock_response.data = [invalid_row, valid_row]
+        self._query_chain().execute = AsyncMock(return_value=mock_response)
+
+        # Act
+        result = await self.service.get_due_flashcards(self.user_id)
+
+        # Assert
+        assert len(result) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_due_flashcards_invalid_limit(self):
+        """Test that limit outside 1-100 raises ValueError without querying."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await self.service.get_due_flashcards(self.user_id, limit=0)
+
+        self.mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_due_flashcards_nil_user(self):
+        """Test that nil UUID is rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            await self.service.get_due_flashcards(
+                uuid.UUID("00000000-0000-0000-0000-000000000000")
+            )
+
+
+class TestSpacedRepetitionServiceReviewFlashcard:
+    """Test suite for SpacedRepetitionService.review_flashcard method."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_supabase = Mock()
+        self.service = SpacedRepetitionService(self.mock_supabase, use_review_rpc=True)
+        self.user_id = uuid.uuid4()
+        self.flashcard_id = uuid.uuid4()
+        self.command = ReviewFlashcardCommand(
+            user_id=self.user_id,
+            flashcard_id=self.flashcard_id,
+            performance_rating=4,
+        )
+
+    def _make_record(self, current_interval: int = 2) -> dict:
+        """Build a repetition row as returned by the review_flashcard function."""
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": str(self.user_id),
+            "flashcard_id": str(self.flashcard_id),
+            "due_date": "2024-01-03T10:00:00.123456+00:00",
+            "current_interval": current_interval,
+            "last_reviewed_at": "2024-01-01T10:00:00.123456+00:00",
+            "data_extra": {
+                "last_performance_rating": 4,
+                "review_count": 1,
+                "algorithm_version": "sm2_v1",
+            },
+            "created_at": "2024-01-01T10:00:00.123456+00:00",
+            "updated_at": "2024-01-01T10:00:00.123456+00:00",
+        }
+
+    @pytest.mark.asyncio
+    async def test_review_flashcard_single_rpc_call(self):
+        """Test that the review is submitted with one RPC call."""
+        # Arrange
+        mock_response = Mock()
+        mock_response.data = self._make_record()
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        # Act
+        result = await self.service.review_flashcard(self.command)
+
+        # Assert
+        assert result.flashcard_id == self.flashcard_id
+        assert result.current_interval == 2
+        assert result.due_date.tzinfo is None
+        self.mock_supabase.rpc.assert_called_once_with(
+            "review_flashcard",
+            {
+                "p_user_id": str(self.user_id),
+                "p_flashcard_id": str(self.flashcard_id),
+                "p_performance_rating": 4,
+            },
+        )
+        self.mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_review_flashcard_rpc_validation_error(self):
+        """Test that errors raised by the function surface as ValueError."""
+        # Arrange
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=APIError(
+                {
+                    "code": "P0001",
+                    "message": "Flashcard not found, doesn't belong to user, or is not active",
+                }
+            )
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            await self.service.review_flashcard(self.command)
+
+        assert "not found" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_review_flashcard_rpc_database_error(self):
+        """Test that other database errors are not turned into ValueError."""
+        # Arrange
+        self.mock_supabase.rpc.return_value.execute = AsyncMock(
+            side_effect=APIError({"code": "42883", "message": "function not found"})
+        )
+
+        # Act & Assert
+        with pytest.raises(APIError):
+            await self.service.review_flashcard(self.command)
+
+    @pytest.mark.asyncio
+    async def test_review_flashcard_legacy_path(self):
+        """Test that the legacy path validates, reads and upserts separately."""
+        # Arrange
+        service = SpacedRepetitionService(self.mock_supabase, use_review_rpc=False)
+        table = self.mock_supabase.table.return_value
+
+        flashcard_response = Mock()
+        flashcard_response.data = {
+            "id": str(self.flashcard_id),
+            "user_id": str(self.user_id),
+            "status": "active",
+            "created_at": datetime.utcnow().isoformat() + "Z",
+        }
+        existing_response = Mock()
+        existing_response.data = None
+        table.select.return_value.eq.return_value.eq.return_value.eq.return_value.single.return_value.execute = AsyncMock(
+            return_value=flashcard_response
+        )
+        table.select.return_value.eq.return_value.eq.return_value.single.return_value.execute = AsyncMock(
+            return_value=existing_response
+        )
+        upsert_response = Mock()
+        upsert_response.data = [self._make_record()]
+        table.upsert.return_value.execute = AsyncMock(return_value=upsert_response)
+
+        # Act
+        result = await service.review_flashcard(self.command)
+
+        # Assert
+        assert result.current_interval == 2
+        upsert_data = table.upsert.call_args[0][0]
+        assert upsert_data["current_interval"] == 2  # Easy on a new card: 1 * 2.0
+        assert upsert_data["data_extra"]["review_count"] == 1
+        self.mock_supabase.rpc.assert_not_called()
@@ -0,0 +1,52 @@
+from src.services.text_chunker import (
+    CHARS_PER_TOKEN,
+    estimate_tokens,
+    split_text_into_chunks,
+)
+
+
+class TestSplitTextIntoChunks:
+    """Test suite for token-budgeted text chunking."""
+
+    def test_short_text_is_one_chunk(self):
+        """Test that a text within the budget is returned unchanged."""
+        text = "First paragraph.\n\nSecond paragraph."
+
+        assert split_text_into_chunks(text, max_tokens=100) == [text]
+
+    def test_paragraphs_packed_within_budget(self):
+        """Test that whole paragraphs are packed greedily into chunks."""
+        paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(6)]
+        text = "\n\n".join(p.strip() for p in paragraphs)
+
+        chunks = split_text_into_chunks(text, max_tokens=60)
+
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+        assert "\n\n".join(chunks) == text
+
+    def test_long_paragraph_split_on_sentences(self):
+        """Test that an oversized paragraph breaks between sentences."""
+        sentences = [f"Sentence number {i} ends here." for i in range(40)]
+        text = " ".join(sentences)
+
+        chunks = split_text_into_chunks(text, max_tokens=50)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert len(chunk) <= 50 * CHARS_PER_TOKEN
+            assert chunk.startswith("Sentence") and chunk.endswith("here.")
+        assert " ".join(chunks) == text
+
+    def test_long_sentence_split_on_words(self):
+        """Test that a sentence over the budget is split between words."""
+        text = " ".join(f"word{i}" for i in range(200))
+
+        chunks = split_text_into_chunks(text, max_tokens=10)
+
+        assert all(len(chunk) <= 10 * CHARS_PER_TOKEN for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+    def test_empty_text(self):
+        """Test that blank text yields no chunks."""
+        assert split_text_into_chunks("   \n\n ", max_tokens=10) == []
@@ -0,0 +1,80 @@
+import time
+from unittest.mock import patch
+
+import jwt
+
+from src.services.token_cache import VerifiedTokenCache
+
+USER = {"id": "5f0e6d1c-3c1a-4b7e-9a55-0c8f0d3b2a11", "email": "user@example.com"}
+
+
+def _token(exp_in: int = 3600, sub: str = USER["id"]) -> str:
+    """Build an access token expiring ``exp_in`` seconds from now."""
+    return jwt.encode(
+        {"sub": sub, "exp": int(time.time()) + exp_in}, "secret", algorithm="HS256"
+    )
+
+
+class TestVerifiedTokenCache:
+    """Test suite for VerifiedTokenCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = VerifiedTokenCache(max_size=2, max_ttl=300)
+
+    def test_miss_then_hit(self):
+        """Test that a stored token is returned and counted as a hit."""
+        token = _token()
+
+        assert self.cache.get(token) is None
+        self.cache.set(token, USER)
+
+        assert self.cache.get(token) == USER
+        metrics = self.cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+
+    def test_entry_expires_with_token(self):
+        """Test that entries never outlive the token's exp claim."""
+        token = _token(exp_in=60)
+        self.cache.set(token, USER)
+
+        with patch("src.services.token_cache.time.time", return_value=time.time() + 61):
+            assert self.cache.get(token) is None
+
+    def test_entry_expires_after_max_ttl(self):
+        """Test that entries expire after max_ttl even for long-lived tokens."""
+        token = _token(exp_in=3600)
+        self.cache.set(token, USER)
+
+        with patch(
+            "src.services.token_cache.time.time", return_value=time.time() + 301
+        ):
+            assert self.cache.get(token) is None
+
+    def test_expired_token_not_cached(self):
+        """Test that already expired tokens are not stored."""
+        token = _token(exp_in=-10)
+        self.cache.set(token, USER)
+
+        assert self.cache.get_metrics()["size"] == 0
+
+    def test_invalidate(self):
+        """Test that invalidated tokens are no longer served."""
+        token = _token()
+        self.cache.set(token, USER)
+
+        self.cache.invalidate(token)
+
+        assert self.cache.get(token) is None
+        assert self.cache.get_metrics()["invalidations"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the cache is bounded by max_size."""
+        tokens = [_token(sub=f"user-{i}") for i in range(3)]
+        for token in tokens:
+            self.cache.set(token, USER)
+
+        assert self.cache.get(tokens[0]) is None
+        assert self.cache.get(tokens[2]) == USER
+        assert self.cache.get_metrics()["size"] == 2
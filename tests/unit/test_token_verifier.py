@@ -0,0 +1,186 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from jwt.algorithms import ECAlgorithm
+from jwt.api_jwk import PyJWKSet
+
+from src.services.token_cache import VerifiedTokenCache
+from src.services.token_verifier import TokenVerifier
+
+SUPABASE_URL = "https://test.supabase.co"
+JWT_SECRET = "test-jwt-secret-with-at-least-32-bytes!"
+
+
+def _claims(**overrides) -> dict:
+    """Build access token claims as issued by Supabase Auth."""
+    now = int(time.time())
+    claims = {
+        "sub": "5f0e6d1c-3c1a-4b7e-9a55-0c8f0d3b2a11",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "iss": f"{SUPABASE_URL}/auth/v1",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return claims
+
+
+class TestTokenVerifierHS256:
+    """Test suite for verification with the project JWT secret."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.verifier = TokenVerifier(SUPABASE_URL, jwt_secret=JWT_SECRET)
+
+    @pytest.mark.asyncio
+    async def test_verify_valid_token(self):
+        """Test that a correctly signed token returns its claims."""
+        token = jwt.encode(_claims(), JWT_SECRET, algorithm="HS256")
+
+        claims = await self.verifier.verify(token)
+
+        assert claims["sub"] == "5f0e6d1c-3c1a-4b7e-9a55-0c8f0d3b2a11"
+        assert claims["email"] == "user@example.com"
+
+    @pytest.mark.asyncio
+    async def test_verify_expired_token(self):
+        """Test that an expired token raises ExpiredSignatureError."""
+        token = jwt.encode(
+            _claims(exp=int(time.time()) - 60), JWT_SECRET, algorithm="HS256"
+        )
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            await self.verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_verify_wrong_secret(self):
+        """Test that a token signed with another secret is rejected."""
+        token = jwt.encode(
+            _claims(), "another-secret-with-at-least-32-bytes!", algorithm="HS256"
+        )
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            await self.verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_verify_wrong_audience(self):
+        """Test that tokens for other audiences are rejected."""
+        token = jwt.encode(_claims(aud="anon"), JWT_SECRET, algorithm="HS256")
+
+        with pytest.raises(jwt.InvalidAudienceError):
+            await self.verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_verify_without_configured_secret(self):
+        """Test that HS256 tokens are rejected when no secret is configured."""
+        verifier = TokenVerifier(SUPABASE_URL)
+        token = jwt.encode(_claims(), JWT_SECRET, algorithm="HS256")
+
+        with pytest.raises(jwt.InvalidTokenError):
+            await verifier.verify(token)
+
+
+class TestTokenVerifierAuthServerFallback:
+    """Test suite for HS256 tokens when no JWT secret is configured."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.auth_client = Mock()
+        self.auth_client.auth.get_user.return_value = SimpleNamespace(
+            user=SimpleNamespace(id="user-1", email="user@example.com")
+        )
+        self.verifier = TokenVerifier(
+            SUPABASE_URL,
+            auth_client=self.auth_client,
+            token_cache=VerifiedTokenCache(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_token_resolved_once_by_auth_server(self):
+        """Test that the auth server is asked once per token, then cached."""
+        token = jwt.encode(_claims(), "unknown-secret", algorithm="HS256")
+
+        first = await self.verifier.verify(token)
+        second = await self.verifier.verify(token)
+
+        assert first["sub"] == second["sub"] == "user-1"
+        assert first["email"] == "user@example.com"
+        self.auth_client.auth.get_user.assert_called_once_with(token)
+
+    @pytest.mark.asyncio
+    async def test_expired_token_not_sent_to_auth_server(self):
+        """Test that an expired token raises ExpiredSignatureError locally."""
+        token = jwt.encode(
+            _claims(exp=int(time.time()) - 60), "unknown-secret", algorithm="HS256"
+        )
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            await self.verifier.verify(token)
+
+        self.auth_client.auth.get_user.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_invalid(self):
+        """Test that a token the auth server rejects is invalid."""
+        self.auth_client.auth.get_user.side_effect = RuntimeError("invalid JWT")
+        token = jwt.encode(_claims(), "unknown-secret", algorithm="HS256")
+
+        with pytest.raises(jwt.InvalidTokenError):
+            await self.verifier.verify(token)
+
+
+class TestTokenVerifierJWKS:
+    """Test suite for verification with cached JWKS signing keys."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.private_key = ec.generate_private_key(ec.SECP256R1())
+        public_jwk = ECAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        public_jwk.update({"kid": "key-1", "alg": "ES256", "use": "sig"})
+        self.jwk_set = PyJWKSet.from_dict({"keys": [public_jwk]})
+        self.verifier = TokenVerifier(SUPABASE_URL)
+
+    def _token(self, kid: str = "key-1") -> str:
+        """Sign a token with the test EC key."""
+        return jwt.encode(
+            _claims(), self.private_key, algorithm="ES256", headers={"kid": kid}
+        )
+
+    @pytest.mark.asyncio
+    async def test_jwks_fetched_once_and_cached(self):
+        """Test that signing keys are reused across verifications."""
+        with patch.object(
+            self.verifier._jwk_client, "get_jwk_set", return_value=self.jwk_set
+        ) as mock_get_jwk_set:
+            await self.verifier.verify(self._token())
+            claims = await self.verifier.verify(self._token())
+
+        assert claims["email"] == "user@example.com"
+        assert mock_get_jwk_set.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_id_rejected(self):
+        """Test that a token with an unknown key id is rejected."""
+        with patch.object(
+            self.verifier._jwk_client, "get_jwk_set", return_value=self.jwk_set
+        ):
+            with pytest.raises(jwt.InvalidTokenError):
+                await self.verifier.verify(self._token(kid="rotated-away"))
+
+    @pytest.mark.asyncio
+    async def test_algorithm_fixed_by_key_not_header(self):
+        """Test that a token naming another algorithm than its key is rejected."""
+        unsigned = jwt.encode(
+            _claims(), None, algorithm="none", headers={"kid": "key-1"}
+        )
+
+        with patch.object(
+            self.verifier._jwk_client, "get_jwk_set", return_value=self.jwk_set
+        ):
+            with pytest.raises(jwt.InvalidAlgorithmError):
+                await self.verifier.verify(unsigned)